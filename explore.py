@@ -1,18 +1,33 @@
-import kagglehub
+"""
+Dataset Explorer
+Prints an overview of the current dataset snapshot (offline)
+
+Usage:
+    python explore.py             # explore the current snapshot
+    python explore.py --refresh   # download from Kaggle and register it as a new snapshot first
+"""
 import pandas as pd
 import os
+import sys
 
-# Download/locate the dataset
-path = kagglehub.dataset_download('kamali2727/laptop-sales-by-amazon')
-files = [f for f in os.listdir(path) if f.endswith('.csv')]
-print("CSV files:", files)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
+from snapshots import current_snapshot, register
 
-# Load the data
-df = pd.read_csv(os.path.join(path, files[0]))
+KAGGLE_DATASET = 'kamali2727/laptop-sales-by-amazon'
+
+if '--refresh' in sys.argv[1:]:
+    # Only a refresh needs kagglehub and network access
+    import kagglehub
+    path = kagglehub.dataset_download(KAGGLE_DATASET)
+    files = [f for f in os.listdir(path) if f.endswith('.csv')]
+    print("CSV files:", files)
+    snapshot_id = register(os.path.join(path, files[0]), source=f'kaggle:{KAGGLE_DATASET}')
+    print(f"\n✅ Registered snapshot {snapshot_id} (now current)")
 
-# Also copy CSV to local folder for the dashboard
-df.to_csv('laptops.csv', index=False)
-print("\n✅ Copied data to laptops.csv")
+# Load the data
+data_path = current_snapshot()
+df = pd.read_csv(data_path)
+print(f"Snapshot: {data_path}")
 
 print("\n" + "="*60)
 print("LAPTOP SALES DATASET - EXPLORATION")
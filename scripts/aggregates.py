@@ -0,0 +1,447 @@
+"""
+Laptop Aggregates
+Counts, sums, histograms, medians and top-N lists behind the brand (01),
+price (02), RAM (03), screen (05), top-seller (07) and dashboard (10) charts.
+
+Two interchangeable builders expose the same interface:
+- ExactAggregates: computed from the whole table in memory (default)
+- StreamingAggregates: built incrementally from bounded CSV chunks, so a
+  multi-GB export renders under a fixed memory ceiling
+
+Select per run with LAPTOPS_MODE (or the matching command-line flag):
+- stream (--stream): read the CSV in chunks (LAPTOPS_CHUNKSIZE, default 200,000 rows)
+- incremental (--incremental): like stream, but the aggregates are persisted
+  with the byte offset they cover; later runs only fold in appended rows and
+  fall back to a full rebuild if the already-read part of the file changed
+- sql (--sql): answered by queries against a SQLite copy (sql_backend.py)
+
+Tolerance: streamed prices are kept as counts in PRICE_BIN_WIDTH ($1) bins,
+so streamed medians/quantiles are within $1 of the in-memory values and
+histogram bars may move by at most one $1 bin at their edges. Counts, sums,
+means, min/max and top-N lists are exact. Streamed box plots omit fliers.
+"""
+import pandas as pd
+import numpy as np
+import hashlib
+import io
+import os
+import pickle
+
+import parse_cache
+from cleaning import derivation_key, derive, load_clean
+from data_loader import (CACHE_DIR, DATA_PATH, DEFAULT_CHUNKSIZE, SCHEMA, _path_tag, _write_atomic,
+                         execution_mode, iter_chunks)
+
+# Price window used by the price and dashboard charts
+PRICE_LOW = 50
+PRICE_HIGH = 10000
+PRICE_BIN_WIDTH = 1.0
+N_PRICE_BINS = int((PRICE_HIGH - PRICE_LOW) / PRICE_BIN_WIDTH)
+
+TOP_N = 10
+TOP_SELLER_COLUMNS = ['label', 'brand', 'total_sales_clean', 'price_clean', 'Sale Product Count']
+USECOLS = ['brand', 'model', 'screen_size', 'ram', 'Price', 'Sale Product Count', 'Total Sales']
+
+# Bump when the persisted aggregate state changes shape
+STATE_VERSION = 5
+# Bytes read at a time when hashing the already-ingested part of the CSV
+READ_BLOCK = 1 << 20
+
+
+def prepare(df):
+    """Derived columns every aggregate is built from: the cleaning stage's
+    columns (computed here for raw chunks, already present in load_clean
+    tables) under the names the charts use."""
+    df = derive(df)
+    df['price_clean'] = df['price']
+    df['total_sales_clean'] = df['revenue']
+    df['screen_inches'] = df['screen']
+    return df
+
+
+def with_labels(df):
+    """Add the "brand model" display label (only for the few rows shown)."""
+    df = df.copy()
+    # astype(object) so this also works on dictionary-encoded (categorical) columns
+    df['label'] = (df['brand'].astype(object).fillna('') + ' ' + df['model'].astype(object).fillna('')).str.strip()
+    return df
+
+
+def in_price_window(df):
+    return (df['price_clean'] >= PRICE_LOW) & (df['price_clean'] <= PRICE_HIGH)
+
+
+def is_seller(df):
+    """Rows counted by the top-seller chart."""
+    return (df['total_sales_clean'] > 0) & (df['price_clean'] > 0)
+
+
+class ExactAggregates:
+    """Aggregates of the full in-memory table."""
+
+    def __init__(self, df, top_n=TOP_N):
+        df = prepare(df)
+        window = df[in_price_window(df)]
+        sellers = df[is_seller(df)]
+
+        self.rows = len(df)
+        self.brand_nunique = df['brand'].nunique()
+        # Categorical counts list every known brand; keep those with rows (a --where subset has few)
+        self.brand_counts = _present(df['brand_clean'].value_counts())
+        self.brand_revenue = df.groupby('brand_clean', observed=True)['total_sales_clean'].sum()
+        self.revenue_total = df['total_sales_clean'].sum()
+        self.ram_counts = df['ram_gb'].value_counts()
+        self.screen_counts = df['screen_inches'].value_counts()
+        self.seller_revenue = sellers.groupby('brand', observed=True)['total_sales_clean'].sum()
+        self.top_sellers = with_labels(sellers.nlargest(top_n, 'total_sales_clean'))[TOP_SELLER_COLUMNS]
+
+        self.window_brand_counts = _present(window['brand_clean'].value_counts())
+        self.price_count = len(window)
+        self.price_mean = window['price_clean'].mean()
+        self.price_min = window['price_clean'].min()
+        self.price_max = window['price_clean'].max()
+        ram_window = window[window['ram_gb'].notna()]
+        self.window_ram_counts = ram_window['ram_gb'].value_counts()
+        self.ram_price_mean = ram_window.groupby('ram_gb')['price_clean'].mean()
+        self._prices = window['price_clean']
+        self._brand_prices = window.groupby('brand_clean', observed=True)['price_clean']
+
+    def price_quantile(self, q, brand=None):
+        prices = self._prices if brand is None else self._brand_prices.get_group(brand)
+        return prices.quantile(q)
+
+    def price_median(self, brand=None):
+        return self.price_quantile(0.5, brand)
+
+    def price_histogram(self, bins):
+        return np.histogram(self._prices, bins=bins)
+
+    def brand_box_stats(self, brands):
+        # Imported here: text reports use these aggregates without matplotlib
+        from matplotlib import cbook
+
+        data = [self._brand_prices.get_group(brand).dropna() for brand in brands]
+        return cbook.boxplot_stats(data, labels=brands)
+
+
+class StreamingAggregates:
+    """Aggregates folded in one chunk at a time; memory is bounded by the
+    number of distinct brands and price bins, not by the number of rows."""
+
+    def __init__(self, top_n=TOP_N):
+        self.top_n = top_n
+        self.rows = 0
+        self._raw_brands = set()
+        self._brand_counts = _empty_series()
+        self.brand_revenue = _empty_series()
+        self.revenue_total = 0.0
+        self._ram_counts = _empty_series()
+        self._screen_counts = _empty_series()
+        self.seller_revenue = _empty_series()
+        self._top_sellers = None
+
+        # (brand_clean, price bin) -> count, for prices inside the window
+        self._price_bins = _empty_series()
+        self._price_sum = 0.0
+        self.price_count = 0
+        self.price_min = np.nan
+        self.price_max = np.nan
+        self._window_ram_counts = _empty_series()
+        self._ram_price_sum = _empty_series()
+
+    def update(self, chunk):
+        """Fold one raw CSV chunk into the running aggregates."""
+        chunk = prepare(chunk)
+        self.rows += len(chunk)
+        self._raw_brands.update(chunk['brand'].dropna().unique())
+        self._brand_counts = _add(self._brand_counts, chunk['brand_clean'].value_counts())
+        self.brand_revenue = _add(self.brand_revenue, chunk.groupby('brand_clean')['total_sales_clean'].sum())
+        self.revenue_total += chunk['total_sales_clean'].sum()
+        self._ram_counts = _add(self._ram_counts, chunk['ram_gb'].value_counts())
+        self._screen_counts = _add(self._screen_counts, chunk['screen_inches'].value_counts())
+
+        sellers = chunk[is_seller(chunk)]
+        self.seller_revenue = _add(self.seller_revenue, sellers.groupby('brand')['total_sales_clean'].sum())
+        leaders = with_labels(sellers.nlargest(self.top_n, 'total_sales_clean'))[TOP_SELLER_COLUMNS]
+        if self._top_sellers is not None:
+            # Current leaders first, so ties keep the earliest row like a full-table nlargest
+            leaders = pd.concat([self._top_sellers, leaders]).nlargest(self.top_n, 'total_sales_clean')
+        self._top_sellers = leaders
+
+        window = chunk[in_price_window(chunk)]
+        if len(window):
+            prices = window['price_clean']
+            bins = np.minimum(((prices - PRICE_LOW) // PRICE_BIN_WIDTH).astype(int), N_PRICE_BINS - 1)
+            counts = window.groupby([window['brand_clean'], bins.rename('bin')], dropna=False).size()
+            self._price_bins = _add(self._price_bins, counts)
+            self._price_sum += prices.sum()
+            self.price_count += len(prices)
+            self.price_min = np.nanmin([self.price_min, prices.min()])
+            self.price_max = np.nanmax([self.price_max, prices.max()])
+
+            ram_window = window[window['ram_gb'].notna()]
+            self._window_ram_counts = _add(self._window_ram_counts, ram_window['ram_gb'].value_counts())
+            self._ram_price_sum = _add(self._ram_price_sum, ram_window.groupby('ram_gb')['price_clean'].sum())
+        return self
+
+    @property
+    def brand_counts(self):
+        return _as_counts(self._brand_counts)
+
+    @property
+    def ram_counts(self):
+        return _as_counts(self._ram_counts)
+
+    @property
+    def screen_counts(self):
+        return _as_counts(self._screen_counts)
+
+    @property
+    def window_ram_counts(self):
+        return _as_counts(self._window_ram_counts)
+
+    @property
+    def ram_price_mean(self):
+        return (self._ram_price_sum / self._window_ram_counts).sort_index()
+
+    @property
+    def top_sellers(self):
+        if self._top_sellers is None:
+            return pd.DataFrame(columns=TOP_SELLER_COLUMNS)
+        return self._top_sellers
+
+    @property
+    def brand_nunique(self):
+        return len(self._raw_brands)
+
+    @property
+    def price_mean(self):
+        return self._price_sum / self.price_count if self.price_count else np.nan
+
+    @property
+    def window_brand_counts(self):
+        return _as_counts(self._price_bins.groupby(level=0).sum())
+
+    def price_quantile(self, q, brand=None):
+        return _bin_quantile(self._bin_counts(brand), q)
+
+    def price_median(self, brand=None):
+        return self.price_quantile(0.5, brand)
+
+    def price_histogram(self, bins):
+        """Re-bin the $1 bins into `bins` equal bins between the observed min and max."""
+        counts = self._bin_counts()
+        edges = np.linspace(self.price_min, self.price_max, bins + 1)
+        centers = np.clip(_bin_centers(counts.index), self.price_min, self.price_max)
+        hist, _ = np.histogram(centers, bins=edges, weights=counts.values)
+        return hist, edges
+
+    def brand_box_stats(self, brands):
+        """Box plot stats per brand from the binned prices (no fliers)."""
+        stats = []
+        for brand in brands:
+            counts = self._bin_counts(brand)
+            q1, med, q3 = (_bin_quantile(counts, q) for q in (0.25, 0.5, 0.75))
+            iqr = q3 - q1
+            centers = _bin_centers(counts.index)
+            inside = centers[(centers >= q1 - 1.5 * iqr) & (centers <= q3 + 1.5 * iqr)]
+            stats.append({
+                'label': brand, 'med': med, 'q1': q1, 'q3': q3, 'iqr': iqr,
+                'mean': np.average(centers, weights=counts.values),
+                'whislo': inside.min() if len(inside) else q1,
+                'whishi': inside.max() if len(inside) else q3,
+                'fliers': np.array([]),
+            })
+        return stats
+
+    def _bin_counts(self, brand=None):
+        if brand is None:
+            counts = self._price_bins.groupby(level='bin').sum()
+        else:
+            counts = self._price_bins.xs(brand, level=0)
+        return counts[counts > 0].sort_index()
+
+
+def stream_aggregates(path=DATA_PATH, chunksize=None, top_n=TOP_N):
+    """Build StreamingAggregates by reading `path` in bounded chunks."""
+    agg = StreamingAggregates(top_n=top_n)
+    for chunk in iter_chunks(path, chunksize=chunksize, usecols=USECOLS):
+        agg.update(chunk)
+    parse_cache.flush()
+    return agg
+
+
+def incremental_aggregates(path=DATA_PATH, chunksize=None, top_n=TOP_N):
+    """StreamingAggregates persisted between runs.
+
+    The saved state records the byte offset of the last complete line it has
+    read and the SHA-256 of every byte before it. When the file has only
+    grown since, just the appended rows are read (hashing the old part is
+    still far cheaper than parsing it); a shorter file, a changed header or
+    any change before the offset means the file was edited in place, so the
+    aggregates are rebuilt from the start. So does any change to how rows
+    are derived (parsers, rule tables, brand aliases). A trailing line
+    without its newline yet is left for the next run."""
+    target = state_path(path)
+    with open(path, 'rb') as f:
+        header = f.readline()
+        end = _last_line_end(f, os.fstat(f.fileno()).st_size)
+        state = _read_state(target)
+        prefix = _matching_prefix(state, f, header, top_n)
+        if prefix is None:
+            state = {'version': STATE_VERSION, 'derivations': derivation_key(), 'header': header, 'offset': len(header),
+                     'aggregates': StreamingAggregates(top_n=top_n)}
+            prefix = _prefix_hash(f, len(header))
+        agg = state['aggregates']
+        if end <= state['offset']:
+            return agg
+
+        names = pd.read_csv(io.BytesIO(header), nrows=0).columns.tolist()
+        dtype = {col: kind for col, kind in SCHEMA.items() if col in USECOLS}
+        chunksize = chunksize or int(os.environ.get('LAPTOPS_CHUNKSIZE', DEFAULT_CHUNKSIZE))
+        f.seek(state['offset'])
+        appended = io.BufferedReader(_BoundedReader(f, end - state['offset']))
+        # Continue the row numbering of the rows already folded in
+        first_row = agg.rows
+        with pd.read_csv(appended, header=None, names=names, usecols=USECOLS, dtype=dtype,
+                         chunksize=chunksize) as reader:
+            for chunk in reader:
+                chunk.index += first_row
+                agg.update(chunk)
+        parse_cache.flush()
+
+        # The appended bytes continue the hash of the verified prefix
+        state.update(offset=end, sha256=_prefix_hash(f, end, prefix, state['offset']).hexdigest())
+    _write_atomic(target, pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL))
+    return agg
+
+
+def state_path(path=DATA_PATH):
+    return os.path.join(CACHE_DIR, _path_tag(path) + '.aggregates.pkl')
+
+
+def load_aggregates(path=DATA_PATH, mode=None, chunksize=None, top_n=TOP_N):
+    """Aggregates for this run: streamed, incremental or SQL-backed when
+    requested, else exact in memory."""
+    mode = mode or execution_mode()
+    if mode == 'sql':
+        # Imported here because sql_backend itself imports this module
+        from sql_backend import SqlAggregates
+        return SqlAggregates(path, top_n=top_n)
+    if mode == 'stream':
+        return stream_aggregates(path, chunksize=chunksize, top_n=top_n)
+    if mode == 'incremental':
+        return incremental_aggregates(path, chunksize=chunksize, top_n=top_n)
+    return ExactAggregates(load_clean(path), top_n=top_n)
+
+
+class _BoundedReader(io.RawIOBase):
+    """Read at most `limit` bytes of an open binary file from its current position."""
+
+    def __init__(self, f, limit):
+        self._f = f
+        self._left = limit
+
+    def readable(self):
+        return True
+
+    def readinto(self, buf):
+        n = min(len(buf), self._left)
+        if n <= 0:
+            return 0
+        data = self._f.read(n)
+        buf[:len(data)] = data
+        self._left -= len(data)
+        return len(data)
+
+
+def _read_state(target):
+    try:
+        with open(target, 'rb') as f:
+            return pickle.load(f)
+    except Exception:
+        # Missing, corrupt or written by an incompatible version - rebuild
+        return None
+
+
+def _matching_prefix(state, f, header, top_n):
+    """Running SHA-256 of the bytes `state` has read when they are still
+    the start of the open file `f`, else None."""
+    if not isinstance(state, dict) or state.get('version') != STATE_VERSION:
+        return None
+    if state.get('derivations') != derivation_key():
+        # A parser, rule table or the alias file changed: derived values differ
+        return None
+    if state['header'] != header or state['aggregates'].top_n != top_n:
+        return None
+    offset = state['offset']
+    if os.fstat(f.fileno()).st_size < offset:
+        return None
+    prefix = _prefix_hash(f, offset)
+    if offset > len(header) and state.get('sha256') != prefix.hexdigest():
+        return None
+    return prefix
+
+
+def _prefix_hash(f, end, sha=None, start=0):
+    """SHA-256 of the bytes of `f` before `end`: continues `sha`, the hash
+    of the bytes before `start`, when given."""
+    sha = sha or hashlib.sha256()
+    f.seek(start)
+    while start < end:
+        block = f.read(min(READ_BLOCK, end - start))
+        if not block:
+            break
+        sha.update(block)
+        start += len(block)
+    return sha
+
+
+def _last_line_end(f, size):
+    """Offset just past the last newline at or before `size`."""
+    pos = size
+    while pos > 0:
+        step = min(READ_BLOCK, pos)
+        f.seek(pos - step)
+        block = f.read(step)
+        i = block.rfind(b'\n')
+        if i >= 0:
+            return pos - step + i + 1
+        pos -= step
+    return 0
+
+
+def _empty_series():
+    return pd.Series(dtype='float64')
+
+
+def _add(total, part):
+    if total.empty:
+        return part.astype('float64')
+    return total.add(part.astype('float64'), fill_value=0)
+
+
+def _present(counts):
+    return counts[counts > 0]
+
+
+def _as_counts(series):
+    """Running float totals as value_counts-style integer counts."""
+    return series.astype('int64').sort_values(ascending=False, kind='stable').rename('count')
+
+
+def _bin_centers(bins):
+    return PRICE_LOW + (np.asarray(bins, dtype=float) + 0.5) * PRICE_BIN_WIDTH
+
+
+def _bin_quantile(counts, q):
+    """Quantile of binned values (linear interpolation within the bin, like
+    pandas' default on the raw values). Within one bin width of exact."""
+    if counts.empty:
+        return np.nan
+    cum = counts.values.cumsum()
+    rank = q * (cum[-1] - 1)
+    i = np.searchsorted(cum, rank, side='right')
+    before = cum[i - 1] if i else 0
+    frac = (rank - before + 0.5) / counts.values[i]
+    return PRICE_LOW + (counts.index[i] + frac) * PRICE_BIN_WIDTH
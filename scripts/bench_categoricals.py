@@ -0,0 +1,92 @@
+"""
+Categorical Benchmark
+Compares memory and groupby / value_counts / isin timings of the
+dictionary-encoded text columns against plain object-dtype strings
+
+Usage:
+    python scripts/bench_categoricals.py                  # 1M rows replicated from laptops.csv
+    python scripts/bench_categoricals.py --rows 100000
+"""
+import pandas as pd
+import numpy as np
+import argparse
+import os
+import shutil
+import tempfile
+
+from bench_loader import best_of, replicate_csv
+from data_loader import CATEGORICAL_COLUMNS, DATA_PATH, SCHEMA, normalize_categories, read_csv
+
+
+def normalize_brand(df):
+    """brand_clean the way the scripts built it: per row on object strings,
+    per distinct value on categoricals."""
+    if isinstance(df['brand'].dtype, pd.CategoricalDtype):
+        return normalize_categories(df['brand'], lambda s: s.str.upper().str.strip())
+    return df['brand'].str.upper().str.strip()
+
+
+def same_result(expected, result):
+    """Same values per label (floats up to summation order), whatever the dtype."""
+    if not isinstance(expected, pd.Series):
+        return expected == result
+    expected, result = expected.sort_index(), result.sort_index()
+    if list(expected.index) != list(result.index):
+        return False
+    if pd.api.types.is_float_dtype(expected):
+        return np.allclose(expected, result, equal_nan=True)
+    return expected.astype(object).tolist() == result.astype(object).tolist()
+
+
+def workloads(df):
+    """The operations the chart scripts run on these columns."""
+    top_os = df['OS'].value_counts().index[:3].tolist()
+    return [
+        ('brand -> brand_clean', lambda: normalize_brand(df)),
+        ("groupby('brand_clean').mean", lambda: df.groupby('brand_clean', observed=True)['rating'].mean()),
+        ('value_counts(OS)', lambda: df['OS'].value_counts()),
+        ('isin(OS, top 3)', lambda: df['OS'].isin(top_os)),
+        ('nunique(brand)', lambda: df['brand'].nunique()),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1_000_000, help='replicate laptops.csv to this many rows')
+    parser.add_argument('--repeat', type=int, default=5, help='timing repeats (best is reported)')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='bench_categoricals_')
+    try:
+        csv_path = os.path.join(workdir, 'laptops.csv')
+        print(f"Building {args.rows:,}-row CSV...")
+        replicate_csv(DATA_PATH, args.rows, csv_path)
+
+        object_schema = {col: object if kind is str else kind for col, kind in SCHEMA.items()}
+        t_parse_plain, plain = best_of(lambda: pd.read_csv(csv_path, dtype=object_schema), 1)
+        t_parse_encoded, encoded = best_of(lambda: read_csv(csv_path), 1)
+        plain['brand_clean'] = normalize_brand(plain)
+
+        columns = CATEGORICAL_COLUMNS + ['brand_clean']
+        mem_plain = plain[columns].memory_usage(deep=True, index=False).sum() / 1e6
+        mem_encoded = encoded[columns].memory_usage(deep=True, index=False).sum() / 1e6
+
+        print(f"\n📊 Categorical benchmark: {args.rows:,} rows (best of {args.repeat})")
+        print("=" * 60)
+        print(f"  {'':<32} {'object':>12} {'category':>12}")
+        print(f"  {'Memory of encoded columns':<32} {mem_plain:>9,.1f} MB {mem_encoded:>9,.1f} MB")
+        print(f"  {'Parse (once, then cached)':<32} {t_parse_plain * 1000:>9,.1f} ms {t_parse_encoded * 1000:>9,.1f} ms")
+        for (label, run_plain), (_, run_encoded) in zip(workloads(plain), workloads(encoded)):
+            t_plain, expected = best_of(run_plain, args.repeat)
+            t_encoded, result = best_of(run_encoded, args.repeat)
+            flag = '' if same_result(expected, result) else '   ❌ results differ'
+            print(f"  {label:<32} {t_plain * 1000:>9,.1f} ms {t_encoded * 1000:>9,.1f} ms "
+                  f"({t_plain / t_encoded:,.1f}x){flag}")
+        print("-" * 60)
+        print(f"  Memory saved: {mem_plain / mem_encoded:,.1f}x")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
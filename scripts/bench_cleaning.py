@@ -0,0 +1,60 @@
+"""
+Cleaning Stage Benchmark
+Compares re-parsing the price/RAM/storage/screen strings and tier rules in
+every script against reading the persisted cleaning stage (cleaning.py)
+
+Usage:
+    python scripts/bench_cleaning.py                  # the real laptops.csv
+    python scripts/bench_cleaning.py --rows 1000000   # replicated to 1M rows
+"""
+import argparse
+import os
+import shutil
+import tempfile
+
+import cleaning
+import data_loader
+from bench_loader import best_of, replicate_csv
+from cleaning import derive, load_clean
+from data_loader import DATA_PATH, load_laptops
+
+# Scripts that used to clean the table themselves
+N_SCRIPTS = 15
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=0, help='replicate laptops.csv to this many rows')
+    parser.add_argument('--repeat', type=int, default=3, help='timing repeats (best is reported)')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='bench_cleaning_')
+    # Keep benchmark caches out of the project's .cache
+    data_loader.CACHE_DIR = cleaning.CACHE_DIR = os.path.join(workdir, 'cache')
+    try:
+        csv_path = DATA_PATH
+        if args.rows:
+            csv_path = os.path.join(workdir, 'laptops.csv')
+            print(f"Building {args.rows:,}-row CSV...")
+            replicate_csv(DATA_PATH, args.rows, csv_path)
+
+        load_laptops(csv_path)
+        parse, df = best_of(lambda: derive(load_laptops(csv_path)), args.repeat)
+        build, _ = best_of(lambda: load_clean(csv_path, use_cache=False), 1)
+        load_clean(csv_path)
+        warm, _ = best_of(lambda: load_clean(csv_path), args.repeat)
+
+        print(f"\n📊 Cleaning stage: {len(df):,} rows, {len(cleaning.DERIVATIONS)} derived columns")
+        print("=" * 60)
+        print(f"  load + clean, per script       {parse:>8.3f}s")
+        print(f"  x {N_SCRIPTS} scripts                   {parse * N_SCRIPTS:>8.3f}s")
+        print(f"  cleaned once (first run)       {build:>8.3f}s")
+        print(f"  load_clean, per script (warm)  {warm:>8.3f}s   {parse / warm:.1f}x faster")
+        print(f"  x {N_SCRIPTS} scripts                   {build + warm * (N_SCRIPTS - 1):>8.3f}s   (first run included)")
+        print("-" * 60)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
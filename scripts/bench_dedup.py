@@ -0,0 +1,108 @@
+"""
+Deduplication Benchmark
+Builds millions of listings from laptops.csv - reposts of each product
+with an extra word in the model text (duplicates) and listings with a new
+model number (distinct products) - and times listing_groups (dedup.py) on
+them, against the number of pairs an all-pairs comparison would test.
+Then times one worst case: a single model reposted many times with varied
+filler words, so that most reposts land in the same LSH buckets
+
+Usage:
+    python scripts/bench_dedup.py                         # 1M and 2M rows, 20,000 reposts
+    python scripts/bench_dedup.py --rows 100000,1000000 --reposts 50000
+"""
+import pandas as pd
+import numpy as np
+import argparse
+import resource
+import shutil
+import tempfile
+
+import cleaning
+import data_loader
+from bench_loader import best_of
+from cleaning import load_clean
+from data_loader import DATA_PATH
+from dedup import DEDUP_COLUMNS, EXACT_COLUMNS, listing_groups
+
+# Words sellers add to a repost
+FILLER = ['Laptop', 'New', 'Renewed', 'Business', 'Notebook', 'PC', 'Computer']
+
+
+def make_listings(base, rows, rng):
+    """`rows` listings drawn from `base`: 1/3 exact reposts, 1/3 reposts with
+    one filler word added to the model, 1/3 new products (model number
+    replaced by a random one). Also returns the true product of each row."""
+    pick = rng.integers(len(base), size=rows)
+    df = base.iloc[pick].reset_index(drop=True)
+    product = pick.astype(np.int64)
+    kind = rng.integers(3, size=rows)
+    model = df['model'].astype(object).fillna('')
+
+    repost = kind == 1
+    model[repost] = (model[repost] + ' ' + rng.choice(FILLER, repost.sum())).str.strip()
+    new = kind == 2
+    numbers = rng.integers(10_000, 10_000_000, new.sum())
+    model[new] = (model[new] + ' X' + pd.Series(numbers).astype(str).to_numpy()).str.strip()
+    product[new] = len(base) + numbers
+    df['model'] = model.replace('', np.nan)
+    return df, product
+
+
+def make_reposts(base, rows, rng):
+    """`rows` reposts of the most listed model, each with one to three
+    filler words and a random seller tag (letters only, so the model number
+    still matches) appended: all one product, every listing distinct."""
+    model = base['model'].value_counts().index[0]
+    df = base[base['model'] == model].iloc[[0] * rows].reset_index(drop=True)
+    words = rng.choice(FILLER, (rows, 3))
+    count = rng.integers(1, 4, rows)
+    tags = [''.join(t) for t in rng.choice(list('abcdefghijklmnopqrstuvwxyz'), (rows, 8)).tolist()]
+    df['model'] = [' '.join([model, *w[:c], t]) for w, c, t in zip(words.tolist(), count.tolist(), tags)]
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', default='1000000,2000000', help='comma-separated listing counts')
+    parser.add_argument('--reposts', type=int, default=20_000, help='reposts of one model (worst case)')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='bench_dedup_')
+    # Keep benchmark caches out of the project's .cache
+    data_loader.CACHE_DIR = cleaning.CACHE_DIR = workdir
+    try:
+        columns = list(dict.fromkeys(DEDUP_COLUMNS + EXACT_COLUMNS))
+        base = load_clean(DATA_PATH, use_cache=False)[columns]
+        base_groups = listing_groups(base).to_numpy()
+        rng = np.random.default_rng(args.seed)
+
+        print(f"\n📊 Listing deduplication (MinHash + LSH), best of 1")
+        print("=" * 86)
+        print(f"  {'rows':>10} {'distinct':>10} {'all pairs':>16} {'time':>8} {'peak RSS':>10} "
+              f"{'groups':>10} {'true':>10}")
+        for rows in (int(r) for r in args.rows.split(',')):
+            df, product = make_listings(base, rows, rng)
+            seconds, groups = best_of(lambda: listing_groups(df), 1)
+            # Products that laptops.csv itself lists several times count once
+            truth = np.where(product < len(base), base_groups[np.minimum(product, len(base) - 1)],
+                             product + len(base))
+            distinct = len(df.drop_duplicates(DEDUP_COLUMNS))
+            print(f"  {rows:>10,} {distinct:>10,} {distinct * (distinct - 1) // 2:>16,} {seconds:>7.2f}s "
+                  f"{resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:>7,.0f} MB "
+                  f"{groups.nunique():>10,} {pd.Series(truth).nunique():>10,}")
+        df = make_reposts(base, args.reposts, rng)
+        seconds, groups = best_of(lambda: listing_groups(df), 1)
+        distinct = len(df.drop_duplicates(DEDUP_COLUMNS))
+        print(f"  {args.reposts:>10,} {distinct:>10,} {distinct * (distinct - 1) // 2:>16,} {seconds:>7.2f}s "
+              f"{resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:>7,.0f} MB "
+              f"{groups.nunique():>10,} {1:>10,}   (reposts of one model)")
+        print("-" * 86)
+        print("  groups vs true: fewer = distinct products merged, more = reposts missed")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
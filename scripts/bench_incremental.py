@@ -0,0 +1,79 @@
+"""
+Incremental Ingestion Benchmark
+Appends rows to a copy of laptops.csv and checks that the incremental
+aggregates (LAPTOPS_MODE=incremental) match a full streamed rebuild, that
+only the appended rows are read, and that an in-place edit triggers a rebuild
+
+Usage:
+    python scripts/bench_incremental.py                                # 100K rows + 5K appended
+    python scripts/bench_incremental.py --rows 1000000 --append 20000
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+
+import aggregates
+import cleaning
+import data_loader
+from bench_loader import replicate_csv
+from bench_streaming import compare, summarize
+from data_loader import DATA_PATH
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100_000, help='rows in the CSV before the append')
+    parser.add_argument('--append', type=int, default=5_000, help='rows appended between runs')
+    parser.add_argument('--chunksize', type=int, default=200_000)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='bench_incremental_')
+    # Keep benchmark caches and state out of the project's .cache
+    data_loader.CACHE_DIR = aggregates.CACHE_DIR = cleaning.CACHE_DIR = os.path.join(workdir, 'cache')
+    try:
+        full_path = os.path.join(workdir, 'full.csv')
+        path = os.path.join(workdir, 'laptops.csv')
+        print(f"Building {args.rows + args.append:,}-row CSV...")
+        replicate_csv(DATA_PATH, args.rows + args.append, full_path)
+        with open(full_path, 'rb') as f:
+            lines = f.readlines()
+        with open(path, 'wb') as f:
+            f.writelines(lines[:args.rows + 1])
+
+        print(f"\n📊 Incremental benchmark: {args.rows:,} rows, then {args.append:,} appended")
+        print("=" * 60)
+        first = summarize(path, 'incremental', args.chunksize)
+        with open(path, 'ab') as f:
+            f.writelines(lines[args.rows + 1:])
+        appended = summarize(path, 'incremental', args.chunksize)
+        rebuilt = summarize(path, 'stream', args.chunksize)
+        for label, res in (('First run (full build)', first), ('After append (incremental)', appended),
+                           ('Full streamed rebuild', rebuilt)):
+            print(f"  {label:<28} {res['seconds']:>8.2f} s   {res['rows']:>12,} rows")
+        print("-" * 60)
+        print(f"  Speedup (incremental vs rebuild): {rebuilt['seconds'] / appended['seconds']:,.1f}x")
+
+        problems = compare(rebuilt, appended)
+        if problems:
+            print(f"❌ Incremental result differs from a rebuild in: {', '.join(problems)}")
+            sys.exit(1)
+        print("✅ Incremental results match a full rebuild")
+
+        # Same-length in-place edit of the first data row: must not be folded in as an append
+        with open(path, 'r+b') as f:
+            f.seek(len(lines[0]))
+            f.write(b'Z' * min(4, len(lines[1]) - 1))
+        edited = summarize(path, 'incremental', args.chunksize)
+        problems = compare(summarize(path, 'stream', args.chunksize), edited)
+        if problems:
+            print(f"❌ In-place edit was not detected ({', '.join(problems)} differ)")
+            sys.exit(1)
+        print("✅ In-place edit detected and rebuilt")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
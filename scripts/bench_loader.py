@@ -0,0 +1,91 @@
+"""
+Loader Benchmark
+Compares a cold laptops.csv parse against a warm columnar cache load
+
+Usage:
+    python scripts/bench_loader.py                  # the real laptops.csv
+    python scripts/bench_loader.py --rows 1000000   # replicated to 1M rows
+"""
+import pandas as pd
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+import data_loader
+from data_loader import DATA_PATH, load_laptops, read_csv
+
+
+def best_of(fn, repeat):
+    """Best wall time of `repeat` calls, plus the last result."""
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def replicate_csv(src, rows, dest):
+    """Write `rows` rows to `dest` by repeating the data lines of `src`
+    (streamed, so 10M+ row files do not need to fit in memory)."""
+    with open(src, 'rb') as f:
+        header, *lines = f.read().splitlines(keepends=True)
+    if not lines[-1].endswith(b'\n'):
+        lines[-1] += b'\n'
+    with open(dest, 'wb') as out:
+        out.write(header)
+        for _ in range(rows // len(lines)):
+            out.writelines(lines)
+        out.writelines(lines[:rows % len(lines)])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=0, help='replicate laptops.csv to this many rows')
+    parser.add_argument('--repeat', type=int, default=3, help='timing repeats (best is reported)')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='bench_loader_')
+    # Keep benchmark caches out of the project's .cache
+    data_loader.CACHE_DIR = os.path.join(workdir, 'cache')
+    try:
+        csv_path = DATA_PATH
+        if args.rows:
+            csv_path = os.path.join(workdir, 'laptops.csv')
+            print(f"Building {args.rows:,}-row CSV...")
+            replicate_csv(DATA_PATH, args.rows, csv_path)
+
+        size_mb = os.path.getsize(csv_path) / 1e6
+        print(f"\n📊 Loader benchmark: {csv_path} ({size_mb:,.1f} MB, best of {args.repeat})")
+        print("=" * 60)
+
+        t_infer, _ = best_of(lambda: pd.read_csv(csv_path), args.repeat)
+        t_schema, parsed = best_of(lambda: read_csv(csv_path), args.repeat)
+
+        data_loader.clear_cache(csv_path)
+        start = time.perf_counter()
+        load_laptops(csv_path)
+        t_build = time.perf_counter() - start
+
+        t_warm, cached = best_of(lambda: load_laptops(csv_path), args.repeat)
+        pd.testing.assert_frame_equal(parsed, cached)
+
+        results = [
+            ('Cold parse (type inference)', t_infer),
+            ('Cold parse (explicit schema)', t_schema),
+            ('First run (parse + write cache)', t_build),
+            (f'Warm cache load ({data_loader.CACHE_FORMAT})', t_warm),
+        ]
+        for label, seconds in results:
+            print(f"  {label:<36} {seconds * 1000:>10,.1f} ms")
+        print("-" * 60)
+        print(f"  Speedup (warm cache vs inferred parse): {t_infer / t_warm:,.1f}x")
+        print(f"  Cache size: {os.path.getsize(data_loader.cache_path(csv_path)) / 1e6:,.1f} MB")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
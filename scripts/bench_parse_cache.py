@@ -0,0 +1,89 @@
+"""
+Parse Cache Benchmark
+Times the price / number extraction and rule labelling of the cleaning stage
+per row (plain vectorized string ops) against parse_cache.memoize: once per
+distinct string on a cold cache, and with the persistent cache of an earlier run
+
+Usage:
+    python scripts/bench_parse_cache.py                   # 1M rows
+    python scripts/bench_parse_cache.py --rows 5000000
+"""
+import pandas as pd
+import numpy as np
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+import data_loader
+import parse_cache
+from cleaning import DECIMAL_KEY, NUMBER_KEY, PRICE_KEY, extract_decimal, extract_number, parse_price
+from data_loader import DATA_PATH, SCHEMA
+from parse_cache import memoize
+from rules import CPU_TIERS, GPU_TYPES
+
+PARSERS = [
+    ('Price', PRICE_KEY, parse_price),
+    ('ram', NUMBER_KEY, extract_number),
+    ('harddisk', NUMBER_KEY, extract_number),
+    ('screen_size', DECIMAL_KEY, extract_decimal),
+    ('cpu', CPU_TIERS.key, CPU_TIERS._match),
+    ('graphics', GPU_TYPES.key, GPU_TYPES._match),
+]
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1_000_000, help='rows to parse')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='bench_parse_cache_')
+    # Keep the parse cache out of the project's .cache
+    data_loader.CACHE_DIR = workdir
+    try:
+        columns = [col for col, _, _ in PARSERS]
+        base = pd.read_csv(DATA_PATH, usecols=columns, dtype={col: SCHEMA[col] for col in columns})
+        df = base.iloc[np.arange(args.rows) % len(base)].reset_index(drop=True)
+
+        print(f"\n📊 String parsing at {args.rows:,} rows (plain str columns)")
+        print("=" * 78)
+        print(f"  {'column':<12} {'distinct':>8} {'per row':>9} {'memo cold':>10} {'memo warm':>10} {'speedup':>8}  same")
+        totals = np.zeros(3)
+        for col, key, transform in PARSERS:
+            series = df[col]
+            per_row, expected = timed(lambda: transform(series))
+            parse_cache.clear()
+            # Includes writing the results, once, as a load does
+            cold, _ = timed(lambda: (memoize(series, transform, key, na_value=_na(key)), parse_cache.flush()))
+            # A later run: nothing in memory, everything in the persistent cache
+            parse_cache._memo.clear()
+            warm, result = timed(lambda: memoize(series, transform, key, na_value=_na(key)))
+            same = pd.Series(np.asarray(expected, dtype=object)).equals(pd.Series(result.to_numpy(dtype=object))) \
+                or np.allclose(np.asarray(expected, dtype=float), result.to_numpy(dtype=float), equal_nan=True)
+            totals += (per_row, cold, warm)
+            print(f"  {col:<12} {series.nunique():>8,} {per_row:>8.3f}s {cold:>9.3f}s {warm:>9.3f}s "
+                  f"{per_row / warm:>7.1f}x  {'✅' if same else '❌'}")
+        print("-" * 78)
+        print(f"  {'total':<12} {'':>8} {totals[0]:>8.3f}s {totals[1]:>9.3f}s {totals[2]:>9.3f}s "
+              f"{totals[0] / totals[2]:>7.1f}x")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def _na(key):
+    # Rule tables label missing values; the number parsers give NaN
+    for table in (CPU_TIERS, GPU_TYPES):
+        if key == table.key:
+            return table.null
+    return np.nan
+
+
+if __name__ == '__main__':
+    main()
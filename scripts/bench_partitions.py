@@ -0,0 +1,69 @@
+"""
+Partitioned Loading Benchmark
+Builds a directory of daily laptops-YYYY-MM-DD.csv partitions and compares
+loading them one after another with the thread-pooled load_partitions,
+against the time of the largest partition alone
+
+Usage:
+    python scripts/bench_partitions.py                       # 90 days
+    python scripts/bench_partitions.py --days 30 --rows 50000
+"""
+import pandas as pd
+import argparse
+import os
+import shutil
+import tempfile
+
+import data_loader
+from bench_loader import best_of, replicate_csv
+from data_loader import DATA_PATH, list_partitions, load_laptops, load_partitions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--days', type=int, default=90, help='number of daily partitions')
+    parser.add_argument('--rows', type=int, default=20000, help='rows in the largest partition')
+    parser.add_argument('--repeat', type=int, default=3, help='timing repeats (best is reported)')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='bench_partitions_')
+    # Keep benchmark caches out of the project's .cache
+    data_loader.CACHE_DIR = os.path.join(workdir, 'cache')
+    try:
+        root = os.path.join(workdir, 'daily')
+        os.makedirs(root)
+        print(f"Building {args.days} daily partitions (up to {args.rows:,} rows each)...")
+        days = pd.date_range(end='2024-06-30', periods=args.days, freq='D')
+        total_rows = 0
+        for i, day in enumerate(days):
+            # Exports grow over time: the newest partition is the largest
+            rows = max(args.rows * (i + 1) // args.days, 1)
+            replicate_csv(DATA_PATH, rows, os.path.join(root, f'laptops-{day:%Y-%m-%d}.csv'))
+            total_rows += rows
+        paths = [path for _, path in list_partitions(root)]
+
+        print(f"\n📊 Loading {args.days} partitions ({total_rows:,} rows), {os.cpu_count()} CPU(s)")
+        print("=" * 70)
+        for label, use_cache in (('cold (parse)', False), ('warm (cache)', True)):
+            if use_cache:
+                for p in paths:
+                    load_laptops(p)
+            largest, _ = best_of(lambda: load_laptops(paths[-1], use_cache=use_cache), args.repeat)
+            serial, _ = best_of(lambda: [load_laptops(p, use_cache=use_cache) for p in paths], args.repeat)
+            pooled, df = best_of(lambda: load_partitions(root, use_cache=use_cache), args.repeat)
+            print(f"  {label}")
+            print(f"    largest partition alone   {largest:>8.3f}s")
+            print(f"    one after another         {serial:>8.3f}s")
+            print(f"    load_partitions (threads) {pooled:>8.3f}s   {serial / pooled:.1f}x vs serial")
+
+        week, _ = best_of(lambda: load_partitions(root, start=days[-7], end=days[-1]), args.repeat)
+        print(f"  pruned to the last 7 days     {week:>8.3f}s")
+        print("-" * 70)
+        print(f"  {len(df):,} rows, {df['snapshot'].nunique()} snapshots, "
+              f"brand is {df['brand'].dtype.name} ({len(df['brand'].cat.categories)} categories)")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""
+Rule Engine Benchmark
+Times the rule tables of rules.py (vectorized regex matching) against the
+per-row Python functions they replaced (Series.apply), on plain string
+columns and on the loader's dictionary-encoded columns
+
+Usage:
+    python scripts/bench_rules.py                   # 1M rows
+    python scripts/bench_rules.py --rows 100000
+"""
+import numpy as np
+import argparse
+import shutil
+import tempfile
+
+import data_loader
+from bench_loader import best_of
+from data_loader import DATA_PATH, read_csv
+from rules import CPU_TIERS, GPU_TYPES, GRAPHICS_TYPES, OS_CATEGORIES, PROCESSOR_TIERS
+
+TABLES = [
+    ('cpu_tier', CPU_TIERS, 'cpu'),
+    ('processor_tier', PROCESSOR_TIERS, 'cpu'),
+    ('gpu_type', GPU_TYPES, 'graphics'),
+    ('graphics_type', GRAPHICS_TYPES, 'graphics'),
+    ('os_category', OS_CATEGORIES, 'OS'),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1_000_000, help='rows to label')
+    parser.add_argument('--repeat', type=int, default=3, help='timing repeats (best is reported)')
+    args = parser.parse_args()
+
+    # Keep the parse cache out of the project's .cache
+    workdir = tempfile.mkdtemp(prefix='bench_rules_')
+    data_loader.CACHE_DIR = workdir
+    base = read_csv(DATA_PATH, usecols=['cpu', 'graphics', 'OS'])
+    df = base.iloc[np.arange(args.rows) % len(base)].reset_index(drop=True)
+
+    print(f"\n📊 Rule tables at {args.rows:,} rows (best of {args.repeat})")
+    print("=" * 78)
+    print(f"  {'column':<15} {'input':<12} {'.apply':>9} {'vectorized':>11} {'speedup':>9}  same")
+    for name, table, col in TABLES:
+        for kind, series in (('str', df[col].astype(str).where(df[col].notna())), ('categorical', df[col])):
+            slow, expected = best_of(lambda: series.apply(table.label), args.repeat)
+            fast, result = best_of(lambda: table.apply(series), args.repeat)
+            same = (result.astype(object).to_numpy() == expected.astype(object).to_numpy()).all()
+            print(f"  {name:<15} {kind:<12} {slow:>8.3f}s {fast:>10.3f}s {slow / fast:>8.1f}x  {'✅' if same else '❌'}")
+    print("-" * 78)
+    print("  .apply on a categorical already runs once per category, hence the small gap there")
+    shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
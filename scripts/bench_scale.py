@@ -0,0 +1,215 @@
+"""
+Scale Benchmark
+Runs the analyses against seeded synthetic datasets (synthetic.py) of
+growing size, records time and peak memory, and compares them with a stored
+baseline so slowdowns are flagged:
+
+    python scripts/bench_scale.py                         # 10K, 1M and 10M rows, every analysis
+    python scripts/bench_scale.py --sizes 10000 1000000 --only 12_market_segmentation 13_value_anomalies deep_analysis
+    python scripts/bench_scale.py --save-baseline         # this run becomes the baseline
+
+Each size runs in a scratch copy of the project (scripts/ plus the
+synthetic CSV as its laptops.csv), so the real graphs/, gifs/ and .cache/
+are left alone. The table is first parsed and cleaned once, cold
+('prepare'); every analysis then runs in its own interpreter through
+profiling.py. Wall time, CPU time and peak RSS are those of the whole
+process (os.wait4); the stage split goes into the JSON results.
+
+A result is flagged when it is more than TOLERANCE slower than the baseline
+(and at least MIN_SLOWDOWN seconds), or its peak RSS more than TOLERANCE
+higher. The exit code is 1 when anything is flagged or fails.
+"""
+from datetime import datetime
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from scheduler import DEFAULT_GROUPS, select, task_name
+from snapshots import _write_atomic
+from synthetic import SEED, synthetic_csv
+
+# Setup paths
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_dir = os.path.dirname(script_dir)
+BASELINE_PATH = os.path.join(project_dir, '.cache', 'bench_scale_baseline.json')
+
+SIZES = [10_000, 1_000_000, 10_000_000]
+# Relative slowdown / memory growth over the baseline that gets flagged
+TOLERANCE = 0.25
+# Slowdowns smaller than this are noise, whatever their ratio
+MIN_SLOWDOWN = 0.5
+# A single analysis taking longer than this is stopped
+TIMEOUT = 3600
+# Settings of the calling shell that would point the analyses elsewhere
+SCRUBBED_ENV = ['LAPTOPS_SNAPSHOT', 'LAPTOPS_SHM', 'LAPTOPS_WHERE']
+
+
+def scratch_project(csv_path):
+    """Temporary project directory: a copy of scripts/ reading `csv_path`."""
+    root = tempfile.mkdtemp(prefix='bench_scale_')
+    shutil.copytree(script_dir, os.path.join(root, 'scripts'), ignore=shutil.ignore_patterns('__pycache__'))
+    for name in ('graphs', 'gifs'):
+        os.makedirs(os.path.join(root, name))
+    os.symlink(os.path.abspath(csv_path), os.path.join(root, 'laptops.csv'))
+    if os.path.exists(os.path.join(project_dir, 'brand_aliases.csv')):
+        shutil.copy(os.path.join(project_dir, 'brand_aliases.csv'), root)
+    return root
+
+
+def run_child(command, cwd, env, timeout=TIMEOUT):
+    """Status, wall and CPU seconds, peak RSS (MB) and error output of one
+    child process."""
+    with tempfile.TemporaryFile() as err:
+        start = time.perf_counter()
+        proc = subprocess.Popen(command, cwd=cwd, env=env, stdout=subprocess.DEVNULL, stderr=err)
+        timer = threading.Timer(timeout, proc.kill)
+        timer.start()
+        try:
+            # wait4, not wait: its resource usage is this child's alone
+            _, status, usage = os.wait4(proc.pid, 0)
+        finally:
+            timer.cancel()
+        wall = time.perf_counter() - start
+        proc.returncode = os.waitstatus_to_exitcode(status)
+        err.seek(0)
+        error = err.read().decode('utf-8', 'replace').strip()
+    # Kilobytes on Linux, bytes on macOS
+    peak = usage.ru_maxrss / (2**20 if sys.platform == 'darwin' else 2**10)
+    if proc.returncode == 0:
+        state = 'ok'
+    else:
+        state = 'timeout' if wall >= timeout else 'failed'
+    return {'status': state, 'wall': round(wall, 3), 'cpu': round(usage.ru_utime + usage.ru_stime, 3),
+            'peak_rss_mb': round(peak, 1)}, error
+
+
+def bench_size(rows, tasks, seed):
+    """Results of `tasks` (plus 'prepare') against the `rows`-row dataset."""
+    start = time.perf_counter()
+    csv_path = synthetic_csv(rows, seed)
+    print(f"\n📏 {rows:,} rows ({os.path.getsize(csv_path) / 1e6:,.1f} MB, ready in "
+          f"{time.perf_counter() - start:.1f}s)")
+    root = scratch_project(csv_path)
+    scripts = os.path.join(root, 'scripts')
+    env = {k: v for k, v in os.environ.items() if k not in SCRUBBED_ENV}
+    env['MPLBACKEND'] = 'Agg'
+    results = {}
+    try:
+        results['prepare'], error = run_child(
+            [sys.executable, '-c', 'from cleaning import load_clean; load_clean()'], scripts, env)
+        _report('prepare', results['prepare'], error)
+        for task in tasks:
+            stages_path = os.path.join(root, 'stages.json')
+            result, error = run_child([sys.executable, 'profiling.py', task.script, '--json', stages_path],
+                                      scripts, env)
+            try:
+                with open(stages_path, encoding='utf-8') as f:
+                    result['stages'] = json.load(f)
+            except (OSError, ValueError):
+                pass
+            results[task_name(task)] = result
+            _report(task_name(task), result, error)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    return results
+
+
+def compare(runs, baseline):
+    """Print each result against the baseline; returns the flagged ones as
+    (rows, name, reason) tuples."""
+    flagged = []
+    print("\n📊 Against the baseline" + (f" of {baseline['created']}" if baseline else " (none saved yet)"))
+    print("=" * 100)
+    print(f"   {'rows':>10}  {'analysis':<28}{'wall':>9}{'base':>9}{'change':>9}{'peak MB':>10}{'base':>9}")
+    for rows, results in runs.items():
+        before = baseline['runs'].get(rows, {}) if baseline else {}
+        for name, r in results.items():
+            base = before.get(name)
+            notes = []
+            if r['status'] != 'ok':
+                notes.append(r['status'])
+            elif base and base['status'] == 'ok':
+                slower = r['wall'] - base['wall']
+                if slower > MIN_SLOWDOWN and slower > TOLERANCE * base['wall']:
+                    notes.append('slower')
+                if r['peak_rss_mb'] > (1 + TOLERANCE) * base['peak_rss_mb']:
+                    notes.append('more memory')
+            flagged += [(rows, name, note) for note in notes]
+            change = f"{r['wall'] / base['wall'] - 1:+.0%}" if base and base['wall'] else '-'
+            base_wall = f"{base['wall']:.2f}s" if base else '-'
+            base_peak = f"{base['peak_rss_mb']:.0f}" if base else '-'
+            icon = '⚠️' if notes else '✅'
+            print(f"{icon} {int(rows):>10,}  {name:<28}{r['wall']:>8.2f}s{base_wall:>9}{change:>9}"
+                  f"{r['peak_rss_mb']:>10.0f}{base_peak:>9}  {', '.join(notes)}")
+    return flagged
+
+
+def load_baseline(path):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES, help='row counts (default: %(default)s)')
+    parser.add_argument('--only', nargs='+', default=DEFAULT_GROUPS, help='tasks or groups (default: %(default)s)')
+    parser.add_argument('--seed', type=int, default=SEED, help='synthetic data seed')
+    parser.add_argument('--baseline', default=BASELINE_PATH, help='baseline results file')
+    parser.add_argument('--save-baseline', action='store_true', help='store this run as the baseline')
+    parser.add_argument('--json', help='also write this run\'s results here')
+    args = parser.parse_args()
+    try:
+        tasks = select(args.only)
+    except ValueError as e:
+        parser.error(str(e))
+
+    print(f"🏋️ Scale benchmark: {len(tasks)} analyses at {', '.join(f'{n:,}' for n in args.sizes)} rows "
+          f"(seed {args.seed})")
+    print("=" * 60)
+    # JSON keys: sizes as strings
+    runs = {str(rows): bench_size(rows, tasks, args.seed) for rows in args.sizes}
+    report = {'created': datetime.now().isoformat(timespec='seconds'), 'seed': args.seed,
+              'python': sys.version.split()[0], 'cpus': os.cpu_count(), 'runs': runs}
+
+    baseline = load_baseline(args.baseline)
+    if baseline and baseline.get('seed') != args.seed:
+        print(f"⚠️ Baseline used seed {baseline.get('seed')}, not {args.seed}: not comparable")
+        baseline = None
+    flagged = compare(runs, baseline)
+
+    if args.json:
+        _write_atomic(args.json, json.dumps(report, indent=2).encode('utf-8'))
+    if args.save_baseline:
+        if baseline:
+            # Sizes or analyses left out of this run keep their old numbers
+            for rows, results in baseline['runs'].items():
+                runs[rows] = {**results, **runs.get(rows, {})}
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        _write_atomic(args.baseline, json.dumps(report, indent=2).encode('utf-8'))
+        print(f"💾 Baseline saved: {args.baseline}")
+    if flagged:
+        print(f"\n⚠️ {len(flagged)} regression(s) or failure(s): "
+              + ', '.join(f'{name} @ {int(rows):,} ({note})' for rows, name, note in flagged))
+        return 1
+    return 0
+
+
+def _report(name, result, error):
+    print(f"   {'✅' if result['status'] == 'ok' else '❌'} {name:<28} {result['wall']:>8.2f}s "
+          f"{result['peak_rss_mb']:>8.0f} MB")
+    if result['status'] != 'ok':
+        print('      ' + '\n      '.join(error.splitlines()[-5:] or [result['status']]))
+    sys.stdout.flush()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,93 @@
+"""
+Segmentation Benchmark
+Times the vectorized market segmentation of segments.py against the per-row
+functions it replaced (DataFrame.apply with axis=1) and checks that both give
+the same segment for every row
+
+Usage:
+    python scripts/bench_segments.py                   # 1M rows
+    python scripts/bench_segments.py --rows 100000
+"""
+import pandas as pd
+import numpy as np
+import argparse
+import shutil
+import tempfile
+
+import cleaning
+import data_loader
+from bench_loader import best_of
+from cleaning import load_clean
+from data_loader import DATA_PATH
+from segments import CHART_SEGMENTS, MARKET_SEGMENTS, segment
+
+
+# The row functions of deep_analysis.py, 09_advanced_viz.py and gif_04_segment_pie.py
+def market_segment(row):
+    price = row['price']
+    gpu = row['gpu_type']
+    cpu = row['cpu_tier']
+    if gpu == 'Dedicated' and cpu in ['Flagship', 'High-End'] and price > 1500:
+        return 'Gaming/Workstation'
+    elif gpu == 'Dedicated' and price > 800:
+        return 'Gaming Budget'
+    elif cpu in ['Flagship', 'High-End'] and price > 1200:
+        return 'Business Premium'
+    elif price < 400:
+        return 'Budget'
+    elif price < 800:
+        return 'Mid-Range'
+    return 'Standard'
+
+
+def chart_segment(row):
+    p = row['price']
+    gpu = row['gpu_type']
+    if gpu == 'Dedicated' and p > 1200: return 'Gaming/Workstation'
+    elif gpu == 'Dedicated': return 'Gaming Budget'
+    elif p > 1200: return 'Business Premium'
+    elif p < 400: return 'Budget'
+    elif p < 800: return 'Mid-Range'
+    return 'Standard'
+
+
+def gif_segment(row):
+    return chart_segment({'price': row['price'] if pd.notna(row['price']) else 500, 'gpu_type': row['gpu_type']})
+
+
+CASES = [
+    ('deep_analysis', market_segment, lambda df: segment(df, MARKET_SEGMENTS)),
+    ('09_advanced_viz', chart_segment, lambda df: segment(df, CHART_SEGMENTS)),
+    ('gif_04', gif_segment, lambda df: segment(df.assign(price=df['price'].fillna(500)), CHART_SEGMENTS)),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1_000_000, help='rows to segment')
+    parser.add_argument('--repeat', type=int, default=3, help='timing repeats (best is reported)')
+    args = parser.parse_args()
+
+    # Keep the derived table and parse cache out of the project's .cache
+    workdir = tempfile.mkdtemp(prefix='bench_segments_')
+    data_loader.CACHE_DIR = cleaning.CACHE_DIR = workdir
+    try:
+        # All rows, unfiltered: missing prices and Unknown GPUs included
+        base = load_clean(DATA_PATH, use_cache=False)[['price', 'gpu_type', 'cpu_tier']]
+        df = base.iloc[np.arange(args.rows) % len(base)].reset_index(drop=True)
+
+        print(f"\n📊 Market segmentation at {args.rows:,} rows (best of {args.repeat})")
+        print("=" * 70)
+        print(f"  {'rules of':<16} {'.apply':>9} {'vectorized':>11} {'speedup':>9}  same")
+        for name, row_function, vectorized in CASES:
+            slow, expected = best_of(lambda: df.apply(row_function, axis=1), args.repeat)
+            fast, result = best_of(lambda: vectorized(df), args.repeat)
+            same = (result.to_numpy(dtype=object) == expected.to_numpy(dtype=object)).all()
+            print(f"  {name:<16} {slow:>8.3f}s {fast:>10.3f}s {slow / fast:>8.1f}x  {'✅' if same else '❌'}")
+        print("-" * 70)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
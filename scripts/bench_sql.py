@@ -0,0 +1,154 @@
+"""
+SQL Backend Benchmark
+Runs the group-bys behind 07_top_sellers.py and 11_price_prediction.py on
+the pandas path and as SQLite queries (sql_backend.py), and compares wall
+time and peak memory of both at several table sizes
+
+Usage:
+    python scripts/bench_sql.py                          # 100K, 1M and 10M rows
+    python scripts/bench_sql.py --rows 100000,1000000
+"""
+import numpy as np
+import argparse
+import json
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+def pandas_workload(path):
+    from aggregates import TOP_N, TOP_SELLER_COLUMNS, is_seller, prepare, with_labels
+    from cleaning import apply_profile, load_clean
+    from rules import PROCESSOR_TIERS
+
+    df = prepare(load_clean(path))
+    sellers = df[is_seller(df)]
+    top = with_labels(sellers.nlargest(TOP_N, 'total_sales_clean'))[TOP_SELLER_COLUMNS]
+    seller_revenue = sellers.groupby('brand', observed=True)['total_sales_clean'].sum()
+
+    df = apply_profile(df, 'model')
+    brand_stats = df.groupby('brand_clean', observed=True)['price'].agg(['mean', 'median', 'count', 'std'])
+    tiers = PROCESSOR_TIERS.apply(df['cpu'])
+    proc_stats = df.groupby(tiers)['price'].agg(['mean', 'count'])
+    return top, seller_revenue, brand_stats, proc_stats
+
+
+def sql_workload(path):
+    from sql_backend import SqlAggregates, profile_where, query
+
+    PRICE_FILTER = profile_where('model')
+    agg = SqlAggregates(path)
+    top, seller_revenue = agg.top_sellers, agg.seller_revenue
+    brand_stats = query(f"""
+        WITH ranked AS (
+            SELECT brand_clean, price,
+                   ROW_NUMBER() OVER (PARTITION BY brand_clean ORDER BY price) AS rn,
+                   COUNT(*) OVER (PARTITION BY brand_clean) AS n,
+                   AVG(price) OVER (PARTITION BY brand_clean) AS mean
+            FROM laptops WHERE brand_clean IS NOT NULL AND {PRICE_FILTER}
+        )
+        SELECT brand_clean, AVG(price) AS mean,
+               AVG(CASE WHEN rn IN ((n + 1) / 2, (n + 2) / 2) THEN price END) AS median,
+               COUNT(*) AS count, SUM((price - mean) * (price - mean)) / (COUNT(*) - 1) AS var
+        FROM ranked GROUP BY brand_clean ORDER BY brand_clean
+    """, path).set_index('brand_clean')
+    brand_stats['std'] = np.sqrt(brand_stats.pop('var'))
+    proc_stats = query(f"""
+        SELECT processor_tier, AVG(price) AS mean, COUNT(*) AS count
+        FROM laptops WHERE {PRICE_FILTER} GROUP BY processor_tier ORDER BY processor_tier
+    """, path).set_index('processor_tier')
+    return top, seller_revenue, brand_stats, proc_stats
+
+
+def worker(backend, path, cache_dir):
+    """One timed run in this (fresh) process; prints a JSON summary."""
+    import aggregates
+    import cleaning
+    import data_loader
+    import sql_backend
+    data_loader.CACHE_DIR = aggregates.CACHE_DIR = cleaning.CACHE_DIR = sql_backend.CACHE_DIR = cache_dir
+
+    start = time.perf_counter()
+    top, seller_revenue, brand_stats, proc_stats = (sql_workload if backend == 'sqlite' else pandas_workload)(path)
+    seconds = time.perf_counter() - start
+    print(json.dumps({
+        'seconds': seconds,
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        'top_sales': top['total_sales_clean'].tolist(),
+        'seller_revenue': {str(k): v for k, v in seller_revenue.items()},
+        'brand_stats': {str(k): list(v) for k, v in brand_stats[['mean', 'median', 'count', 'std']].iterrows()},
+        'proc_stats': {str(k): list(v) for k, v in proc_stats[['mean', 'count']].iterrows()},
+    }, default=float))
+
+
+def run(backend, path, cache_dir):
+    cmd = [sys.executable, __file__, '--worker', backend, '--path', path, '--cache-dir', cache_dir]
+    proc = subprocess.run(cmd, capture_output=True, text=True)
+    if proc.returncode != 0:
+        # e.g. killed by the OOM killer on the larger sizes
+        return {'error': proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else f'exit {proc.returncode}'}
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def same_results(a, b):
+    if a['top_sales'] != b['top_sales'] or a['seller_revenue'].keys() != b['seller_revenue'].keys():
+        return False
+    if not np.allclose(list(a['seller_revenue'].values()), list(b['seller_revenue'].values())):
+        return False
+    for key in ('brand_stats', 'proc_stats'):
+        if a[key].keys() != b[key].keys():
+            return False
+        if not np.allclose(np.array(list(a[key].values()), dtype=float),
+                           np.array(list(b[key].values()), dtype=float), equal_nan=True):
+            return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', default='100000,1000000,10000000', help='comma-separated table sizes')
+    parser.add_argument('--worker', choices=['pandas', 'sqlite'], help=argparse.SUPPRESS)
+    parser.add_argument('--path', help=argparse.SUPPRESS)
+    parser.add_argument('--cache-dir', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(args.worker, args.path, args.cache_dir)
+        return
+
+    from bench_loader import replicate_csv
+    from data_loader import DATA_PATH
+
+    print("\n📊 SQL backend benchmark: 07/11 group-bys, pandas vs SQLite pushdown")
+    print("   cold = first run (parse + columnar cache / build database), warm = cached")
+    print("=" * 78)
+    print(f"  {'rows':>11}  {'backend':<8} {'cold':>9} {'warm':>9} {'warm peak RSS':>15}")
+    for rows in (int(r) for r in args.rows.split(',')):
+        workdir = tempfile.mkdtemp(prefix='bench_sql_')
+        try:
+            path = os.path.join(workdir, 'laptops.csv')
+            replicate_csv(DATA_PATH, rows, path)
+            results = {}
+            for backend in ('pandas', 'sqlite'):
+                cache_dir = os.path.join(workdir, f'cache-{backend}')
+                cold = run(backend, path, cache_dir)
+                warm = run(backend, path, cache_dir) if 'error' not in cold else cold
+                results[backend] = warm
+                if 'error' in warm:
+                    print(f"  {rows:>11,}  {backend:<8} failed: {warm['error']}")
+                    continue
+                print(f"  {rows:>11,}  {backend:<8} {cold['seconds']:>8.2f}s {warm['seconds']:>8.2f}s "
+                      f"{warm['peak_rss_mb']:>12,.0f} MB")
+            if all('error' not in r for r in results.values()):
+                verdict = '✅ same results' if same_results(results['pandas'], results['sqlite']) else '❌ results differ'
+                print(f"  {'':>11}  {verdict}")
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+    print("-" * 78)
+
+
+if __name__ == '__main__':
+    main()
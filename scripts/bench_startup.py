@@ -0,0 +1,86 @@
+"""
+Startup Benchmark
+Time from `python scripts/<entry point>` to the first line of its main():
+each entry point's module is imported in a fresh interpreter, timed end to
+end and with `python -X importtime`, which also shows which heavy
+libraries (HEAVY_MODULES) it pulls in before doing any work. Text-only
+entry points (TEXT_ONLY) are also timed for a whole run.
+
+Usage:
+    python scripts/bench_startup.py                       # every entry point
+    python scripts/bench_startup.py deep_analysis 12_market_segmentation
+    python scripts/bench_startup.py --repeat 5 --no-run
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+from bench_loader import best_of
+from scheduler import TASKS, task_name
+
+# Setup paths
+script_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Command-line tools besides the analyses
+TOOLS = ['scheduler', 'render_daemon', 'build_cache', 'snapshots', 'validation', 'dedup', 'brands', 'shared_data']
+# Libraries worth reporting when an import pulls them in
+HEAVY_MODULES = ['pandas', 'matplotlib.pyplot', 'sklearn', 'scipy', 'PIL.Image']
+# Entry points that print a report without drawing anything
+TEXT_ONLY = ['deep_analysis']
+
+
+def import_command(name):
+    return [sys.executable, '-c', f'import importlib; importlib.import_module({name!r})']
+
+
+def import_profile(name):
+    """(total import seconds, {heavy module: cumulative seconds}) from -X importtime."""
+    proc = subprocess.run([sys.executable, '-X', 'importtime', *import_command(name)[1:]],
+                          capture_output=True, text=True, cwd=script_dir, check=True)
+    total, heavy = 0, {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, module = line[len('import time:'):].split('|')
+        if not module.startswith('  '):
+            # Top-level import of the -c statement
+            total += int(cumulative)
+        module = module.strip()
+        if module in HEAVY_MODULES and module not in heavy:
+            heavy[module] = int(cumulative) / 1e6
+    return total / 1e6, heavy
+
+
+def run_seconds(command, repeat):
+    seconds, _ = best_of(lambda: subprocess.run(command, capture_output=True, cwd=script_dir, check=True), repeat)
+    return seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('names', nargs='*', help='entry points (default: every task and tool)')
+    parser.add_argument('--repeat', type=int, default=3, help='timing repeats (best is reported)')
+    parser.add_argument('--no-run', action='store_true', help='skip the whole-run timing of text-only entry points')
+    args = parser.parse_args()
+    names = args.names or [task_name(t) for t in TASKS] + TOOLS
+
+    bare = run_seconds([sys.executable, '-c', 'pass'], args.repeat)
+    print(f"\n🚀 Entry point start-up, best of {args.repeat} (bare interpreter: {bare:.3f}s)")
+    print("=" * 96)
+    print(f"  {'entry point':<26} {'start-up':>9} {'imports':>9}  heavy libraries loaded (cumulative import time)")
+    for name in names:
+        startup = run_seconds(import_command(name), args.repeat)
+        total, heavy = import_profile(name)
+        loaded = ', '.join(f'{module} {seconds:.2f}s' for module, seconds in heavy.items()) or '-'
+        print(f"  {name:<26} {startup:>8.3f}s {total:>8.3f}s  {loaded}")
+    print("-" * 96)
+
+    if not args.no_run:
+        for name in [n for n in TEXT_ONLY if n in names]:
+            seconds = run_seconds([sys.executable, f'{name}.py'], args.repeat)
+            print(f"  {name + '.py (whole run)':<26} {seconds:>8.3f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""
+Streaming Benchmark
+Checks that --stream aggregates match the in-memory path and compares wall
+time and peak memory of both
+
+Usage:
+    python scripts/bench_streaming.py                      # the real laptops.csv
+    python scripts/bench_streaming.py --rows 2000000       # replicated to 2M rows
+"""
+import numpy as np
+import argparse
+import json
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from aggregates import PRICE_BIN_WIDTH
+from data_loader import DATA_PATH
+
+
+def summarize(path, mode, chunksize):
+    """Run one mode and return its headline numbers (in a fresh process for honest peak RSS)."""
+    from aggregates import load_aggregates
+    start = time.perf_counter()
+    agg = load_aggregates(path, mode=mode, chunksize=chunksize)
+    top_brands = agg.window_brand_counts.head(6).index.tolist()
+    return {
+        'seconds': time.perf_counter() - start,
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        'rows': agg.rows,
+        'brand_nunique': agg.brand_nunique,
+        'brand_counts': agg.brand_counts.head(10).to_dict(),
+        'revenue_total': agg.revenue_total,
+        'seller_top': agg.top_sellers['total_sales_clean'].tolist(),
+        'price_mean': agg.price_mean,
+        'price_min': agg.price_min,
+        'price_max': agg.price_max,
+        'median': agg.price_median(),
+        'brand_medians': {b: agg.price_median(b) for b in top_brands},
+    }
+
+
+def run_mode(path, mode, chunksize):
+    cmd = [sys.executable, __file__, '--worker', mode, '--path', path, '--chunksize', str(chunksize)]
+    out = subprocess.run(cmd, capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def compare(exact, streamed):
+    """List of mismatches; medians may differ by up to one price bin."""
+    problems = []
+    for key in ('rows', 'brand_nunique', 'brand_counts', 'price_min', 'price_max'):
+        if exact[key] != streamed[key]:
+            problems.append(key)
+    for key in ('revenue_total', 'price_mean'):
+        if not np.isclose(exact[key], streamed[key]):
+            problems.append(key)
+    if not np.allclose(exact['seller_top'], streamed['seller_top']):
+        problems.append('seller_top')
+    medians = [(exact['median'], streamed['median'])]
+    medians += [(v, streamed['brand_medians'].get(b, np.nan)) for b, v in exact['brand_medians'].items()]
+    if any(not abs(a - b) <= PRICE_BIN_WIDTH for a, b in medians):
+        problems.append('medians')
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=0, help='replicate laptops.csv to this many rows')
+    parser.add_argument('--chunksize', type=int, default=200_000)
+    parser.add_argument('--worker', choices=['memory', 'stream'], help=argparse.SUPPRESS)
+    parser.add_argument('--path', default=DATA_PATH, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(summarize(args.path, args.worker, args.chunksize), default=float))
+        return
+
+    workdir = tempfile.mkdtemp(prefix='bench_streaming_')
+    try:
+        path = DATA_PATH
+        if args.rows:
+            from bench_loader import replicate_csv
+            path = os.path.join(workdir, 'laptops.csv')
+            print(f"Building {args.rows:,}-row CSV...")
+            replicate_csv(DATA_PATH, args.rows, path)
+
+        print(f"\n📊 Streaming benchmark: {os.path.getsize(path) / 1e6:,.1f} MB, chunks of {args.chunksize:,} rows")
+        print("=" * 60)
+        exact = run_mode(path, 'memory', args.chunksize)
+        streamed = run_mode(path, 'stream', args.chunksize)
+        for label, res in (('In-memory', exact), ('Streaming', streamed)):
+            print(f"  {label:<10} {res['seconds']:>8.2f} s   peak RSS {res['peak_rss_mb']:>8,.0f} MB")
+        print("-" * 60)
+        print(f"  Median: ${exact['median']:,.2f} (memory) vs ${streamed['median']:,.2f} (stream), "
+              f"tolerance ${PRICE_BIN_WIDTH:,.2f}")
+        problems = compare(exact, streamed)
+        if problems:
+            print(f"❌ Mismatch in: {', '.join(problems)}")
+            sys.exit(1)
+        print("✅ Streaming results match the in-memory path")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,131 @@
+"""
+Figure Template Benchmark
+Renders a per-brand 2x2 dashboard for every brand twice: the way the chart
+scripts used to, with a new themed figure per brand, and with one
+theme.FigureTemplate whose bars and texts are updated for each brand. Both
+renders are compared pixel for pixel.
+
+Usage:
+    python scripts/bench_templates.py                 # every brand
+    python scripts/bench_templates.py --brands 10 --repeat 5
+"""
+import numpy as np
+import argparse
+import io
+from theme import DARK, FigureTemplate, use_file_backend
+use_file_backend()
+import matplotlib.pyplot as plt
+from PIL import Image, ImageChops
+
+from bench_loader import best_of
+from cleaning import load_clean
+from data_loader import DATA_PATH
+
+RAM_TIERS = [4, 8, 16, 32, 64]
+CPU_TIERS = ['Flagship', 'High-End', 'Mid-Range', 'Entry', 'Budget']
+PRICE_EDGES = np.arange(0, 4001, 250)
+COLORS = ['#58a6ff', '#a371f7', '#56d364', '#f0883e']
+
+
+def brand_stats(df, brand):
+    rows = df[df['brand_clean'] == brand]
+    prices = rows['price'].dropna()
+    return {
+        'prices': np.histogram(prices, PRICE_EDGES)[0],
+        'ram': rows['ram_gb'].value_counts().reindex(RAM_TIERS, fill_value=0).to_numpy(),
+        'cpu': rows.groupby('cpu_tier')['price'].mean().reindex(CPU_TIERS).fillna(0).to_numpy(),
+        'summary': f"{len(rows):,} laptops\n${prices.mean() if len(prices) else 0:,.0f} average\n"
+                   f"${rows['revenue'].sum() / 1e3:,.0f}K revenue",
+    }
+
+
+def render_fresh(brand, stats):
+    """A new figure themed by hand, as each script did."""
+    fig, axes = plt.subplots(2, 2, figsize=(12, 9))
+    fig.patch.set_facecolor(DARK.background)
+    fig.suptitle(brand, fontsize=22, fontweight='bold', color='white', y=0.98)
+    for ax in axes.flat:
+        ax.set_facecolor(DARK.background)
+        ax.tick_params(colors='white')
+        for spine in ax.spines.values(): spine.set_color(DARK.spine)
+    for ax, key, color in zip(axes.flat, ['prices', 'ram', 'cpu'], COLORS):
+        ax.bar(range(len(stats[key])), stats[key], color=color)
+    _decorate(axes)
+    axes[1, 1].text(0.5, 0.5, stats['summary'], ha='center', va='center', fontsize=16, color='white',
+                    transform=axes[1, 1].transAxes)
+    buf = io.BytesIO()
+    fig.savefig(buf, format='png', facecolor=DARK.background, dpi=80)
+    plt.close(fig)
+    return buf.getvalue()
+
+
+def render_templated(chart, brand, stats):
+    """The template's bars and texts updated for `brand`."""
+    axes = chart.axes
+    for ax, key, color in zip(axes.flat, ['prices', 'ram', 'cpu'], COLORS):
+        chart.bars(ax, key, stats[key], color=color)
+    chart.text(axes[1, 1], 'summary', 0.5, 0.5, stats['summary'], ha='center', va='center', fontsize=16,
+               color='white', transform=axes[1, 1].transAxes)
+    chart.fig.suptitle(brand, fontsize=22, fontweight='bold', color='white', y=0.98)
+    buf = io.BytesIO()
+    chart.fig.savefig(buf, format='png', facecolor=DARK.background, dpi=80)
+    return buf.getvalue()
+
+
+def new_template():
+    chart = FigureTemplate(2, 2, figsize=(12, 9))
+    _decorate(chart.axes)
+    return chart
+
+
+def _decorate(axes):
+    # Labels, ticks and titles: the same for every brand
+    ax1, ax2, ax3, ax4 = axes.flat
+    ax1.set_xticks(range(0, len(PRICE_EDGES) - 1, 4))
+    ax1.set_xticklabels([f'${e:,}' for e in PRICE_EDGES[:-1:4]])
+    ax1.set_title('Price Distribution', color='white', fontsize=14, fontweight='bold')
+    ax2.set_xticks(range(len(RAM_TIERS)))
+    ax2.set_xticklabels([f'{r}GB' for r in RAM_TIERS])
+    ax2.set_title('RAM', color='white', fontsize=14, fontweight='bold')
+    ax3.set_xticks(range(len(CPU_TIERS)))
+    ax3.set_xticklabels(CPU_TIERS, fontsize=9)
+    ax3.set_title('Average Price by CPU Tier', color='white', fontsize=14, fontweight='bold')
+    ax4.set_xticks([])
+    ax4.set_yticks([])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--brands', type=int, help='largest N brands only (default: all)')
+    parser.add_argument('--repeat', type=int, default=3, help='timing repeats (best is reported)')
+    args = parser.parse_args()
+
+    df = load_clean(DATA_PATH)
+    brands = df['brand_clean'].value_counts()
+    brands = brands[brands > 0].index[:args.brands]
+    stats = {brand: brand_stats(df, brand) for brand in brands}
+
+    def fresh():
+        return [render_fresh(brand, s) for brand, s in stats.items()]
+
+    def templated():
+        chart = new_template()
+        images = [render_templated(chart, brand, s) for brand, s in stats.items()]
+        chart.close()
+        return images
+
+    print(f"\n🎨 Per-brand dashboards: {len(stats)} brands (best of {args.repeat})")
+    print("=" * 60)
+    slow, expected = best_of(fresh, args.repeat)
+    fast, result = best_of(templated, args.repeat)
+    same = all(ImageChops.difference(Image.open(io.BytesIO(a)).convert('RGB'),
+                                     Image.open(io.BytesIO(b)).convert('RGB')).getbbox() is None
+               for a, b in zip(expected, result))
+    print(f"  {'new figure per brand':<24} {slow:>8.3f}s  {slow / len(stats) * 1000:>7.1f} ms/brand")
+    print(f"  {'one template':<24} {fast:>8.3f}s  {fast / len(stats) * 1000:>7.1f} ms/brand")
+    print(f"  {'speedup':<24} {slow / fast:>8.2f}x  same pixels: {'✅' if same else '❌'}")
+    print("-" * 60)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,182 @@
+"""
+Brand Canonicalization
+Maps seller-entered brand strings to one canonical brand, so variants such
+as "HP", "hp", "HP Inc." and "Hewlett-Packard" count as the same brand in
+`brand_clean`.
+
+Each distinct string is reduced to a match key (upper case, punctuation
+and legal suffixes like INC / CORP / LTD dropped). Keys are then clustered
+with fuzzy matching - same letters ignoring spaces ("HEWLETTPACKARD" ~
+"HEWLETT PACKARD") or one edit ("LENOVOO" ~ "LENOVO") - but only keys
+sharing a blocking key are ever compared, never all pairs. The blocking keys
+are the letters with each one in turn left out (any two keys one edit apart
+share one). A cluster is named after its most common spelling (by rows), so
+a typo never renames the brand it is a typo of; the shortest spelling only
+breaks ties.
+
+Aliases in brand_aliases.csv (project root, or LAPTOPS_BRAND_ALIASES)
+override the clustering; the shipped file maps Hewlett-Packard to HP. Initials are only matched here: "LG" may be
+"Lucky Goldstar" as well as "Lenovo Gaming", so they are not guessed.
+
+    alias,brand
+    Toughbook,Panasonic
+    Latitude,Dell
+    Hewlett Packard,HP
+
+The mapping is remembered per raw string in the parse cache (parse_cache.py),
+so later runs only cluster strings they have not seen; names already
+assigned never change until the alias file does.
+"""
+import pandas as pd
+import numpy as np
+import os
+import re
+from collections import defaultdict
+
+import parse_cache
+from data_loader import file_digest, project_dir
+from parse_cache import memoize
+
+# Bump when the matching rules change so cached mappings are rebuilt
+BRANDS_VERSION = 2
+
+ALIAS_PATH = os.path.join(project_dir, 'brand_aliases.csv')
+ENV_VAR = 'LAPTOPS_BRAND_ALIASES'
+
+# Trailing words that do not tell brands apart
+LEGAL_SUFFIXES = {'INC', 'INCORPORATED', 'CORP', 'CORPORATION', 'CO', 'COMPANY',
+                  'LTD', 'LIMITED', 'LLC', 'PLC', 'GMBH'}
+
+# Keys shorter than this only match exactly
+MIN_FUZZY_LENGTH = 5
+# Edits allowed between fuzzy-matched keys (the blocking keys cover one)
+MAX_EDITS = 1
+
+
+def canonical_brands(series):
+    """Canonical upper-case brand of every value of `series` (missing stays
+    missing). Matching runs once per distinct string."""
+    return memoize(series, _canonicalize, mapping_key(), text=True, counts=True)
+
+
+def match_key(name):
+    """'Hewlett-Packard Inc.' -> 'HEWLETT PACKARD'."""
+    words = re.sub(r'[^0-9A-Z]+', ' ', str(name).upper()).split()
+    while len(words) > 1 and words[-1] in LEGAL_SUFFIXES:
+        words.pop()
+    return ' '.join(words)
+
+
+def alias_path():
+    return os.environ.get(ENV_VAR) or ALIAS_PATH
+
+
+def load_aliases(path=None):
+    """{match key: canonical brand} from the alias file ({} without one)."""
+    path = path or alias_path()
+    if not os.path.exists(path):
+        return {}
+    aliases = pd.read_csv(path, dtype=str, comment='#', skipinitialspace=True).dropna()
+    return {match_key(alias): brand.upper().strip() for alias, brand in zip(aliases['alias'], aliases['brand'])}
+
+
+def mapping_key():
+    """Parse cache key: changes with the matching rules and the alias file."""
+    path = alias_path()
+    aliases = file_digest(path)[:12] if os.path.exists(path) else 'none'
+    return f'brands:v{BRANDS_VERSION}:{aliases}'
+
+
+def similar(a, b):
+    """True when match keys `a` and `b` name the same brand."""
+    ca, cb = a.replace(' ', ''), b.replace(' ', '')
+    if ca == cb:
+        return True
+    if min(len(ca), len(cb)) < MIN_FUZZY_LENGTH:
+        return False
+    return abs(len(ca) - len(cb)) <= MAX_EDITS and _edit_distance(ca, cb, MAX_EDITS) <= MAX_EDITS
+
+
+def blocking_keys(key):
+    """Keys that must be shared for two match keys to be compared."""
+    compact = key.replace(' ', '')
+    blocks = {'k' + compact}
+    if len(compact) >= MIN_FUZZY_LENGTH:
+        blocks.update('k' + compact[:i] + compact[i + 1:] for i in range(len(compact)))
+    return blocks
+
+
+def cluster(keys, counts=None):
+    """Group match keys into clusters of the same brand; returns
+    {key: representative key}, the representative being the member with the
+    most rows in `counts` (the shortest on ties). Only keys sharing a blocking
+    key are compared."""
+    counts = counts or {}
+    keys = sorted(set(keys))
+    parent = {key: key for key in keys}
+
+    def find(key):
+        while parent[key] != key:
+            parent[key] = parent[parent[key]]
+            key = parent[key]
+        return key
+
+    blocks = defaultdict(list)
+    for key in keys:
+        for block in blocking_keys(key):
+            blocks[block].append(key)
+    for members in blocks.values():
+        for i, a in enumerate(members):
+            for b in members[i + 1:]:
+                if find(a) != find(b) and similar(a, b):
+                    parent[find(a)] = find(b)
+
+    groups = defaultdict(list)
+    for key in keys:
+        groups[find(key)].append(key)
+    return {key: min(members, key=lambda k: (-counts.get(k, 0), len(k), k))
+            for members in groups.values() for key in members}
+
+
+def _canonicalize(names, counts):
+    """Canonical brands for the strings the parse cache has not seen yet
+    (`counts`: rows of each), clustered together with the strings it has."""
+    known = parse_cache.known(mapping_key())
+    aliases = load_aliases()
+    assigned = {match_key(name): brand for name, brand in known.items() if pd.notna(brand)}
+
+    keys = [match_key(name) for name in names]
+    # Rows of each new key, and its display form: its most common spelling
+    rows, display = defaultdict(int), {}
+    for name, key, n in sorted(zip(names, keys, counts), key=lambda item: (-item[2], len(item[0].strip()), item[0])):
+        rows[key] += n
+        display.setdefault(key, _display(name))
+
+    representative = cluster([*assigned, *keys], rows)
+    names_of = {}
+    for key in sorted(representative, key=lambda k: (k not in assigned, len(k), k)):
+        rep = representative[key]
+        # Clusters that already have a name keep it
+        names_of.setdefault(rep, assigned.get(key) or display.get(rep) or display[key])
+    return np.array([aliases.get(key) or names_of[representative[key]] for key in keys], dtype=object)
+
+
+def _display(name):
+    """'Dell Inc.' -> 'DELL': upper case, legal suffix dropped."""
+    words = name.upper().split()
+    while len(words) > 1 and re.sub(r'[^0-9A-Z]', '', words[-1]) in LEGAL_SUFFIXES:
+        words.pop()
+    return ' '.join(words).rstrip(' ,.') or name.upper().strip()
+
+
+def _edit_distance(a, b, limit):
+    """Levenshtein distance of `a` and `b`, or limit + 1 once it exceeds `limit`."""
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
@@ -0,0 +1,144 @@
+"""
+Build Cache
+Lets a run skip every output that is already up to date. Each task
+(scheduler.py) gets a key: the SHA-256 of what its outputs are made from -
+
+    the dataset          content of the current snapshot (snapshots.py)
+    the script           source of the task's own script
+    the shared code      SHARED_CODE: loaders, cleaning, rules, ... and the brand alias file
+    other inputs         content of any input another task writes
+    the mode             LAPTOPS_MODE (streamed charts use approximate quantiles)
+    the row predicate    LAPTOPS_WHERE (laptops.py --where)
+
+.cache/build_manifest.json records, per task, the key its outputs were built
+from and the size and mtime of each output file. A task is up to date when
+its key is unchanged and its outputs are still the files it wrote; a task
+reading the output of a stale task is stale too. File contents are hashed
+once per (size, mtime) and remembered in the manifest.
+
+Imports nothing heavier than hashlib, so a run with nothing to do finishes
+without loading pandas or matplotlib.
+
+Usage:
+    python scripts/build_cache.py          # up to date / stale, per task
+"""
+import hashlib
+import json
+import os
+
+from snapshots import _write_atomic, current_snapshot
+
+# Setup paths
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_dir = os.path.dirname(script_dir)
+# Same directory as data_loader.CACHE_DIR (not imported: data_loader loads pandas)
+CACHE_DIR = os.path.join(project_dir, '.cache')
+MANIFEST_FILE = 'build_manifest.json'
+
+# Modules every script runs through, relative to scripts/
+SHARED_CODE = ['data_loader.py', 'snapshots.py', 'parse_cache.py', 'cleaning.py', 'rules.py', 'brands.py',
+               'dedup.py', 'validation.py', 'segments.py', 'aggregates.py', 'sql_backend.py', 'shared_data.py',
+               'profiling.py', 'theme.py']
+# Same as brands.alias_path()
+ALIAS_ENV_VAR = 'LAPTOPS_BRAND_ALIASES'
+ALIAS_PATH = os.path.join(project_dir, 'brand_aliases.csv')
+
+# Bump when the key recipe changes so every output is rebuilt once
+BUILD_VERSION = 1
+
+HASH_BLOCK_SIZE = 1 << 20
+
+
+def load_manifest():
+    try:
+        with open(manifest_path(), encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get('version') == BUILD_VERSION:
+            return manifest
+    except (OSError, ValueError):
+        pass
+    return {'version': BUILD_VERSION, 'tasks': {}, 'files': {}}
+
+
+def save_manifest(manifest):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    _write_atomic(manifest_path(), json.dumps(manifest, indent=2, sort_keys=True).encode('utf-8'))
+
+
+def manifest_path():
+    return os.path.join(CACHE_DIR, MANIFEST_FILE)
+
+
+def file_sha(path, manifest):
+    """SHA-256 of a file's content ('missing' if there is none), memoized in
+    the manifest on (size, mtime)."""
+    path = os.path.abspath(path)
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return 'missing'
+    memo = manifest['files'].get(path)
+    if memo and memo['size'] == stat.st_size and memo['mtime_ns'] == stat.st_mtime_ns:
+        return memo['sha256']
+    sha = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+            sha.update(block)
+    manifest['files'][path] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': sha.hexdigest()}
+    return sha.hexdigest()
+
+
+def shared_key(manifest):
+    """Hash of the inputs every task shares: dataset, shared code, alias file, mode, predicate."""
+    parts = [f'v{BUILD_VERSION}', 'data:' + file_sha(current_snapshot(), manifest),
+             'aliases:' + file_sha(os.environ.get(ALIAS_ENV_VAR) or ALIAS_PATH, manifest),
+             'mode:' + os.environ.get('LAPTOPS_MODE', '').lower(),
+             'where:' + os.environ.get('LAPTOPS_WHERE', '').strip()]
+    parts += [f'{name}:{file_sha(os.path.join(script_dir, name), manifest)}' for name in SHARED_CODE]
+    return hashlib.sha256('|'.join(parts).encode('utf-8')).hexdigest()
+
+
+def task_key(script, inputs, manifest, shared=None):
+    """Key of one task's outputs: the shared key, its script and its inputs
+    other than the dataset (project-relative paths)."""
+    parts = [shared or shared_key(manifest), f'{script}:{file_sha(os.path.join(script_dir, script), manifest)}']
+    parts += [f'{name}:{file_sha(os.path.join(project_dir, name), manifest)}' for name in sorted(inputs)]
+    return hashlib.sha256('|'.join(parts).encode('utf-8')).hexdigest()
+
+
+def up_to_date(name, key, outputs, manifest):
+    """True when task `name` last built `outputs` from `key` and they are unchanged since."""
+    entry = manifest['tasks'].get(name)
+    return bool(entry) and entry['key'] == key and all(
+        _output_stat(output) == entry['outputs'].get(output) for output in outputs)
+
+
+def record(name, key, outputs, manifest):
+    """Remember that task `name` built `outputs` from `key`."""
+    manifest['tasks'][name] = {'key': key, 'outputs': {output: _output_stat(output) for output in outputs}}
+
+
+def _output_stat(output):
+    try:
+        stat = os.stat(os.path.join(project_dir, output))
+    except OSError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def main():
+    # Imported here because scheduler imports this module
+    from scheduler import TASKS, stale_tasks, task_name
+
+    manifest = load_manifest()
+    stale = stale_tasks(TASKS, manifest)
+    print(f"\n🗂️ Build cache ({os.path.relpath(manifest_path(), project_dir)})")
+    print("=" * 50)
+    for task in TASKS:
+        print(f"   {'🔄 stale     ' if task_name(task) in stale else '✅ up to date'}  {task_name(task)}")
+    print(f"   {len(TASKS) - len(stale)} of {len(TASKS)} tasks up to date")
+    save_manifest(manifest)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,294 @@
+"""
+Cleaning Stage
+Derives every analysis column (price, RAM, storage, screen, tiers, sales)
+from the raw laptops table once per CSV version and persists the result in
+.cache/, so scripts read parsed numbers instead of re-parsing strings.
+
+Scripts pick their rows with a named filter profile:
+
+    df = load_clean(data_path, profile='valid')
+
+Derived columns (DERIVATIONS):
+    price, ram_gb, storage_gb, screen      numbers parsed from the text columns
+    brand_clean                            canonical brand (brands.py)
+    gpu_type, cpu_tier, os_category        rule-based categories (rules.py)
+    units_sold, revenue, stock             sales columns as numbers
+    invalid                                validation bitmask (validation.py)
+
+Whole-table columns (TABLE_DERIVATIONS, need every row at once):
+    listing_group_id                       near-duplicate listing group (dedup.py)
+
+With LAPTOPS_WHERE set to a row predicate (laptops.py --where), every load
+holds only the matching rows; see where_mask.
+"""
+from contextlib import contextmanager
+import pandas as pd
+import hashlib
+import operator
+import os
+import re
+
+from data_loader import (CACHE_DIR, CACHE_FORMAT, DATA_PATH, _path_tag, _read_cache, cache_key,
+                         load_laptops)
+from brands import canonical_brands, mapping_key
+from dedup import listing_groups
+from parse_cache import flush, memoize, transform_key
+from profiling import stage
+from rules import CPU_TIERS, GPU_TYPES, OS_CATEGORIES
+
+# Bump when a derivation or its rules change so persisted tables are rebuilt
+CLEAN_VERSION = 5
+
+# Derived tables held in this process by held_table(), by absolute path
+_held = {}
+
+# Row predicate every load applies (pandas query syntax), e.g. "brand == 'DELL' and price < 1500"
+WHERE_VAR = 'LAPTOPS_WHERE'
+# Names a predicate may use for another column: brand is the canonical brand
+WHERE_ALIASES = {'brand': 'brand_clean'}
+
+
+def _as_text(series):
+    # .str works on categoricals only after decoding them
+    return series.astype(object) if isinstance(series.dtype, pd.CategoricalDtype) else series
+
+
+def parse_price(series):
+    """'$1,234.00' -> 1234.0; '-' and other non-numbers -> NaN."""
+    series = _as_text(series)
+    return pd.to_numeric(series.str.replace('$', '', regex=False).str.replace(',', '', regex=False).str.strip(),
+                         errors='coerce')
+
+
+def extract_number(series, pattern=r'(\d+)'):
+    """First number in each value ('16 GB' -> 16.0), NaN when there is none."""
+    return _as_text(series).str.extract(pattern, expand=False).astype(float)
+
+
+def extract_decimal(series):
+    """First decimal number in each value ('15.6 Inches' -> 15.6)."""
+    return extract_number(series, r'([\d.]+)')
+
+
+# Parse cache keys (parse_cache.py): they change with the parsers' source
+PRICE_KEY = transform_key('price', parse_price, _as_text)
+NUMBER_KEY = transform_key(r'number:(\d+)', extract_number, _as_text)
+DECIMAL_KEY = transform_key(r'number:([\d.]+)', extract_decimal, extract_number, _as_text)
+
+
+def derivation_key():
+    """Changes whenever derive() would compute different values: the parse
+    cache keys of its parsers and rule tables, and the brand mapping."""
+    return '|'.join([PRICE_KEY, NUMBER_KEY, DECIMAL_KEY, GPU_TYPES.key, CPU_TIERS.key, OS_CATEGORIES.key,
+                     mapping_key()])
+
+
+def _validity(df):
+    # Imported here because validation imports this module
+    from validation import flag
+    return flag(df)
+
+
+# Derived column -> (raw columns it needs, how to compute it). The string
+# parsers run once per distinct value (parse_cache.py)
+DERIVATIONS = {
+    'price': (['Price'], lambda df: memoize(df['Price'], parse_price, PRICE_KEY)),
+    'ram_gb': (['ram'], lambda df: memoize(df['ram'], extract_number, NUMBER_KEY)),
+    'storage_gb': (['harddisk'], lambda df: memoize(df['harddisk'], extract_number, NUMBER_KEY)),
+    'screen': (['screen_size'], lambda df: memoize(df['screen_size'], extract_decimal, DECIMAL_KEY)),
+    'brand_clean': (['brand'], lambda df: canonical_brands(df['brand'])),
+    'gpu_type': (['graphics'], lambda df: GPU_TYPES.apply(df['graphics'])),
+    'cpu_tier': (['cpu'], lambda df: CPU_TIERS.apply(df['cpu'])),
+    'os_category': (['OS'], lambda df: OS_CATEGORIES.apply(df['OS'])),
+    'units_sold': (['Sale Product Count'], lambda df: pd.to_numeric(df['Sale Product Count'], errors='coerce')),
+    'revenue': (['Total Sales'], lambda df: pd.to_numeric(df['Total Sales'], errors='coerce')),
+    'stock': (['Available Stock'], lambda df: pd.to_numeric(df['Available Stock'], errors='coerce')),
+    # Last: checks the columns derived above
+    'invalid': (['brand', 'Price', 'rating', 'Sale Product Count', 'Total Sales', 'Available Stock'], _validity),
+}
+
+# Derived columns that compare rows with each other, so they are computed
+# on whole tables only (not on streamed chunks)
+TABLE_DERIVATIONS = {
+    'listing_group_id': listing_groups,
+}
+
+# Rule-based columns (plain strings)
+RULE_COLUMNS = ['gpu_type', 'cpu_tier', 'os_category']
+
+# Named row filters: (column, comparison, value) conditions that must all hold
+FILTER_PROFILES = {
+    'all': [],
+    'priced': [('price', '>', 0)],                                        # 12, 13
+    'chart': [('price', '>=', 50), ('price', '<=', 10000)],               # 02, 06, 10
+    'model': [('price', '>', 100), ('price', '<', 5000)],                 # 11
+    'rated': [('rating', '>=', 1), ('rating', '<=', 5)],                  # 08
+    'valid': [('price', '>=', 100), ('price', '<=', 8000), ('rating', '>=', 1)],  # 09, deep_analysis
+    'scatter': [('price', '>=', 100), ('price', '<=', 5000), ('rating', '>=', 1),
+                ('ram_gb', 'notna', None)],                               # gif_02
+    'validated': [('invalid', '==', 0)],                                  # no validation.py violations
+}
+
+# Operators usable in (column, comparison, value) conditions
+COMPARISONS = {
+    '>': operator.gt, '>=': operator.ge, '<': operator.lt, '<=': operator.le, '==': operator.eq,
+    'in': lambda series, values: series.isin(values),
+    'notna': lambda series, _: series.notna(),
+    'isna': lambda series, _: series.isna(),
+    'outside': lambda series, bounds: (series < bounds[0]) | (series > bounds[1]),
+}
+
+
+def derive(df):
+    """Add every derived column whose raw columns are present (works on whole
+    tables and on streamed chunks). Columns already present are kept."""
+    for name, (sources, compute) in DERIVATIONS.items():
+        if name not in df and all(col in df for col in sources):
+            df[name] = compute(df)
+    return df
+
+
+@stage('clean')
+def derive_table(df):
+    """derive() plus the whole-table columns (TABLE_DERIVATIONS)."""
+    df = derive(df)
+    for name, compute in TABLE_DERIVATIONS.items():
+        if name not in df:
+            df[name] = compute(df)
+    # New parse results, written once per load
+    flush()
+    return df
+
+
+def condition_mask(df, conditions):
+    """Boolean mask of the rows meeting every (column, comparison, value) condition."""
+    mask = pd.Series(True, index=df.index)
+    for column, op, value in conditions:
+        mask &= COMPARISONS[op](df[column], value)
+    return mask
+
+
+def profile_mask(df, profile):
+    """Boolean mask of the rows kept by a FILTER_PROFILES entry."""
+    return condition_mask(df, FILTER_PROFILES[profile])
+
+
+@stage('clean')
+def apply_profile(df, profile):
+    if not FILTER_PROFILES[profile]:
+        return df
+    return df[profile_mask(df, profile)]
+
+
+def clean_path(path=DATA_PATH):
+    # Not '<tag>-...': the columnar cache prunes every '<tag>-*' file but its own
+    derivations = hashlib.sha1(derivation_key().encode('utf-8')).hexdigest()[:8]
+    return os.path.join(CACHE_DIR, f'{_path_tag(path)}.clean-{cache_key(path)}-{derivations}-v{CLEAN_VERSION}.{CACHE_FORMAT}')
+
+
+def load_clean(path=DATA_PATH, profile='all', use_cache=True):
+    """Raw plus derived columns for `path`, filtered by `profile`. The derived
+    table is built once per CSV version and read back on later runs (or
+    attached from shared memory inside a shared_data.py runner)."""
+    return apply_profile(_load_derived(path, use_cache), profile)
+
+
+def current_where():
+    """The LAPTOPS_WHERE row predicate of this run ('' for every row)."""
+    return os.environ.get(WHERE_VAR, '').strip()
+
+
+def where_mask(df, where):
+    """Boolean mask of the rows of `df` matching `where`, a pandas query
+    expression over raw and derived columns (WHERE_ALIASES apply). Derived
+    columns it names that `df` lacks are computed for the check only."""
+    for name, column in WHERE_ALIASES.items():
+        where = re.sub(rf'(?<![\w.`]){name}(?![\w`])', column, where)
+    named = [col for col in dict.fromkeys([*df.columns, *DERIVATIONS])
+             if re.search(rf'(?<![\w.]){re.escape(col)}(?!\w)', where)]
+    sources = {s for col in named for s in ([col] if col in df else DERIVATIONS[col][0])}
+    probe = derive(df[[col for col in df.columns if col in sources]].copy(deep=False))
+    mask = probe.eval(where)
+    if not isinstance(mask, pd.Series) or mask.dtype != bool:
+        raise ValueError(f"Not a row condition: {where}")
+    return mask
+
+
+@stage('clean')
+def where_rows(df, where):
+    """Rows of `df` matching `where` (all of them for an empty predicate)."""
+    return df[where_mask(df, where)] if where else df
+
+
+@contextmanager
+def held_table(path=DATA_PATH):
+    """Keep the derived table of `path` loaded for the duration of the block:
+    every load_clean(path) inside it gets a shallow copy of that one table
+    instead of reading .cache/ again (in-process runs, scheduler.py)."""
+    key = os.path.abspath(path)
+    if key in _held:
+        yield _held[key]
+        return
+    _held[key] = _load_derived(path, use_cache=True)
+    try:
+        yield _held[key]
+    finally:
+        del _held[key]
+
+
+def _load_derived(path, use_cache):
+    if os.path.abspath(path) in _held:
+        # Copy-on-write: columns a script adds stay out of the held table
+        return _held[os.path.abspath(path)].copy(deep=False)
+    where = current_where()
+    if os.path.isdir(path):
+        # Partitioned input: each partition is cached by the loader
+        return derive_table(where_rows(load_laptops(path, use_cache=use_cache), where))
+    if os.environ.get('LAPTOPS_SHM'):
+        # Imported here because shared_data imports this module
+        from shared_data import attach_published
+        df = attach_published(path)
+        if df is not None and all(name in df for name in [*DERIVATIONS, *TABLE_DERIVATIONS]):
+            # Shared memory holds text dictionary-encoded; decode the few
+            # rule columns so they behave as in a normal load
+            for name in RULE_COLUMNS:
+                df[name] = df[name].astype(str)
+            return df
+    if where:
+        # Pushed down: only the matching rows are parsed and derived (not persisted)
+        return derive_table(where_rows(load_laptops(path, use_cache=use_cache), where).copy(deep=False))
+    if not use_cache:
+        return derive_table(load_laptops(path, use_cache=False))
+
+    target = clean_path(path)
+    if os.path.exists(target):
+        try:
+            with stage('load'):
+                return _read_cache(target)
+        except Exception:
+            # Corrupt or unreadable - rebuild below
+            pass
+    df = derive_table(load_laptops(path).copy(deep=False))
+    _write_clean(df, target, path)
+    from validation import write_rejects
+    write_rejects(df, path)
+    return df
+
+
+def _write_clean(df, target, path):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp = f'{target}.{os.getpid()}.tmp'
+    if CACHE_FORMAT == 'feather':
+        df.to_feather(tmp)
+    else:
+        df.to_pickle(tmp)
+    os.replace(tmp, target)
+
+    # Drop derived tables of older versions of the same CSV
+    prefix = _path_tag(path) + '.clean-'
+    for name in os.listdir(CACHE_DIR):
+        if name.startswith(prefix) and name != os.path.basename(target) and not name.endswith('.tmp'):
+            try:
+                os.remove(os.path.join(CACHE_DIR, name))
+            except OSError:
+                pass
@@ -0,0 +1,324 @@
+"""
+Data Loader
+Parses laptops.csv once with an explicit schema and serves every later run
+from a columnar binary cache keyed by the CSV's content hash.
+
+Low-cardinality text columns (CATEGORICAL_COLUMNS) come back as
+dictionary-encoded categoricals with sorted categories, plus a canonical
+`brand_clean` column (brands.py), so groupby / value_counts / isin run on integer codes.
+
+A directory of dated partitions (daily laptops-YYYY-MM-DD.csv files, or
+<date>/laptops.csv subdirectories such as the snapshot store) loads as one
+table with a `snapshot` column; see load_partitions.
+"""
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+import numpy as np
+import hashlib
+import json
+import os
+import re
+import sys
+
+from profiling import stage
+from snapshots import current_snapshot
+
+# Setup paths
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_dir = os.path.dirname(script_dir)
+# Current dataset version (see snapshots.py)
+DATA_PATH = current_snapshot()
+CACHE_DIR = os.path.join(project_dir, '.cache')
+
+# Explicit column types so pandas never has to infer them.
+# Price and Total Sales stay as text: they carry "$1,234.00" / "-" values
+# that each script cleans itself.
+SCHEMA = {
+    'brand': str,
+    'model': str,
+    'screen_size': str,
+    'color': str,
+    'harddisk': str,
+    'cpu': str,
+    'ram': str,
+    'OS': str,
+    'special_features': str,
+    'graphics': str,
+    'graphics_coprocessor': str,
+    'cpu_speed': str,
+    'rating': 'float64',
+    'Price': str,
+    'Sale Product Count': 'float64',
+    'Total Sales': str,
+    'Available Stock': 'float64',
+}
+
+# Text columns held as dictionary-encoded categoricals. Categories are
+# sorted, so the same set of values always gets the same integer codes.
+CATEGORICAL_COLUMNS = ['brand', 'OS', 'cpu', 'graphics', 'graphics_coprocessor', 'color', 'special_features']
+# The parser builds them directly (cheaper than parsing strings, then encoding);
+# iter_chunks keeps plain SCHEMA strings, since per-chunk categories would differ
+LOAD_SCHEMA = {**SCHEMA, **{col: 'category' for col in CATEGORICAL_COLUMNS}}
+
+# Bump when the parse step changes so stale caches are ignored
+CACHE_VERSION = 3
+
+# Feather needs pyarrow; fall back to pickle (still columnar numpy blocks)
+try:
+    import pyarrow  # noqa: F401
+    CACHE_FORMAT = 'feather'
+except ImportError:
+    CACHE_FORMAT = 'pickle'
+
+HASH_BLOCK_SIZE = 1 << 20
+
+# Rows per chunk in streaming mode (override with LAPTOPS_CHUNKSIZE)
+DEFAULT_CHUNKSIZE = 200_000
+
+# Partition names carry their date: 2024-03-01, 20240301 or a snapshot id
+# like 20240301T060000Z-1a2b3c4d (time of day is optional)
+PARTITION_DATE = re.compile(r'(\d{4})-?(\d{2})-?(\d{2})(?:T(\d{2})(\d{2})(\d{2})Z?)?')
+PARTITION_FILE = 'laptops.csv'
+
+
+def file_digest(path):
+    """SHA-256 of a file's content, memoized on (size, mtime) so unchanged
+    files are not re-read on every run."""
+    stat = os.stat(path)
+    memo_path = os.path.join(CACHE_DIR, _path_tag(path) + '.digest.json')
+    try:
+        with open(memo_path, encoding='utf-8') as f:
+            memo = json.load(f)
+        if (memo['path'] == os.path.abspath(path) and memo['size'] == stat.st_size
+                and memo['mtime_ns'] == stat.st_mtime_ns):
+            return memo['sha256']
+    except (OSError, ValueError, KeyError):
+        pass
+
+    sha = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+            sha.update(block)
+    digest = sha.hexdigest()
+
+    _write_atomic(memo_path, json.dumps({
+        'path': os.path.abspath(path),
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'sha256': digest,
+    }).encode('utf-8'))
+    return digest
+
+
+def cache_key(path):
+    """Cache key: CSV content hash plus the schema/version it was parsed with
+    and the brand mapping behind `brand_clean`."""
+    # Imported here because brands imports this module
+    from brands import mapping_key
+    schema = json.dumps({k: str(v) for k, v in LOAD_SCHEMA.items()}, sort_keys=True)
+    key = hashlib.sha256(f'{file_digest(path)}|{schema}|{CACHE_VERSION}|{mapping_key()}'.encode('utf-8'))
+    return key.hexdigest()[:16]
+
+
+def cache_path(path):
+    return os.path.join(CACHE_DIR, f'{_path_tag(path)}-{cache_key(path)}.{CACHE_FORMAT}')
+
+
+def read_csv(path=DATA_PATH, **kwargs):
+    """Parse the CSV with the explicit schema and encode it (no cache)."""
+    return encode_columns(pd.read_csv(path, dtype=LOAD_SCHEMA, **kwargs))
+
+
+def encode_columns(df):
+    """Dictionary-encode CATEGORICAL_COLUMNS and add `brand_clean`
+    (canonical brand, see brands.py) as a categorical of its own."""
+    for col in CATEGORICAL_COLUMNS:
+        if col in df and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype('category')
+    if 'brand' in df:
+        from brands import canonical_brands
+        df['brand_clean'] = normalize_categories(df['brand'], canonical_brands)
+    return df
+
+
+def normalize_categories(series, normalize):
+    """Apply a string normalization to a categorical's categories only (once
+    per distinct value, not per row), merging categories that collide."""
+    labels = normalize(series.cat.categories.to_series())
+    uniques = pd.Index(labels.unique()).sort_values()
+    mapping = uniques.get_indexer(labels)
+    codes = series.cat.codes.to_numpy()
+    codes = np.where(codes >= 0, mapping[codes], -1)
+    return pd.Series(pd.Categorical.from_codes(codes, uniques), index=series.index, name=series.name)
+
+
+@stage('load')
+def load_laptops(path=DATA_PATH, use_cache=True):
+    """Load laptops.csv, served from the columnar cache when the CSV is unchanged.
+
+    Inside a runner that published the table to shared memory (see
+    shared_data.py), this returns a zero-copy, read-only view instead.
+    A directory is loaded as partitions (all of them; see load_partitions)."""
+    if os.path.isdir(path):
+        return load_partitions(path, use_cache=use_cache)
+
+    if os.environ.get('LAPTOPS_SHM'):
+        # Imported here because shared_data itself imports this module
+        from shared_data import attach_published
+        df = attach_published(path)
+        if df is not None:
+            # The published table also carries the cleaning stage's columns
+            return df[[col for col in df.columns if col in SCHEMA or col == 'brand_clean']]
+
+    if not use_cache:
+        return read_csv(path)
+
+    target = cache_path(path)
+    if os.path.exists(target):
+        try:
+            return _read_cache(target)
+        except Exception:
+            # Corrupt or unreadable cache - rebuild it below
+            pass
+
+    df = read_csv(path)
+    _write_cache(df, target, path)
+    return df
+
+
+def list_partitions(root):
+    """Dated partitions under `root` as (timestamp, path) pairs, oldest first.
+    Entries without a date in their name (manifest.json, CURRENT, ...) are skipped."""
+    partitions = []
+    for name in os.listdir(root):
+        path = os.path.join(root, name)
+        if os.path.isdir(path):
+            path = os.path.join(path, PARTITION_FILE)
+            if not os.path.isfile(path):
+                continue
+        elif not name.endswith('.csv'):
+            continue
+        match = PARTITION_DATE.search(name)
+        if not match:
+            continue
+        year, month, day, *clock = (int(g) for g in match.groups() if g is not None)
+        try:
+            partitions.append((pd.Timestamp(year, month, day, *clock), path))
+        except ValueError:
+            # Digits that only look like a date (e.g. 20241399)
+            continue
+    return sorted(partitions)
+
+
+def load_partitions(root, start=None, end=None, max_workers=None, use_cache=True):
+    """Load the partitions of `root` dated from `start` to `end` (inclusive
+    calendar days, either bound optional) as one table with a `snapshot`
+    column holding each row's partition timestamp.
+
+    Partitions outside the range are never opened. The rest load concurrently
+    on a thread pool (the CSV parser and the cache reader release the GIL),
+    each through its own columnar cache, so a warm 90-day load costs about as
+    much as its largest partition rather than the sum."""
+    selected = [(stamp, path) for stamp, path in list_partitions(root)
+                if (start is None or stamp.normalize() >= pd.Timestamp(start).normalize())
+                and (end is None or stamp.normalize() <= pd.Timestamp(end).normalize())]
+    if not selected:
+        raise FileNotFoundError(f"No partitions in {root} between {start} and {end}")
+
+    max_workers = max_workers or min(len(selected), (os.cpu_count() or 1) + 4)
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        frames = list(pool.map(lambda item: load_laptops(item[1], use_cache=use_cache), selected))
+    return concat_partitions(frames, [stamp for stamp, _ in selected])
+
+
+def concat_partitions(frames, stamps):
+    """Stack per-partition frames, keeping categoricals encoded: each
+    partition has its own categories, which plain concat would decode to
+    strings, so they are first aligned to the sorted union."""
+    frames = [df.copy(deep=False) for df in frames]
+    for col in frames[0].columns:
+        if all(isinstance(df[col].dtype, pd.CategoricalDtype) for df in frames):
+            categories = pd.Index(sorted(set().union(*(df[col].cat.categories for df in frames))))
+            for df in frames:
+                df[col] = df[col].cat.set_categories(categories)
+    combined = pd.concat(frames, ignore_index=True)
+    combined['snapshot'] = np.repeat(np.array(stamps, dtype='datetime64[ns]'), [len(df) for df in frames])
+    return combined
+
+
+def execution_mode(argv=None):
+    """How aggregates are built for this run: 'stream' for bounded-memory
+    chunked processing, 'incremental' for chunked processing that only reads
+    rows appended since the last run, 'sql' for queries against the SQLite
+    backend (sql_backend.py), else 'memory'. Set with --stream /
+    --incremental / --sql on the command line or LAPTOPS_MODE."""
+    argv = sys.argv[1:] if argv is None else argv
+    env = os.environ.get('LAPTOPS_MODE', '').lower()
+    for mode in ('stream', 'incremental', 'sql'):
+        if f'--{mode}' in argv or env == mode:
+            return mode
+    return 'memory'
+
+
+def iter_chunks(path=DATA_PATH, chunksize=None, usecols=None):
+    """Yield the CSV in bounded chunks of `chunksize` rows, parsed with the schema."""
+    chunksize = chunksize or int(os.environ.get('LAPTOPS_CHUNKSIZE', DEFAULT_CHUNKSIZE))
+    dtype = {col: kind for col, kind in SCHEMA.items() if usecols is None or col in usecols}
+    with pd.read_csv(path, dtype=dtype, usecols=usecols, chunksize=chunksize) as reader:
+        while True:
+            # Only the parsing counts as loading; the caller's work per chunk does not
+            with stage('load'):
+                chunk = next(reader, None)
+            if chunk is None:
+                return
+            yield chunk
+
+
+def clear_cache(path=DATA_PATH):
+    """Remove every cached parse of `path`."""
+    if not os.path.isdir(CACHE_DIR):
+        return
+    tag = _path_tag(path)
+    for name in os.listdir(CACHE_DIR):
+        if name.startswith(tag + '-') or name == tag + '.digest.json':
+            os.remove(os.path.join(CACHE_DIR, name))
+
+
+def _path_tag(path):
+    """Per-file cache prefix, e.g. 'laptops-1a2b3c4d' (stem + hash of the absolute path)."""
+    stem = os.path.splitext(os.path.basename(path))[0]
+    where = hashlib.sha1(os.path.abspath(path).encode('utf-8')).hexdigest()[:8]
+    return f'{stem}-{where}'
+
+
+def _read_cache(target):
+    if CACHE_FORMAT == 'feather':
+        return pd.read_feather(target)
+    return pd.read_pickle(target)
+
+
+def _write_cache(df, target, path):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp = f'{target}.{os.getpid()}.tmp'
+    if CACHE_FORMAT == 'feather':
+        df.to_feather(tmp)
+    else:
+        df.to_pickle(tmp)
+    os.replace(tmp, target)
+
+    # Drop caches of older versions of the same CSV
+    prefix = _path_tag(path) + '-'
+    for name in os.listdir(CACHE_DIR):
+        if name.startswith(prefix) and name != os.path.basename(target) and not name.endswith('.tmp'):
+            try:
+                os.remove(os.path.join(CACHE_DIR, name))
+            except OSError:
+                pass
+
+
+def _write_atomic(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f'{path}.{os.getpid()}.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
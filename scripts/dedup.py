@@ -0,0 +1,217 @@
+"""
+Listing Deduplication
+Finds listings of the same laptop posted several times with small
+differences (model text spelled differently, another color or feature list)
+and gives every row a `listing_group_id`: rows of one group describe one
+product, so aggregations can collapse on it:
+
+    df = load_clean(data_path)
+    unique = collapse(df)                                   # one row per product
+    units = df.groupby('listing_group_id')['units_sold'].max()
+
+Each distinct listing (DEDUP_COLUMNS) gets a MinHash signature over its word
+tokens. Locality-sensitive hashing cuts the signature into BANDS bands and
+buckets listings whose band (and EXACT_COLUMNS, which must match) is equal;
+each bucket member is compared with the bucket's first member, once per
+distinct pair across bands, so the work grows linearly with the number of
+listings even when thousands of reposts share one bucket. Candidates whose
+signatures agree on at least SIMILARITY of their positions (the estimated
+Jaccard similarity) are merged, transitively: two members unlike the first
+one still join when they share another band with each other. Rows without
+any token (every DEDUP_COLUMNS value missing) describe nothing to match on
+and each form their own group.
+
+    python scripts/dedup.py [laptops.csv]    # group sizes and largest groups
+"""
+import pandas as pd
+import numpy as np
+import os
+import sys
+
+# Columns whose word tokens make up a listing's signature
+DEDUP_COLUMNS = ['brand_clean', 'model', 'cpu', 'ram', 'harddisk', 'graphics']
+# Parsed columns two duplicates must agree on exactly (missing == missing),
+# as must the numbers in their model names ('Latitude 5530' != 'Latitude 7410')
+EXACT_COLUMNS = ['brand_clean', 'ram_gb', 'storage_gb', 'cpu_tier', 'gpu_type']
+
+# Each model word counts as this many tokens: model names tell products
+# apart, the other columns are often identical across different laptops
+TOKEN_WEIGHTS = {'model': 3}
+
+# Signature length = BANDS * ROWS_PER_BAND. Listings with Jaccard similarity
+# s share at least one band with probability 1 - (1 - s^r)^b: ~0.98 at 0.8
+NUM_PERM = 64
+BANDS = 16
+ROWS_PER_BAND = NUM_PERM // BANDS
+SIMILARITY = 0.8
+SEED = 42
+# Candidate pairs scored at a time (two 64-column signature rows each)
+SCORE_CHUNK = 1 << 16
+
+# Universal hashing modulo a Mersenne prime (products stay inside int64)
+PRIME = (1 << 31) - 1
+EMPTY = np.int64(PRIME)
+
+
+def listing_groups(df):
+    """listing_group_id of every row of `df` (int64, numbered in order of
+    first appearance); rows without any token each form their own group."""
+    listing, first_rows = _distinct_listings(df)
+    signatures = _signatures(df, first_rows)
+    exact = _exact_codes(df.iloc[first_rows])
+
+    # A pair found in several bands is scored once
+    n = np.int64(len(first_rows))
+    pairs = np.unique(np.concatenate([a * n + b for a, b in
+                                      (_candidate_pairs(signatures, exact, band) for band in range(BANDS))]))
+    a, b = pairs // n, pairs % n
+    keep = np.zeros(len(pairs), dtype=bool)
+    for start in range(0, len(pairs), SCORE_CHUNK):
+        i, j = a[start:start + SCORE_CHUNK], b[start:start + SCORE_CHUNK]
+        similar = (signatures[i] == signatures[j]).mean(axis=1) >= SIMILARITY
+        keep[start:start + SCORE_CHUNK] = similar & (exact[i] == exact[j]).all(axis=1) & (signatures[i, 0] != EMPTY)
+    labels = connected_labels(len(first_rows), a[keep], b[keep])[listing]
+    # Token-less rows: a label of their own, past every listing's
+    tokenless = np.flatnonzero(signatures[listing, 0] == EMPTY)
+    labels[tokenless] = len(first_rows) + np.arange(len(tokenless))
+
+    ids, _ = pd.factorize(labels)
+    return pd.Series(ids.astype(np.int64), index=df.index, name='listing_group_id')
+
+
+def collapse(df):
+    """One row per listing group (its first row)."""
+    return df[~df['listing_group_id'].duplicated()]
+
+
+def minhash(tokens, owners, n_listings):
+    """MinHash signatures (n_listings x NUM_PERM int64) of token hashes
+    `tokens` belonging to listings `owners` (both flat and sorted by owner)."""
+    rng = np.random.default_rng(SEED)
+    a = rng.integers(1, PRIME, NUM_PERM, dtype=np.int64)
+    b = rng.integers(0, PRIME, NUM_PERM, dtype=np.int64)
+    signatures = np.full((n_listings, NUM_PERM), EMPTY, dtype=np.int64)
+    if len(tokens) == 0:
+        return signatures
+    starts = np.flatnonzero(np.r_[True, owners[1:] != owners[:-1]])
+    for k in range(NUM_PERM):
+        hashed = (a[k] * tokens + b[k]) % PRIME
+        signatures[owners[starts], k] = np.minimum.reduceat(hashed, starts)
+    return signatures
+
+
+def connected_labels(n, a, b):
+    """Smallest member index of the connected component of every node of a
+    graph with `n` nodes and edges a[i] - b[i] (min-label propagation)."""
+    labels = np.arange(n)
+    while True:
+        low = np.minimum(labels[a], labels[b])
+        previous = labels.copy()
+        np.minimum.at(labels, a, low)
+        np.minimum.at(labels, b, low)
+        labels = labels[labels]
+        if np.array_equal(labels, previous):
+            return labels
+
+
+def _distinct_listings(df):
+    """Listing number of every row and the first row of each listing
+    (rows equal on all DEDUP_COLUMNS share one signature)."""
+    codes = pd.DataFrame({col: pd.factorize(df[col])[0] for col in DEDUP_COLUMNS})
+    listing = codes.groupby(DEDUP_COLUMNS, sort=False).ngroup().to_numpy()
+    return listing, _first_index(listing, listing.max() + 1 if len(listing) else 0)
+
+
+def _signatures(df, first_rows):
+    """MinHash signature of each distinct listing. Tokens are the lower-case
+    words of each value, prefixed with the column so that '16' as RAM and
+    '16' in a model name differ. A signature is the element-wise minimum of
+    the signatures of its column values, so each distinct value of a column
+    is hashed only once."""
+    signatures = np.full((len(first_rows), NUM_PERM), EMPTY, dtype=np.int64)
+    for col in DEDUP_COLUMNS:
+        if col == 'model':
+            # Per (brand, model) pair: 'Dell Latitude' is the same model as
+            # 'Latitude' when the brand is Dell
+            codes, uniques = pd.MultiIndex.from_frame(df[['brand_clean', 'model']].iloc[first_rows]).factorize()
+            words = _words(uniques.get_level_values(1))
+            brand = _words(uniques.get_level_values(0))
+            own = pd.MultiIndex.from_arrays([words.index, words]).isin(pd.MultiIndex.from_arrays([brand.index, brand]))
+            words = words[~own]
+        else:
+            codes, uniques = pd.factorize(df[col].iloc[first_rows])
+            words = _words(uniques)
+        weight = TOKEN_WEIGHTS.get(col, 1)
+        if weight > 1:
+            words = words.repeat(weight)
+            words = words + '#' + (np.arange(len(words)) % weight).astype(str)
+        tokens = (pd.util.hash_array((col + ':' + words).to_numpy(dtype=object)) % PRIME).astype(np.int64)
+        # One extra all-EMPTY row for missing values (code -1)
+        values = np.vstack([minhash(tokens, words.index.to_numpy(dtype=np.int64), len(uniques)),
+                            np.full((1, NUM_PERM), EMPTY)])
+        np.minimum(signatures, values[codes], out=signatures)
+    return signatures
+
+
+def _words(values):
+    """Lower-case words of each value as one Series indexed by value position."""
+    return pd.Series(np.asarray(values, dtype=object), dtype=object).str.lower().str.findall(r'[0-9a-z]+').explode().dropna()
+
+
+def _exact_codes(df):
+    codes = [pd.factorize(df[col])[0] for col in EXACT_COLUMNS if col in df]
+    return np.column_stack(codes + [_model_numbers(df['model'])])
+
+
+def _model_numbers(models):
+    """Code of the set of digit-bearing words of each model name ('XPS 13
+    9310 Laptop' -> {13, 9310}); names without numbers share code -1."""
+    codes, uniques = pd.factorize(models)
+    numbers = pd.Series(uniques.astype(object), dtype=object).str.lower().str.findall(r'[a-z]*\d[0-9a-z]*')
+    keys = numbers.map(lambda words: ' '.join(sorted(set(words))) or None)
+    number_codes = np.r_[pd.factorize(keys)[0], -1]
+    return number_codes[codes]
+
+
+def _candidate_pairs(signatures, exact, band):
+    """(member, first member) pairs of every LSH bucket of one band."""
+    columns = signatures[:, band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND]
+    # One 64-bit bucket key per listing; a rare collision only adds a
+    # candidate pair, which the similarity check then rejects
+    key = np.zeros(len(signatures), dtype=np.uint64)
+    for column in [*columns.T, *exact.T]:
+        key = key * np.uint64(0x100000001B3) ^ column.astype(np.uint64)
+    bucket, uniques = pd.factorize(key)
+    leaders = _first_index(bucket, len(uniques))[bucket]
+    members = np.arange(len(key))
+    pairs = members != leaders
+    return members[pairs], leaders[pairs]
+
+
+def _first_index(codes, n):
+    """Position of the first occurrence of each code 0..n-1 in `codes`."""
+    first = np.full(n, len(codes), dtype=np.int64)
+    np.minimum.at(first, codes, np.arange(len(codes)))
+    return first
+
+
+def main():
+    from cleaning import load_clean
+    from data_loader import DATA_PATH
+
+    path = sys.argv[1] if len(sys.argv) > 1 else DATA_PATH
+    df = load_clean(path)
+    sizes = df['listing_group_id'].value_counts()
+    print(f"\n🔁 Listing groups in {os.path.basename(path)}: {len(df):,} rows -> {len(sizes):,} products "
+          f"({1 - len(sizes) / max(len(df), 1):.1%} duplicate listings)")
+    print("=" * 70)
+    for group, size in sizes.head(10).items():
+        rows = df[df['listing_group_id'] == group].astype(object).fillna('-')
+        print(f"  {size:>5,} x {rows['brand_clean'].iloc[0]} {rows['model'].iloc[0]} | "
+              f"{rows['cpu'].iloc[0]}, {rows['ram'].iloc[0]}, {rows['harddisk'].iloc[0]} "
+              f"({rows['model'].nunique()} model spellings)")
+    print("-" * 70)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,8 @@
 """
 Comprehensive Mobile Graphs for Amazon Laptop Sales
 """
+from theme import use_file_backend
+use_file_backend()
 import matplotlib.pyplot as plt
 import numpy as np
 import os
@@ -244,10 +246,13 @@ def g10_takeaways():
     
     save('10_takeaways.png')
 
-if __name__ == '__main__':
+def main():
     print("\n📱 Generating Comprehensive Mobile Graphs (Laptops)")
     print("=" * 60)
     setup()
     g01_stats(); g02_brands(); g03_price_ranges(); g04_processor(); g05_ram()
     g06_ml_model(); g07_segments(); g08_anomalies(); g09_features(); g10_takeaways()
     print(f"\n✅ 10 mobile graphs saved to: {output_dir}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""
+Laptops CLI
+One entry point for every analysis, with a subcommand per analysis:
+
+    python scripts/laptops.py list                                  # analyses and groups
+    python scripts/laptops.py all                                   # graphs, analysis and gifs
+    python scripts/laptops.py all --only graphs --skip 09_advanced_viz
+    python scripts/laptops.py top_sellers                           # one analysis (07_top_sellers)
+    python scripts/laptops.py all --where "brand == 'DELL' and price < 1500"
+
+--where takes a pandas query expression over the raw and derived columns
+(cleaning.py; `brand` is the canonical upper-case brand). It is pushed down
+into the load step: only the matching rows are parsed and derived, and every
+chart is drawn from them. Outputs keep their usual paths; the build cache
+(build_cache.py) knows they were drawn for the predicate, so the next run
+without it draws them again.
+
+Every subcommand also takes --jobs N / --in-process / --force and the
+--timeout / --max-memory budgets (scheduler.py).
+"""
+import argparse
+import os
+import re
+import sys
+
+from scheduler import DEFAULT_GROUPS, TASKS, add_run_options, build, run_limits, select, task_name
+
+
+def short_name(task):
+    """Subcommand alias without the number prefix ('07_top_sellers' -> 'top_sellers')."""
+    return re.sub(r'^(gif_)?\d+[a-z]?_', '', task_name(task))
+
+
+def list_tasks():
+    print("\n📋 Analyses (subcommands) by group")
+    print("=" * 60)
+    for group in dict.fromkeys(t.group for t in TASKS):
+        default = ' (default)' if group in DEFAULT_GROUPS else ''
+        print(f"  {group}{default}")
+        for task in [t for t in TASKS if t.group == group]:
+            print(f"    {task_name(task):<28} {short_name(task)}")
+
+
+def check_where(where):
+    """Row count matching `where`, or a ValueError describing why it cannot be used."""
+    # Imported here: only a --where run needs pandas in this process
+    from cleaning import where_mask
+    from data_loader import execution_mode, load_laptops
+    from snapshots import current_snapshot
+
+    if execution_mode([]) != 'memory':
+        raise ValueError("needs the in-memory mode (unset LAPTOPS_MODE)")
+    df = load_laptops(current_snapshot())
+    try:
+        return int(where_mask(df, where).sum()), len(df)
+    except (SyntaxError, NameError, KeyError, TypeError) as e:
+        raise ValueError(e) from None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest='command', required=True, metavar='command')
+    commands.add_parser('list', help='analyses and groups')
+    run_options = argparse.ArgumentParser(add_help=False)
+    run_options.add_argument('--where', default='', help="row predicate, e.g. \"brand == 'DELL' and price < 1500\"")
+    add_run_options(run_options)
+
+    every = commands.add_parser('all', parents=[run_options], help='every analysis (or --only / --skip)')
+    every.add_argument('--only', action='append', default=[], help='tasks or groups to run (comma-separated)')
+    every.add_argument('--skip', action='append', default=[], help='tasks or groups to leave out')
+    for task in TASKS:
+        aliases = [short_name(task)] if short_name(task) != task_name(task) else []
+        commands.add_parser(task_name(task), aliases=aliases, parents=[run_options], help=task.script)
+    args = parser.parse_args(argv)
+
+    if args.command == 'list':
+        list_tasks()
+        return 0
+    try:
+        if args.command == 'all':
+            only = [name for value in args.only for name in value.split(',') if name]
+            skip = {task_name(t) for t in select([name for value in args.skip for name in value.split(',') if name])}
+            tasks = [t for t in select(only or DEFAULT_GROUPS) if task_name(t) not in skip]
+        else:
+            tasks = [t for t in TASKS if args.command in (task_name(t), short_name(t))]
+    except ValueError as e:
+        parser.error(str(e))
+
+    title = f"🚀 Running {len(tasks)} analysis task(s)..."
+    where = args.where.strip()
+    if where:
+        try:
+            matching, rows = check_where(where)
+        except ValueError as e:
+            parser.error(f"--where: {e}")
+        if matching == 0:
+            # Analyses cannot draw an empty table
+            parser.error(f"--where: {where!r} matches none of the {rows:,} rows")
+        from cleaning import WHERE_VAR
+        # Every load in this run, here and in the task processes, applies it
+        os.environ[WHERE_VAR] = where
+        title += f"\n🔎 where {where}: {matching:,} of {rows:,} rows"
+    return build(tasks, args.jobs, args.in_process, args.force, title, run_limits(args))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,192 @@
+"""
+Parse Cache
+Runs string parsers once per distinct value instead of once per row: the
+column is factorized (or its categories are used directly), the parser sees
+only the unique strings, and the results are broadcast back through the
+integer codes.
+
+Results are also kept across runs in .cache/parse_cache.pkl, keyed by the
+transform and the raw string, so later runs, chunks and new CSV versions
+only parse strings they have not seen before. A transform's key names it and
+hashes its source (transform_key()), so after a parser is fixed every string
+is parsed again instead of being served the old result.
+
+New results are written once per load (flush(), called by the loaders and
+at exit), not once per call or chunk. Processes writing at the same time
+(run_all.py --jobs N, the render daemon) merge their entries under a lock on
+parse_cache.pkl.lock. Each write also prunes the file: keys replaced by a
+newer version of the same transform ('name:<old hash>'), keys no run has
+used for STALE_DAYS, and beyond MAX_ENTRIES strings per key those no
+recent run has seen.
+"""
+from contextlib import contextmanager
+import pandas as pd
+import numpy as np
+import atexit
+import hashlib
+import inspect
+import os
+import pickle
+import time
+
+import data_loader
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: no advisory locks, a concurrent writer may drop new entries
+    fcntl = None
+
+CACHE_FILE = 'parse_cache.pkl'
+
+# Keys no run has used for this long are dropped from the file
+STALE_DAYS = 30
+# Strings kept per key (the ones seen most recently)
+MAX_ENTRIES = 200_000
+
+# transform key -> {raw string: parsed value}, loaded from disk on first use
+_memo = {}
+# transform key -> strings this process has looked up
+_seen = {}
+# Keys with results not written to disk yet
+_dirty = set()
+
+
+def memoize(series, transform, key, na_value=np.nan, text=False, counts=False):
+    """`transform` applied to every value of `series`, computed once per
+    distinct value. `transform` takes a Series of unique strings (and, with
+    `counts`, an array of how many rows hold each) and returns one result per
+    string; missing values get `na_value`. Numeric results come back as
+    float64, text results (`text` or a str `na_value`) as strings."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes, uniques = series.cat.codes.to_numpy(), series.cat.categories
+    else:
+        codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    uniques = [str(u) for u in uniques]
+
+    memo = _load(key)
+    _seen.setdefault(key, set()).update(uniques)
+    new = [i for i, u in enumerate(uniques) if u not in memo]
+    if new:
+        todo = pd.Series([uniques[i] for i in new], dtype=str)
+        if counts:
+            results = transform(todo, np.bincount(codes[codes >= 0], minlength=len(uniques))[new])
+        else:
+            results = transform(todo)
+        memo.update(zip(todo, np.asarray(results, dtype=object).tolist()))
+        _dirty.add(key)
+
+    # Missing values point at an extra last slot holding na_value
+    values = [memo[u] for u in uniques] + [na_value]
+    codes = codes.astype(np.intp)
+    codes[codes < 0] = len(values) - 1
+    if text or isinstance(na_value, str):
+        return pd.Series(pd.array(values, dtype=str).take(codes), index=series.index, name=series.name)
+    return pd.Series(np.array(values, dtype=float)[codes], index=series.index, name=series.name)
+
+
+def transform_key(name, *functions):
+    """Cache key of transform `name` computed by `functions`: changes
+    whenever the source of any of them does."""
+    sha = hashlib.sha1(name.encode('utf-8'))
+    for function in functions:
+        try:
+            sha.update(inspect.getsource(function).encode('utf-8'))
+        except (OSError, TypeError):
+            # No source file (frozen or compiled-only installs)
+            sha.update(function.__code__.co_code)
+    return f'{name}:{sha.hexdigest()[:12]}'
+
+
+def known(key):
+    """{raw string: result} of everything cached under `key` so far."""
+    return _load(key)
+
+
+def cache_file():
+    return os.path.join(data_loader.CACHE_DIR, CACHE_FILE)
+
+
+def flush():
+    """Write the results computed since the last flush, merged with what
+    other processes stored meanwhile, and prune the file."""
+    if not _dirty:
+        return
+    now = time.time()
+    with _locked():
+        stored = _read_file()
+        used, memos = stored.get('used', {}), stored.get('memo', {})
+        for key in _seen:
+            used[key] = now
+            if key in _dirty:
+                memos[key] = _capped({**memos.get(key, {}), **_memo[key]}, _seen[key])
+        # Superseded versions of the transforms used here, and keys nobody uses
+        current = {_family(key): key for key in _seen}
+        for key in list(memos):
+            if current.get(_family(key), key) != key or now - used.get(key, 0) > STALE_DAYS * 86400:
+                del memos[key]
+        used = {key: stamp for key, stamp in used.items() if key in memos}
+        data_loader._write_atomic(cache_file(), pickle.dumps({'used': used, 'memo': memos},
+                                                             protocol=pickle.HIGHEST_PROTOCOL))
+    _dirty.clear()
+
+
+# Lookups outside a load (rule tables applied by the scripts themselves)
+atexit.register(flush)
+
+
+def clear():
+    """Forget every cached parse (in memory and on disk)."""
+    _memo.clear()
+    _seen.clear()
+    _dirty.clear()
+    try:
+        os.remove(cache_file())
+    except FileNotFoundError:
+        pass
+
+
+def _read_file():
+    """{'used': {key: last use}, 'memo': {key: {string: result}}} ({} when
+    missing, unreadable or in an older layout)."""
+    try:
+        with open(cache_file(), 'rb') as f:
+            stored = pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError):
+        return {}
+    return stored if isinstance(stored, dict) and 'memo' in stored else {}
+
+
+def _load(key):
+    if key not in _memo:
+        _memo[key] = _read_file().get('memo', {}).get(key, {})
+    return _memo[key]
+
+
+def _family(key):
+    """The transform a key belongs to: the key without its version hash."""
+    return key.rsplit(':', 1)[0]
+
+
+def _capped(memo, seen):
+    """`memo` cut to MAX_ENTRIES strings, keeping the `seen` ones first."""
+    if len(memo) <= MAX_ENTRIES:
+        return memo
+    recent = {u: memo[u] for u in seen if u in memo}
+    older = [(u, value) for u, value in memo.items() if u not in recent]
+    return {**dict(older[len(older) - max(MAX_ENTRIES - len(recent), 0):]), **recent}
+
+
+@contextmanager
+def _locked():
+    """Exclusive lock on the cache file, held across processes."""
+    if fcntl is None:
+        yield
+        return
+    os.makedirs(data_loader.CACHE_DIR, exist_ok=True)
+    with open(cache_file() + '.lock', 'ab') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
@@ -0,0 +1,271 @@
+"""
+Stage Profiler
+Splits an analysis run into the stages its time and memory go to:
+
+    load      reading the table: CSV parse, columnar / cleaned caches, shared memory
+    clean     deriving columns, --where and filter profiles (cleaning.py)
+    compute   the analysis itself up to its first figure: aggregates, model fitting
+    render    building figures, from the first one created onwards
+    save      savefig and image writes (matplotlib rasterizes the figure here)
+
+Each stage gets its wall time, CPU time and peak RSS. Stages are exclusive:
+a load inside a clean counts towards load only. Peak RSS is the high-water
+mark while the stage ran (reset at every stage change through
+/proc/self/clear_refs on Linux; elsewhere it is the process peak so far).
+
+The loaders mark their stages with `stage(...)`, which costs nothing unless
+an analysis is being profiled; figure creation and saving are hooked in
+matplotlib and Pillow. scheduler.py profiles every task it runs, prints the
+stage table and writes the run's report to .cache/profile.json.
+
+Usage:
+    python scripts/profiling.py 07_top_sellers    # profile one analysis
+    python scripts/profiling.py                   # the last run's report
+"""
+from contextlib import contextmanager
+from datetime import datetime
+import argparse
+import functools
+import importlib
+import json
+import os
+import sys
+import time
+
+from build_cache import CACHE_DIR
+from snapshots import _write_atomic, current_snapshot
+
+# Setup paths
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_dir = os.path.dirname(script_dir)
+REPORT_FILE = 'profile.json'
+
+STAGES = ['load', 'clean', 'compute', 'render', 'save']
+
+# Clock of the analysis being profiled in this process, if any
+_clock = None
+
+
+class StageClock:
+    """Wall time, CPU time and peak RSS per stage of one analysis run."""
+
+    def __init__(self):
+        self.stages = {name: {'wall': 0.0, 'cpu': 0.0, 'peak_rss_mb': 0.0, 'calls': 0} for name in STAGES}
+        self.stack = []
+        self.enter('compute')
+
+    def enter(self, name):
+        if self.stack:
+            self._stop()
+        self.stack.append(name)
+        self.stages[name]['calls'] += 1
+        self._start()
+
+    def exit(self):
+        self._stop()
+        self.stack.pop()
+        self._start()
+
+    def figure_created(self):
+        # The first figure created outside a nested stage ends 'compute'
+        if self.stack == ['compute']:
+            self.exit()
+            self.enter('render')
+
+    def finish(self):
+        self._stop()
+        self.stack = []
+        return self.stages
+
+    def _start(self):
+        _reset_peak()
+        self.wall, self.cpu = time.perf_counter(), time.process_time()
+
+    def _stop(self):
+        entry = self.stages[self.stack[-1]]
+        entry['wall'] += time.perf_counter() - self.wall
+        entry['cpu'] += time.process_time() - self.cpu
+        entry['peak_rss_mb'] = max(entry['peak_rss_mb'], _peak_rss() / 2**20)
+
+
+@contextmanager
+def stage(name):
+    """Count the time inside the block (or decorated function) towards stage
+    `name` of the analysis being profiled; does nothing otherwise."""
+    clock = _clock
+    if clock is None:
+        yield
+        return
+    clock.enter(name)
+    try:
+        yield
+    finally:
+        clock.exit()
+
+
+@contextmanager
+def profiling():
+    """Profile the analysis run inside the block. Yields its StageClock, whose
+    `stages` are complete once the block exits (also when it raises)."""
+    global _clock
+    _install_hooks()
+    _clock = clock = StageClock()
+    try:
+        yield clock
+    finally:
+        clock.finish()
+        _clock = None
+
+
+def report_path():
+    return os.path.join(CACHE_DIR, REPORT_FILE)
+
+
+def save_report(tasks, runner):
+    """Write the run's report: `tasks` maps each task name to its status,
+    wall seconds, stages (None when it was stopped before reporting them)
+    and, from the scheduler, its budget and any violation of it. Returns
+    the report's path."""
+    report = {'created': datetime.now().isoformat(timespec='seconds'), 'runner': runner,
+              'data': current_snapshot(), 'mode': os.environ.get('LAPTOPS_MODE', '').lower() or 'memory',
+              'where': os.environ.get('LAPTOPS_WHERE', '').strip(), 'stages': STAGES,
+              'tasks': {name: {'status': entry['status'], 'wall': round(entry['wall'], 4),
+                               'stages': entry['stages'] and _rounded(entry['stages']),
+                               'budget': entry.get('budget'), 'violation': entry.get('violation')}
+                        for name, entry in tasks.items()}}
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    _write_atomic(report_path(), json.dumps(report, indent=2).encode('utf-8'))
+    return report_path()
+
+
+def print_table(tasks):
+    """Console table of a report's tasks: wall seconds per stage, the rest
+    of each task's wall time (interpreter start-up, imports), CPU seconds and
+    peak RSS."""
+    print("\n📊 Stage profile (seconds; peak RSS in MB)")
+    print("=" * 96)
+    header = ''.join(f'{name:>9}' for name in [*STAGES, 'other', 'cpu'])
+    print(f"   {'task':<28}{header} {'peak MB':>9}")
+    totals = dict.fromkeys([*STAGES, 'other', 'cpu'], 0.0)
+    peak = 0.0
+    for name, entry in sorted(tasks.items(), key=lambda item: -item[1]['wall']):
+        stages = entry['stages']
+        if not stages:
+            print(f"🛑 {name:<28}{'(stopped before its stages were reported)':>54}")
+            continue
+        row = {s: stages[s]['wall'] for s in STAGES}
+        row['other'] = max(entry['wall'] - sum(row.values()), 0.0)
+        row['cpu'] = sum(stages[s]['cpu'] for s in STAGES)
+        task_peak = max(stages[s]['peak_rss_mb'] for s in STAGES)
+        for key, value in row.items():
+            totals[key] += value
+        peak = max(peak, task_peak)
+        icon = {'ok': '✅', 'over budget': '🛑'}.get(entry['status'], '❌')
+        print(f"{icon} {name:<28}{''.join(f'{row[k]:>9.2f}' for k in totals)} {task_peak:>9.1f}")
+    print("-" * 96)
+    print(f"   {'total':<28}{''.join(f'{totals[k]:>9.2f}' for k in totals)} {peak:>9.1f}")
+    slowest = max(STAGES, key=lambda s: totals[s])
+    print(f"   Most time in: {slowest} ({totals[slowest]:.2f}s of {sum(totals[s] for s in STAGES):.2f}s staged)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('task', nargs='?', help='analysis to profile (default: show the last report)')
+    parser.add_argument('--json', help='write the stages to this file instead of printing the table')
+    args = parser.parse_args(argv)
+
+    if args.task is None:
+        try:
+            with open(report_path(), encoding='utf-8') as f:
+                report = json.load(f)
+        except (OSError, ValueError):
+            print("❌ No stage report yet; run scripts/scheduler.py first")
+            return 1
+        print(f"📁 {os.path.relpath(report_path(), project_dir)}: {report['created']}, "
+              f"{report['runner']} run, {report['mode']} mode" + (f", where {report['where']}" if report['where'] else ''))
+        print_table(report['tasks'])
+        for name, entry in report['tasks'].items():
+            if entry.get('violation'):
+                print(f"🛑 {name}: {entry['violation']}")
+        return 0
+
+    name = os.path.splitext(os.path.basename(args.task))[0]
+    start = time.perf_counter()
+    module = importlib.import_module(name)
+    # The analysis sees the command line it would have as a script
+    sys.argv = [os.path.join(script_dir, f'{name}.py')]
+    status = 'failed'
+    try:
+        with profiling() as clock:
+            module.main()
+        status = 'ok'
+    finally:
+        entry = {'status': status, 'wall': time.perf_counter() - start, 'stages': clock.stages}
+        if args.json:
+            with open(args.json, 'w', encoding='utf-8') as f:
+                json.dump(_rounded(clock.stages), f)
+        else:
+            print_table({name: entry})
+    return 0
+
+
+def _install_hooks():
+    """Route figure creation and image saving through the clock (once per
+    process, for the plotting libraries already imported)."""
+    figure = sys.modules.get('matplotlib.figure')
+    if figure and not hasattr(figure.Figure, '_stage_hooks'):
+        figure.Figure.__init__ = _on_figure(figure.Figure.__init__)
+        figure.Figure.savefig = stage('save')(figure.Figure.savefig)
+        figure.Figure._stage_hooks = True
+    image = sys.modules.get('PIL.Image')
+    if image and not hasattr(image.Image, '_stage_hooks'):
+        image.Image.save = stage('save')(image.Image.save)
+        image.Image._stage_hooks = True
+
+
+def _on_figure(init):
+    @functools.wraps(init)
+    def wrapper(self, *args, **kwargs):
+        if _clock is not None:
+            _clock.figure_created()
+        init(self, *args, **kwargs)
+    return wrapper
+
+
+def _reset_peak():
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            # Resets the peak RSS (VmHWM) to the current RSS
+            f.write('5')
+    except OSError:
+        pass
+
+
+def _peak_rss():
+    """Peak resident set size in bytes."""
+    try:
+        with open('/proc/self/status', encoding='ascii') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:
+        # Windows
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Bytes on macOS, kilobytes elsewhere
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def _rounded(stages):
+    return {name: {'wall': round(s['wall'], 4), 'cpu': round(s['cpu'], 4),
+                   'peak_rss_mb': round(s['peak_rss_mb'], 1), 'calls': s['calls']} for name, s in stages.items()}
+
+
+if __name__ == '__main__':
+    # Run as the imported module: the loaders' stage() calls read its clock, not __main__'s
+    from profiling import main
+    sys.exit(main())
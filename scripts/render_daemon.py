@@ -0,0 +1,308 @@
+"""
+Render Daemon
+A long-lived local process holding pandas, matplotlib, sklearn, every
+analysis module and the cleaned table, reachable over a Unix socket, so
+re-rendering one chart while iterating on its styling skips the interpreter
+start-up, the imports and the table read:
+
+    python scripts/render_daemon.py serve &                   # start (Ctrl-C or 'stop' ends it)
+    python scripts/render_daemon.py render 07_top_sellers     # tasks or groups, as in scheduler.py
+    python scripts/render_daemon.py status
+    python scripts/render_daemon.py stop
+
+Before every request, and every POLL_SECONDS while idle, the daemon checks
+what changed on disk and reloads only that:
+
+    the dataset (current snapshot)          table reloaded
+    a task's script                         that module reloaded
+    shared code (build_cache.SHARED_CODE)   daemon restarts itself (those
+    or the brand alias file                 modules import one another),
+                                            keeping its socket open, so
+                                            requests wait rather than fail
+
+A reload that fails (a typo in the script being edited, a half-written
+dataset) is reported to the render requests that need it and retried once
+the file changes again; the daemon keeps serving.
+
+Renders are recorded in the build cache (build_cache.py), so a later
+run_all.py does not redo them. The client side imports only the standard
+library; set LAPTOPS_DAEMON_SOCKET to use another socket path.
+"""
+from contextlib import ExitStack
+import argparse
+import importlib
+import json
+import os
+import socket
+import sys
+import time
+
+from build_cache import ALIAS_ENV_VAR, ALIAS_PATH, CACHE_DIR, SHARED_CODE, load_manifest, record, save_manifest, shared_key
+from snapshots import current_snapshot
+
+# Setup paths
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_dir = os.path.dirname(script_dir)
+SOCKET_PATH = os.environ.get('LAPTOPS_DAEMON_SOCKET') or os.path.join(CACHE_DIR, 'render.sock')
+
+# Seconds between checks for changed files while idle
+POLL_SECONDS = 1.0
+# How long a client waits for a restarting daemon
+RESTART_TIMEOUT = 60.0
+
+
+class Daemon:
+    """The warm state: modules imported, table held, file stamps of the last check."""
+
+    def __init__(self):
+        # Imported here: the client side never needs them
+        from theme import use_file_backend
+        use_file_backend()
+        import matplotlib.pyplot  # noqa: F401
+        import sklearn.linear_model  # noqa: F401  (imported lazily by some analyses)
+        from scheduler import TASKS, analysis
+
+        self.tasks = TASKS
+        for task in TASKS:
+            analysis(task)
+        self.table = ExitStack()
+        self.load_table()
+        self.stamps = _stamps(TASKS)
+        self.started = time.time()
+        self.renders = 0
+        self.running = True
+        self.restart = False
+        # What failed to reload ('dataset' or a module name) -> error message
+        self.errors = {}
+
+    def load_table(self):
+        from cleaning import held_table
+        from data_loader import execution_mode
+
+        self.table.close()
+        # Streaming, incremental and SQL runs never hold the full table
+        if execution_mode([]) == 'memory':
+            self.table.enter_context(held_table(current_snapshot()))
+
+    def refresh(self):
+        """Reload what changed on disk since the last check; returns what was
+        reloaded and what failed to (also kept in `errors` until a later
+        reload succeeds). Sets `restart` when shared code changed."""
+        stamps = _stamps(self.tasks)
+        if stamps['shared'] != self.stamps['shared']:
+            self.restart = True
+            return ['shared code'], []
+        changed = []
+        if stamps['data'] != self.stamps['data']:
+            changed.append(('dataset', self.load_table))
+        for name, stamp in stamps['scripts'].items():
+            if stamp != self.stamps['scripts'].get(name) and name in sys.modules:
+                changed.append((name, lambda name=name: importlib.reload(sys.modules[name])))
+        reloaded, failed = [], []
+        for name, reload in changed:
+            try:
+                reload()
+            except Exception as e:
+                self.errors[name] = f"{type(e).__name__}: {e}"
+                failed.append(name)
+            else:
+                self.errors.pop(name, None)
+                reloaded.append(name)
+        self.stamps = stamps
+        return reloaded, failed
+
+    def handle(self, request):
+        from scheduler import _task_key, call_task, select, task_name
+
+        op = request.get('op')
+        if op == 'status':
+            return {'ok': True, 'pid': os.getpid(), 'uptime': time.time() - self.started,
+                    'renders': self.renders, 'data': current_snapshot()}
+        if op == 'stop':
+            self.running = False
+            return {'ok': True}
+        if op != 'render':
+            return {'ok': False, 'error': f"Unknown request: {op}"}
+
+        reloaded, _ = self.refresh()
+        if self.restart:
+            return {'ok': False, 'restarting': True, 'error': 'shared code changed, daemon restarting'}
+        try:
+            tasks = select(request.get('tasks', []))
+        except ValueError as e:
+            return {'ok': False, 'error': str(e)}
+        # Stale: the last reload of the dataset or of a requested script failed
+        stale = [name for name in ['dataset', *(os.path.splitext(t.script)[0] for t in tasks)] if name in self.errors]
+        if stale:
+            return {'ok': False, 'reloaded': reloaded,
+                    'error': '; '.join(f"reloading {name} failed: {self.errors[name]}" for name in stale)}
+        results = [call_task(task) for task in tasks]
+        self.renders += len(results)
+
+        manifest = load_manifest()
+        shared = shared_key(manifest)
+        for r in results:
+            if r.status == 'ok':
+                record(task_name(r.task), _task_key(r.task, manifest, shared), r.task.outputs, manifest)
+        save_manifest(manifest)
+        return {'ok': all(r.status == 'ok' for r in results), 'reloaded': reloaded,
+                'results': [{'task': task_name(r.task), 'status': r.status, 'seconds': r.seconds,
+                             'output': r.output} for r in results]}
+
+
+def serve(path=SOCKET_PATH, listen_fd=None):
+    """Run the daemon in the foreground until stopped. `listen_fd` is the
+    socket handed over by the process it restarts from."""
+    start = time.perf_counter()
+    if listen_fd is None:
+        try:
+            request({'op': 'status'}, path)
+            print(f"❌ A render daemon is already listening on {path}")
+            return 1
+        except OSError:
+            pass
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if os.path.exists(path):
+            # Left behind by a daemon that did not shut down cleanly
+            os.remove(path)
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(path)
+        server.listen()
+    else:
+        # Clients that connected during the restart wait in its backlog
+        server = socket.socket(fileno=listen_fd)
+    daemon = Daemon()
+    server.settimeout(POLL_SECONDS)
+    print(f"🔥 Render daemon ready in {time.perf_counter() - start:.2f}s (pid {os.getpid()}), listening on {path}")
+    sys.stdout.flush()
+    try:
+        while daemon.running and not daemon.restart:
+            try:
+                conn, _ = server.accept()
+            except socket.timeout:
+                reloaded, failed = daemon.refresh()
+                for change in reloaded:
+                    print(f"🔄 Reloaded: {change}")
+                for name in failed:
+                    print(f"❌ Reloading {name} failed: {daemon.errors[name]}")
+                continue
+            with conn:
+                conn.settimeout(None)
+                try:
+                    message = json.loads(_read_all(conn))
+                except ValueError:
+                    message = {}
+                try:
+                    response = daemon.handle(message)
+                except Exception as e:
+                    # One bad request must not take the daemon down
+                    response = {'ok': False, 'error': f"{type(e).__name__}: {e}"}
+                if response.get('results'):
+                    print(f"🖼️ {', '.join(r['task'] for r in response['results'])} "
+                          f"({sum(r['seconds'] for r in response['results']):.2f}s)")
+                conn.sendall(json.dumps(response).encode('utf-8'))
+            sys.stdout.flush()
+    except KeyboardInterrupt:
+        daemon.restart = False
+    finally:
+        daemon.table.close()
+        if not daemon.restart:
+            server.close()
+            os.remove(path)
+
+    if daemon.restart:
+        print("🔄 Shared code changed, restarting...")
+        sys.stdout.flush()
+        server.set_inheritable(True)
+        os.execv(sys.executable, [sys.executable, os.path.abspath(__file__), 'serve',
+                                  '--listen-fd', str(server.fileno())])
+    print("👋 Render daemon stopped")
+    return 0
+
+
+def request(message, path=SOCKET_PATH):
+    """Send one request to the daemon and return its response (OSError when
+    no daemon is listening)."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(path)
+        client.sendall(json.dumps(message).encode('utf-8'))
+        client.shutdown(socket.SHUT_WR)
+        return json.loads(_read_all(client))
+
+
+def render(names, path=SOCKET_PATH):
+    """Ask the daemon to render tasks `names`; waits out a restart."""
+    start = time.perf_counter()
+    response = request({'op': 'render', 'tasks': names}, path)
+    deadline = time.monotonic() + RESTART_TIMEOUT
+    while response.get('restarting') and time.monotonic() < deadline:
+        time.sleep(0.2)
+        try:
+            response = request({'op': 'render', 'tasks': names}, path)
+        except OSError:
+            continue
+    if response.get('reloaded'):
+        print(f"🔄 Reloaded: {', '.join(response['reloaded'])}")
+    for r in response.get('results', []):
+        print(r['output'])
+        if r['status'] != 'ok':
+            print(f"❌ Error in {r['task']}")
+    if 'error' in response:
+        print(f"❌ {response['error']}")
+    print(f"⚡ Rendered through the daemon in {time.perf_counter() - start:.2f}s")
+    return 0 if response['ok'] else 1
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('command', choices=['serve', 'render', 'status', 'stop'])
+    parser.add_argument('tasks', nargs='*', help='task or group names to render')
+    parser.add_argument('--listen-fd', type=int, default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.command == 'serve':
+        return serve(listen_fd=args.listen_fd)
+    try:
+        if args.command == 'render':
+            return render(args.tasks)
+        response = request({'op': args.command})
+    except OSError:
+        print(f"❌ No render daemon on {SOCKET_PATH}; start one with: python scripts/render_daemon.py serve")
+        return 1
+    if args.command == 'status':
+        print(f"🔥 Render daemon pid {response['pid']}, up {response['uptime']:.0f}s, "
+              f"{response['renders']} render(s), data: {response['data']}")
+    else:
+        print("👋 Stop requested")
+    return 0
+
+
+def _stamps(tasks):
+    """(size, mtime) of everything the daemon has loaded."""
+    shared = [os.path.join(script_dir, name) for name in SHARED_CODE]
+    shared.append(os.environ.get(ALIAS_ENV_VAR) or ALIAS_PATH)
+    try:
+        data = current_snapshot()
+    except FileNotFoundError:
+        data = None
+    return {'shared': [_stat(p) for p in shared], 'data': (data, _stat(data) if data else None),
+            'scripts': {os.path.splitext(t.script)[0]: _stat(os.path.join(script_dir, t.script)) for t in tasks}}
+
+
+def _stat(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def _read_all(conn):
+    chunks = []
+    for chunk in iter(lambda: conn.recv(1 << 16), b''):
+        chunks.append(chunk)
+    return b''.join(chunks).decode('utf-8')
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,91 @@
+"""
+Categorization Rules
+Declarative rule tables for the CPU tier, GPU type and OS columns. Each table
+is an ordered list of (label, substrings): the first label with a substring
+occurring in the lower-cased value wins, missing values get `null` and
+everything else `default`.
+
+A table compiles each rule to one regex alternation and labels the distinct
+values of a column with vectorized str.contains + np.select, instead of a
+Python function per row. The same
+tables drive the SQL CASE expressions in sql_backend.py.
+"""
+import pandas as pd
+import numpy as np
+import hashlib
+import re
+
+from parse_cache import memoize, transform_key
+
+
+class RuleTable:
+    """Ordered substring rules mapped to labels."""
+
+    def __init__(self, rules, default, null):
+        self.rules = rules
+        self.default = default
+        self.null = null
+        self.labels = [label for label, _ in rules]
+        self.patterns = ['|'.join(re.escape(s) for s in substrings) for _, substrings in rules]
+        # Parse cache key: changes whenever the rules or the matching code do
+        self.key = transform_key('rules:' + hashlib.sha1(repr((rules, default, null)).encode('utf-8')).hexdigest()[:12],
+                                 RuleTable._match)
+
+    def label(self, value):
+        """Label of a single value (pure Python; same result as apply)."""
+        if pd.isna(value):
+            return self.null
+        value = str(value).lower()
+        for label, substrings in self.rules:
+            if any(s in value for s in substrings):
+                return label
+        return self.default
+
+    def apply(self, series):
+        """Label every value of `series`; returns a Series of plain strings.
+        Matching runs once per distinct value (see parse_cache.py)."""
+        return memoize(series, self._match, self.key, na_value=self.null)
+
+    def _match(self, series):
+        text = series.astype(str).str.lower() if series.dtype != 'str' else series.str.lower()
+        conditions = [text.str.contains(pattern, regex=True, na=False).to_numpy(dtype=bool)
+                      for pattern in self.patterns]
+        values = np.select(conditions, self.labels, default=self.default).astype(object)
+        values[series.isna().to_numpy()] = self.null
+        return values
+
+
+# Shared by the GPU type and the 3-way graphics type below
+DEDICATED_GPU = ['dedicated', 'rtx', 'gtx', 'nvidia', 'geforce', 'radeon rx']
+
+GPU_TYPES = RuleTable([
+    ('Dedicated', DEDICATED_GPU),
+], default='Integrated', null='Unknown')
+
+GRAPHICS_TYPES = RuleTable([
+    ('Dedicated', DEDICATED_GPU),
+    ('Integrated', ['integrated', 'intel', 'uhd', 'iris']),
+], default='Other', null='Unknown')
+
+CPU_TIERS = RuleTable([
+    ('Flagship', ['i9', 'ryzen 9', 'm2 max', 'm2 pro']),
+    ('High-End', ['i7', 'ryzen 7', 'm2', 'm1 pro']),
+    ('Mid-Range', ['i5', 'ryzen 5', 'm1']),
+    ('Entry', ['i3', 'ryzen 3']),
+    ('Budget', ['celeron', 'pentium', 'athlon']),
+], default='Other', null='Unknown')
+
+PROCESSOR_TIERS = RuleTable([
+    ('i9/Ryzen 9', ['i9', 'ryzen 9']),
+    ('i7/Ryzen 7', ['i7', 'ryzen 7']),
+    ('i5/Ryzen 5', ['i5', 'ryzen 5']),
+    ('i3/Ryzen 3', ['i3', 'ryzen 3']),
+], default='Other', null='Other')
+
+OS_CATEGORIES = RuleTable([
+    ('Windows 11', ['windows 11']),
+    ('Windows 10', ['windows 10']),
+    ('Windows (Other)', ['windows']),
+    ('Chrome OS', ['chrome']),
+    ('macOS', ['mac']),
+], default='Other', null='Unknown')
@@ -0,0 +1,461 @@
+"""
+Task Scheduler
+Knows every analysis script with the files it reads and writes, and runs
+them as a dependency graph: a task starts once the tasks producing its
+inputs have finished, and independent tasks run in parallel (up to --jobs
+at a time, longest first by their last recorded wall time). The cleaned
+table is published to shared memory once for all of them (shared_data.py).
+
+Usage:
+    python scripts/scheduler.py                     # graphs, analysis and gifs
+    python scripts/scheduler.py graphs --jobs 4     # one group
+    python scripts/scheduler.py 07_top_sellers gifs # tasks and groups mixed
+    python scripts/scheduler.py --in-process        # one process, one table
+
+Every task is a script whose main() is its analysis; TASKS is the registry.
+By default each runs in its own interpreter. With --in-process they run one
+after another in this process instead: the libraries, the script modules and
+the cleaned table are loaded once and every analysis is called against the
+same table (cleaning.held_table), skipping the per-script interpreter
+start-up, imports and table read.
+
+Every task runs under a time and memory budget (Task.budget, DEFAULT_BUDGET;
+--timeout / --max-memory override it for the run). A task's interpreter is
+killed once it runs longer or holds more resident memory than its budget -
+polled every WATCH_SECONDS, with an address-space rlimit as a backstop - and
+the other tasks carry on. In-process runs cannot stop an analysis; there an
+overrun is only reported. Violations are listed in the summary and the
+stage report.
+
+Every task is profiled by stage - load, clean, compute, render, save
+(profiling.py): the run ends with a stage table and writes the report to
+.cache/profile.json.
+
+Tasks whose outputs are up to date - same dataset, script and shared code
+as when they were last built - are skipped (build_cache.py); --force
+rebuilds them anyway. Until something needs to run, nothing heavier than
+the standard library is imported, so a run with nothing to do is quick.
+
+Exits non-zero when any task fails; tasks depending on a failed task are
+skipped. run_all.py and run_all_gifs.py run the 'graphs' + 'analysis' and
+'gifs' groups through this scheduler.
+"""
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import partial
+from contextlib import nullcontext, redirect_stdout
+import argparse
+import importlib
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import traceback
+
+from build_cache import CACHE_DIR, load_manifest, record, save_manifest, shared_key, task_key, up_to_date
+from profiling import print_table, profiling, save_report
+from snapshots import _write_atomic, current_snapshot
+
+# Setup paths
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_dir = os.path.dirname(script_dir)
+
+# The current dataset (snapshots.py), served through the shared table
+DATA = 'laptops.csv'
+
+# Limits of one analysis run: wall seconds and resident memory in MB (0: none)
+Budget = namedtuple('Budget', ['seconds', 'memory_mb'])
+# Far above any full-data run (under 15s and 0.5 GB): only a runaway input hits it
+DEFAULT_BUDGET = Budget(seconds=900, memory_mb=4096)
+
+Task = namedtuple('Task', ['script', 'group', 'outputs', 'inputs', 'budget'], defaults=[(DATA,), None])
+
+TASKS = [
+    Task('01_brand_distribution.py', 'graphs', ['graphs/01_brand_distribution.png']),
+    Task('02_price_analysis.py', 'graphs', ['graphs/02_price_analysis.png']),
+    Task('03_ram_analysis.py', 'graphs', ['graphs/03_ram_analysis.png']),
+    Task('04_os_analysis.py', 'graphs', ['graphs/04_os_analysis.png']),
+    Task('05_screen_size_analysis.py', 'graphs', ['graphs/05_screen_size_analysis.png']),
+    Task('06_graphics_analysis.py', 'graphs', ['graphs/06_graphics_analysis.png']),
+    Task('07_top_sellers.py', 'graphs', ['graphs/07_top_sellers.png']),
+    Task('08_rating_analysis.py', 'graphs', ['graphs/08_rating_analysis.png']),
+    Task('09_advanced_viz.py', 'graphs', ['graphs/09a_brand_positioning.png', 'graphs/09b_spec_heatmap.png',
+                                          'graphs/09c_market_segments.png', 'graphs/09d_value_analysis.png']),
+    Task('10_summary_dashboard.py', 'graphs', ['graphs/10_summary_dashboard.png']),
+    Task('11_price_prediction.py', 'analysis', ['graphs/11_price_prediction.png']),
+    Task('12_market_segmentation.py', 'analysis', ['graphs/12_market_segmentation.png']),
+    Task('13_value_anomalies.py', 'analysis', ['graphs/13_value_anomalies.png']),
+    Task('deep_analysis.py', 'analysis', ['deep_insights.txt']),
+    Task('gif_01_brand_race.py', 'gifs', ['gifs/01_brand_race.gif']),
+    Task('gif_02_price_scatter.py', 'gifs', ['gifs/02_price_scatter.gif']),
+    Task('gif_03_stats_counter.py', 'gifs', ['gifs/03_stats_counter.gif']),
+    Task('gif_04_segment_pie.py', 'gifs', ['gifs/04_segment_pie.gif']),
+    # Hard-coded figures, no data input
+    Task('generate_mobile_graphs.py', 'mobile', [f'graphs_mobile/{name}' for name in (
+        '01_stats.png', '02_brands.png', '03_price.png', '04_processor.png', '05_ram.png',
+        '06_ml.png', '07_segments.png', '08_anomalies.png', '09_features.png', '10_takeaways.png')], ()),
+]
+
+DEFAULT_GROUPS = ['graphs', 'analysis', 'gifs']
+
+# Last wall time of each task, used to start the longest ones first
+TIMES_FILE = 'task_times.json'
+
+# How often a running task is checked against its budget
+WATCH_SECONDS = 0.2
+# Address-space rlimit above the memory budget: virtual reservations (BLAS
+# threads, arenas) run far ahead of resident memory, so it only catches a
+# blow-up too fast for the watchdog
+ADDRESS_SPACE_HEADROOM_MB = 8192
+
+Result = namedtuple('Result', ['task', 'status', 'seconds', 'output', 'stages', 'violation'], defaults=[None, None])
+
+
+def task_name(task):
+    return os.path.splitext(task.script)[0]
+
+
+def select(names):
+    """Tasks named directly or through their group, in TASKS order."""
+    names = set(names)
+    known = {task_name(t) for t in TASKS} | {t.script for t in TASKS} | {t.group for t in TASKS}
+    unknown = sorted(names - known)
+    if unknown:
+        raise ValueError(f"Unknown task or group: {', '.join(unknown)}")
+    return [t for t in TASKS if names & {task_name(t), t.script, t.group}]
+
+
+def dependencies(tasks):
+    """{task name: names of the tasks among `tasks` producing one of its inputs}."""
+    producers = {output: task_name(task) for task in tasks for output in task.outputs}
+    return {task_name(task): {producers[i] for i in task.inputs if i in producers} for task in tasks}
+
+
+def stale_tasks(tasks, manifest):
+    """Names of the tasks among `tasks` whose outputs are out of date,
+    including every task reading the outputs of a stale one."""
+    shared = shared_key(manifest)
+    stale = {task_name(t) for t in tasks
+             if not up_to_date(task_name(t), _task_key(t, manifest, shared), t.outputs, manifest)}
+    needs = dependencies(tasks)
+    while True:
+        more = {name for name, deps in needs.items() if deps & stale} - stale
+        if not more:
+            return stale
+        stale |= more
+
+
+def task_budget(task, limits=None):
+    """The task's Budget, with the fields `limits` sets (not None) replacing it."""
+    budget = task.budget or DEFAULT_BUDGET
+    if limits:
+        budget = budget._replace(**{k: v for k, v in limits._asdict().items() if v is not None})
+    return budget
+
+
+def analysis(task):
+    """The callable behind a task: its script's main() (which the script's
+    own `if __name__ == '__main__'` calls when run standalone)."""
+    return importlib.import_module(task_name(task)).main
+
+
+def run_task(task, limits=None):
+    """Runner starting the task's script in its own interpreter, through
+    profiling.py, which hands back its stages in a temporary file. The
+    interpreter is killed once it goes over its budget (task_budget)."""
+    budget = task_budget(task, limits)
+    fd, stages_path = tempfile.mkstemp(suffix='.json')
+    os.close(fd)
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, os.path.join(script_dir, 'profiling.py'), task.script,
+                             '--json', stages_path], stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                            text=True, cwd=script_dir)
+    _limit_address_space(proc.pid, budget)
+    violation = None
+    while True:
+        try:
+            stdout, stderr = proc.communicate(timeout=WATCH_SECONDS)
+            break
+        except subprocess.TimeoutExpired:
+            if violation is None:
+                violation = _over_budget(proc.pid, time.perf_counter() - start, budget)
+                if violation:
+                    proc.kill()
+    seconds = time.perf_counter() - start
+    if violation is None and proc.returncode != 0 and budget.memory_mb and 'MemoryError' in stderr:
+        violation = f"out of memory under its {budget.memory_mb:,} MB budget's address-space limit"
+    try:
+        with open(stages_path, encoding='utf-8') as f:
+            stages = json.load(f)
+    except ValueError:
+        # Died before profiling.py wrote anything
+        stages = None
+    finally:
+        os.remove(stages_path)
+    if violation:
+        return Result(task, 'over budget', seconds, f"{stdout.strip()}\n🛑 Stopped: {violation}", stages, violation)
+    if proc.returncode != 0:
+        return Result(task, 'failed', seconds, stdout.strip() + '\n' + stderr.strip(), stages)
+    return Result(task, 'ok', seconds, stdout.strip(), stages)
+
+
+def call_task(task, limits=None):
+    """Runner calling the task's analysis in this process, its printed
+    output captured; matplotlib settings it changes are restored afterwards.
+    Going over the time budget is reported, not stopped."""
+    import matplotlib
+
+    start = time.perf_counter()
+    output = io.StringIO()
+    clock = None
+    try:
+        with redirect_stdout(output), matplotlib.rc_context(), profiling() as clock:
+            analysis(task)()
+    except Exception:
+        return Result(task, 'failed', time.perf_counter() - start,
+                      output.getvalue().strip() + '\n' + traceback.format_exc().strip(), clock and clock.stages)
+    seconds = time.perf_counter() - start
+    budget = task_budget(task, limits)
+    violation = None
+    if budget.seconds and seconds > budget.seconds:
+        violation = f"took {seconds:.0f}s, over its {budget.seconds:,}s time budget (in-process: not stopped)"
+    return Result(task, 'ok', seconds, output.getvalue().strip(), clock.stages, violation)
+
+
+def run_in_process(tasks, limits=None):
+    """Run `tasks` one at a time in this process after loading the shared
+    libraries, the task modules and the cleaned table once; prints what that
+    saved over running each script standalone."""
+    from cleaning import held_table
+    from data_loader import execution_mode
+
+    startup = _startup_seconds()
+    start = time.perf_counter()
+    for task in tasks:
+        analysis(task)
+    modules = time.perf_counter() - start
+
+    readers = sum(DATA in task.inputs for task in tasks)
+    # Streaming, incremental and SQL runs never hold the full table
+    hold = readers and execution_mode([]) == 'memory'
+    start = time.perf_counter()
+    with held_table(current_snapshot()) if hold else nullcontext():
+        table = time.perf_counter() - start
+        print(f"⚡ Shared setup: script modules {modules:.2f}s, table {table:.2f}s")
+        results = run(tasks, 1, runner=partial(call_task, limits=limits))
+    saved = (len(tasks) - 1) * startup + max(readers - 1, 0) * table
+    print(f"\n⚡ Shared setup saved ~{saved:.1f}s over standalone runs: {len(tasks) - 1} fewer start-ups "
+          f"({startup:.2f}s each) and {max(readers - 1, 0)} fewer table reads ({table:.2f}s each)")
+    return results
+
+
+def run(tasks, jobs=None, runner=run_task):
+    """Run `tasks` in dependency order, up to `jobs` at a time; prints each
+    task's output as it finishes and returns the Results in TASKS order."""
+    jobs = jobs or os.cpu_count() or 1
+    times = _read_times()
+    by_name = {task_name(t): t for t in tasks}
+    waiting = dependencies(tasks)
+    done = {}
+    running = {}
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        while waiting or running:
+            for name in [n for n, deps in waiting.items() if any(done[d].status != 'ok' for d in deps if d in done)]:
+                # A task it needs did not produce its outputs
+                del waiting[name]
+                done[name] = Result(by_name[name], 'skipped', 0.0, '')
+                _report(done[name])
+            ready = [n for n, deps in waiting.items() if all(d in done for d in deps)]
+            for name in sorted(ready, key=lambda n: -times.get(n, 0.0))[:jobs - len(running)]:
+                del waiting[name]
+                running[pool.submit(runner, by_name[name])] = name
+            if not running:
+                continue
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name = running.pop(future)
+                done[name] = future.result()
+                _report(done[name])
+    results = [done[name] for name in by_name]
+    times.update({task_name(r.task): r.seconds for r in results if r.status == 'ok'})
+    _write_times(times)
+    return results
+
+
+def summary(results, wall):
+    """Per-task and total wall time; True when every task succeeded."""
+    print("\n" + "=" * 50)
+    print("⏱️ Wall time per task:")
+    for r in sorted(results, key=lambda r: -r.seconds):
+        if r.status != 'cached':
+            icon = {'ok': '✅', 'failed': '❌', 'over budget': '🛑', 'skipped': '⏭️'}[r.status]
+            print(f"   {icon} {task_name(r.task):<28} {r.seconds:>7.2f}s")
+    cached = sum(r.status == 'cached' for r in results)
+    if cached:
+        print(f"   💾 {cached} up to date")
+    slowest = max((r.seconds for r in results), default=0.0)
+    print(f"   Total: {wall:.2f}s (sum of tasks {sum(r.seconds for r in results):.2f}s, slowest {slowest:.2f}s)")
+    for r in results:
+        if r.violation:
+            print(f"🛑 {task_name(r.task)}: {r.violation}")
+    failed = [task_name(r.task) for r in results if r.status in ('failed', 'over budget', 'skipped')]
+    if failed:
+        print(f"❌ {len(failed)} task(s) did not complete: {', '.join(failed)}")
+    return not failed
+
+
+def add_run_options(parser):
+    """--jobs / --in-process / --force / --timeout / --max-memory, shared with laptops.py."""
+    how = parser.add_mutually_exclusive_group()
+    how.add_argument('--jobs', '-j', type=int, default=None, help='tasks run at once (default: CPU count)')
+    how.add_argument('--in-process', action='store_true',
+                     help='call every analysis in this process against one loaded table')
+    parser.add_argument('--force', action='store_true', help='rebuild outputs that are up to date')
+    parser.add_argument('--timeout', type=int, default=None, metavar='SECONDS',
+                        help=f'time budget of every task (default: per task, {DEFAULT_BUDGET.seconds}s; 0: none)')
+    parser.add_argument('--max-memory', type=int, default=None, metavar='MB',
+                        help=f'memory budget of every task (default: per task, {DEFAULT_BUDGET.memory_mb} MB; 0: none)')
+
+
+def run_limits(args):
+    """The Budget fields set on the command line (add_run_options)."""
+    return Budget(args.timeout, args.max_memory)
+
+
+def build(tasks, jobs=None, in_process=False, force=False, title="🚀 Running analysis tasks...", limits=None):
+    """Run the stale ones among `tasks` and print the summary; returns the exit code."""
+    print(title)
+    print("=" * 50)
+    start = time.perf_counter()
+    manifest = load_manifest()
+    stale = {task_name(t) for t in tasks} if force else stale_tasks(tasks, manifest)
+    cached = [Result(t, 'cached', 0.0, '') for t in tasks if task_name(t) not in stale]
+    if cached:
+        print(f"💾 {len(cached)} of {len(tasks)} task(s) up to date, skipped (--force to rebuild)")
+    tasks = [t for t in tasks if task_name(t) in stale]
+    if not tasks:
+        results = []
+    elif in_process:
+        results = run_in_process(tasks, limits)
+    else:
+        # Imported here: loading the table pulls in pandas, which an up-to-date run never needs
+        from shared_data import shared_laptops
+        # Load the cleaned table once into shared memory; every task attaches to it
+        with shared_laptops():
+            results = run(tasks, jobs, runner=partial(run_task, limits=limits))
+
+    # Keys after the run: inputs written by other tasks are final now
+    shared = shared_key(manifest)
+    for r in results:
+        if r.status == 'ok':
+            record(task_name(r.task), _task_key(r.task, manifest, shared), r.task.outputs, manifest)
+    save_manifest(manifest)
+
+    profiled = {task_name(r.task): {'status': r.status, 'wall': r.seconds, 'stages': r.stages,
+                                    'budget': task_budget(r.task, limits)._asdict(), 'violation': r.violation}
+                for r in results if r.status != 'skipped'}
+    if profiled:
+        print_table(profiled)
+        path = save_report(profiled, 'in-process' if in_process else 'subprocess')
+        print(f"📁 Stage report: {os.path.relpath(path, project_dir)}")
+    return 0 if summary(cached + results, time.perf_counter() - start) else 1
+
+
+def main(argv=None, default_groups=DEFAULT_GROUPS, title="🚀 Running analysis tasks..."):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('tasks', nargs='*', help='task or group names (default: %(default)s)', default=default_groups)
+    add_run_options(parser)
+    args = parser.parse_args(argv)
+    try:
+        tasks = select(args.tasks)
+    except ValueError as e:
+        parser.error(str(e))
+    return build(tasks, args.jobs, args.in_process, args.force, title, run_limits(args))
+
+
+def _report(result):
+    print(f"\n▶ {result.task.script} ({result.seconds:.1f}s)")
+    if result.status == 'ok':
+        print(result.output)
+    elif result.status == 'failed':
+        print(f"❌ Error in {result.task.script}:")
+        print(result.output)
+    elif result.status == 'over budget':
+        print(f"🛑 Over budget in {result.task.script}:")
+        print(result.output)
+    else:
+        print("⏭️ Skipped: an input task failed")
+    sys.stdout.flush()
+
+
+def _over_budget(pid, seconds, budget):
+    """Why process `pid`, running for `seconds`, is over `budget` (None if it is not)."""
+    if budget.seconds and seconds > budget.seconds:
+        return f"ran past its {budget.seconds:,}s time budget"
+    resident = _resident_mb(pid)
+    if budget.memory_mb and resident and resident > budget.memory_mb:
+        return f"held {resident:,.0f} MB, over its {budget.memory_mb:,} MB memory budget"
+    return None
+
+
+def _resident_mb(pid):
+    """Resident memory of process `pid` in MB (None where /proc is not available)."""
+    try:
+        with open(f'/proc/{pid}/status', encoding='ascii') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def _limit_address_space(pid, budget):
+    if not budget.memory_mb:
+        return
+    limit = (budget.memory_mb + ADDRESS_SPACE_HEADROOM_MB) * 2**20
+    try:
+        # Imported here: Unix only
+        import resource
+        resource.prlimit(pid, resource.RLIMIT_AS, (limit, limit))
+    except (ImportError, AttributeError, OSError, ValueError):
+        # Not Linux, or the process already exited: the watchdog still applies
+        pass
+
+
+def _task_key(task, manifest, shared):
+    # The dataset is part of the shared key
+    return task_key(task.script, [i for i in task.inputs if i != DATA], manifest, shared)
+
+
+def _startup_seconds():
+    """What a standalone script pays before its analysis starts: a fresh
+    interpreter importing pandas, matplotlib and the loaders."""
+    start = time.perf_counter()
+    subprocess.run([sys.executable, '-c', 'import matplotlib.pyplot, aggregates, snapshots'],
+                   cwd=script_dir, check=False)
+    return time.perf_counter() - start
+
+
+def _times_path():
+    return os.path.join(CACHE_DIR, TIMES_FILE)
+
+
+def _read_times():
+    try:
+        with open(_times_path(), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_times(times):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    _write_atomic(_times_path(), json.dumps(times, indent=2, sort_keys=True).encode('utf-8'))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
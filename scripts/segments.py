@@ -0,0 +1,42 @@
+"""
+Market Segments
+Ordered segment rules on price, gpu_type and cpu_tier, evaluated for the
+whole table at once with vectorized masks (np.select) instead of a Python
+function per row. The first rule whose conditions all hold wins; rows
+matching none get DEFAULT_SEGMENT.
+
+Conditions use the (column, comparison, value) form of cleaning.py's filter
+profiles, so sql_backend.segment_case can emit the same rules as SQL.
+"""
+import pandas as pd
+import numpy as np
+
+from cleaning import condition_mask
+
+DEFAULT_SEGMENT = 'Standard'
+HIGH_END_CPU = ['Flagship', 'High-End']
+
+# Price, GPU and CPU tier (deep_analysis.py)
+MARKET_SEGMENTS = [
+    ('Gaming/Workstation', [('gpu_type', '==', 'Dedicated'), ('cpu_tier', 'in', HIGH_END_CPU), ('price', '>', 1500)]),
+    ('Gaming Budget', [('gpu_type', '==', 'Dedicated'), ('price', '>', 800)]),
+    ('Business Premium', [('cpu_tier', 'in', HIGH_END_CPU), ('price', '>', 1200)]),
+    ('Budget', [('price', '<', 400)]),
+    ('Mid-Range', [('price', '<', 800)]),
+]
+
+# Price and GPU only (09_advanced_viz.py, gif_04_segment_pie.py)
+CHART_SEGMENTS = [
+    ('Gaming/Workstation', [('gpu_type', '==', 'Dedicated'), ('price', '>', 1200)]),
+    ('Gaming Budget', [('gpu_type', '==', 'Dedicated')]),
+    ('Business Premium', [('price', '>', 1200)]),
+    ('Budget', [('price', '<', 400)]),
+    ('Mid-Range', [('price', '<', 800)]),
+]
+
+
+def segment(df, rules=MARKET_SEGMENTS, default=DEFAULT_SEGMENT):
+    """Segment label of every row of `df` as a Series of plain strings."""
+    conditions = [condition_mask(df, rule).to_numpy(dtype=bool) for _, rule in rules]
+    labels = np.select(conditions, [label for label, _ in rules], default=default)
+    return pd.Series(labels, index=df.index, dtype=str)
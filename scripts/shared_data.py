@@ -0,0 +1,241 @@
+"""
+Shared Data Broker
+Publishes the cleaned laptops table (raw plus derived columns, see
+cleaning.py) to multiprocessing.shared_memory once so concurrent scripts
+attach zero-copy, read-only views instead of each holding a private copy.
+
+Numeric columns are stored as raw NumPy buffers; string columns are
+dictionary-encoded (integer codes in shared memory, the distinct strings in
+the manifest). Child processes find the table through the LAPTOPS_SHM
+environment variable, which `load_clean` and `load_laptops` check before
+touching the CSV or the cache.
+
+Usage:
+    python scripts/shared_data.py serve   # hold the table until Ctrl-C
+"""
+from multiprocessing import resource_tracker, shared_memory
+from contextlib import contextmanager
+import numpy as np
+import pandas as pd
+import hashlib
+import json
+import os
+import signal
+import sys
+import time
+
+from cleaning import current_where, load_clean
+from data_loader import DATA_PATH, cache_key, execution_mode
+from profiling import stage
+
+ENV_VAR = 'LAPTOPS_SHM'
+ALIGN = 64
+
+# Segments attached by this process; kept alive for the life of the process
+# because the DataFrames handed out are views into their buffers
+_attached = {}
+# Segments published (created) by this process and not yet unlinked
+_owned = set()
+
+
+class SharedTable:
+    """Owner handle for a published table (data segment + manifest segment)."""
+
+    def __init__(self, name, data, meta, owner):
+        self.name = name
+        self.data = data
+        self.meta = meta
+        self.owner = owner
+
+    @property
+    def nbytes(self):
+        return self.data.size + self.meta.size
+
+    def close(self):
+        self.data.close()
+        self.meta.close()
+        if self.owner:
+            for segment in (self.data, self.meta):
+                _owned.discard(segment.name)
+                try:
+                    segment.unlink()
+                except FileNotFoundError:
+                    pass
+
+
+def segment_name(path=DATA_PATH):
+    """Deterministic segment name, so runners started side by side share one
+    copy (runners with a LAPTOPS_WHERE predicate share theirs per predicate)."""
+    where = current_where()
+    if where:
+        return f'laptops_{cache_key(path)}_{hashlib.sha256(where.encode("utf-8")).hexdigest()[:8]}'
+    return f'laptops_{cache_key(path)}'
+
+
+def publish(df, name, source=None):
+    """Copy `df` into shared memory under `name` and return the owning SharedTable."""
+    columns, buffers, offset = [], [], 0
+    for col in df.columns:
+        series = df[col]
+        entry = {'name': col}
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            values = _codes_array(series.cat.codes.to_numpy(), len(series.cat.categories))
+            entry.update(kind='dict', categories=series.cat.categories.tolist())
+        elif series.dtype.kind in 'biuf':
+            values = series.to_numpy()
+            entry.update(kind='numeric')
+        else:
+            codes, uniques = pd.factorize(series, use_na_sentinel=True)
+            values = _codes_array(codes, len(uniques))
+            entry.update(kind='dict', categories=[str(u) for u in uniques])
+
+        offset = -(-offset // ALIGN) * ALIGN
+        entry.update(dtype=values.dtype.str, offset=offset, length=len(values))
+        columns.append(entry)
+        buffers.append((offset, values))
+        offset += values.nbytes
+
+    manifest = json.dumps({
+        'source': os.path.abspath(source) if source else None,
+        'key': cache_key(source) if source else None,
+        'where': current_where(),
+        'nrows': len(df),
+        'columns': columns,
+    }).encode('utf-8')
+
+    data = shared_memory.SharedMemory(name=name, create=True, size=max(offset, 1))
+    try:
+        for start, values in buffers:
+            target = np.ndarray(values.shape, dtype=values.dtype, buffer=data.buf, offset=start)
+            target[:] = values
+        meta = shared_memory.SharedMemory(name=f'{name}_meta', create=True, size=len(manifest) + 8)
+    except BaseException:
+        data.close()
+        data.unlink()
+        raise
+    # Length last: until it is set, attaching processes see an empty manifest
+    meta.buf[8:8 + len(manifest)] = manifest
+    meta.buf[:8] = len(manifest).to_bytes(8, 'little')
+    _owned.update([data.name, meta.name])
+    return SharedTable(name, data, meta, owner=True)
+
+
+def attach(name):
+    """Zero-copy, read-only DataFrame view of the table published under `name`.
+    Raises ValueError while the publisher is still writing the manifest."""
+    if name in _attached:
+        data, manifest = _attached[name]
+    else:
+        meta = _open_segment(f'{name}_meta')
+        try:
+            size = int.from_bytes(bytes(meta.buf[:8]), 'little')
+            if not 0 < size <= meta.size - 8:
+                raise ValueError(f"Manifest of {name} not written yet")
+            manifest = json.loads(bytes(meta.buf[8:8 + size]).decode('utf-8'))
+        finally:
+            meta.close()
+        data = _open_segment(name)
+        _attached[name] = (data, manifest)
+
+    columns = {}
+    for entry in manifest['columns']:
+        values = np.ndarray((entry['length'],), dtype=np.dtype(entry['dtype']),
+                            buffer=data.buf, offset=entry['offset'])
+        values.flags.writeable = False
+        if entry['kind'] == 'dict':
+            values = pd.Categorical.from_codes(values, pd.Index(entry['categories']))
+        columns[entry['name']] = values
+    return pd.DataFrame(columns, copy=False)
+
+
+@stage('load')
+def attach_published(path=DATA_PATH):
+    """Attach the table named in LAPTOPS_SHM if it was published from `path`
+    and the file has not changed since. Returns None otherwise."""
+    name = os.environ.get(ENV_VAR)
+    if not name:
+        return None
+    try:
+        df = attach(name)
+    except (FileNotFoundError, ValueError):
+        # Publisher already exited or is still publishing - caller falls back
+        # to a normal load
+        return None
+    manifest = _attached[name][1]
+    if (manifest['source'] != os.path.abspath(path) or manifest['key'] != cache_key(path)
+            or manifest.get('where', '') != current_where()):
+        return None
+    return df
+
+
+@contextmanager
+def shared_laptops(path=DATA_PATH):
+    """Publish laptops.csv for the duration of the block and export LAPTOPS_SHM
+    so child processes attach to it. If another runner already published the
+    same data, reuse its copy instead of making a second one.
+
+    Streaming, incremental and SQL runs (LAPTOPS_MODE=stream/incremental/sql)
+    never hold the full table, so nothing is published for them."""
+    if execution_mode([]) != 'memory':
+        yield None
+        return
+    name = segment_name(path)
+    try:
+        table = publish(load_clean(path), name, source=path)
+    except FileExistsError:
+        table = None
+    previous = os.environ.get(ENV_VAR)
+    os.environ[ENV_VAR] = name
+    try:
+        yield table
+    finally:
+        if previous is None:
+            os.environ.pop(ENV_VAR, None)
+        else:
+            os.environ[ENV_VAR] = previous
+        if table is not None:
+            table.close()
+
+
+def _codes_array(codes, n_categories):
+    """Dictionary codes in the narrowest dtype pandas itself would use, so
+    Categorical.from_codes does not copy them on attach."""
+    for dtype in (np.int8, np.int16, np.int32):
+        if n_categories < np.iinfo(dtype).max:
+            return codes.astype(dtype, copy=False)
+    return codes.astype(np.int64, copy=False)
+
+
+def _open_segment(name):
+    """Attach to an existing segment without letting this process's resource
+    tracker unlink it on exit (the publisher owns its lifetime)."""
+    if name in _owned:
+        # Published by this process: its tracker entry is released once, by
+        # SharedTable.close() unlinking the segment
+        return shared_memory.SharedMemory(name=name)
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13 has no track= argument
+        segment = shared_memory.SharedMemory(name=name)
+        resource_tracker.unregister(segment._name, 'shared_memory')
+        return segment
+
+
+if __name__ == '__main__':
+    if sys.argv[1:] != ['serve']:
+        print(__doc__)
+        sys.exit(1)
+    # Background jobs ignore SIGINT; treat SIGTERM the same so the segments get unlinked
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    with shared_laptops() as table:
+        if table is None:
+            print(f"Already published as {os.environ[ENV_VAR]}")
+            sys.exit(0)
+        print(f"✅ Published {table.name} ({table.nbytes / 1e6:,.1f} MB)")
+        print(f"   export {ENV_VAR}={table.name}")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
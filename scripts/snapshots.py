@@ -0,0 +1,192 @@
+"""
+Snapshot Store
+Keeps immutable, checksummed versions of the laptops dataset under
+snapshots/ and records which one is current, so analyses always read a
+fixed input and nothing touches the network unless a refresh is requested.
+
+Layout:
+    snapshots/<id>/laptops.csv   read-only copy, id = <UTC timestamp>-<sha256[:8]>
+    snapshots/manifest.json      every version with its checksum, size and origin
+    snapshots/CURRENT            id of the current version (one line)
+
+Set LAPTOPS_SNAPSHOT=<id> to pin a run to another version. With an empty
+store, the laptops.csv checked into the repository is used.
+
+Usage:
+    python scripts/snapshots.py list
+    python scripts/snapshots.py register path/to/laptops.csv [--source TEXT]
+    python scripts/snapshots.py use <id>
+    python scripts/snapshots.py verify [<id>]
+"""
+from datetime import datetime, timezone
+import argparse
+import hashlib
+import json
+import os
+import stat
+import sys
+
+# Setup paths
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_dir = os.path.dirname(script_dir)
+SEED_PATH = os.path.join(project_dir, 'laptops.csv')
+SNAPSHOT_DIR = os.path.join(project_dir, 'snapshots')
+SNAPSHOT_FILE = 'laptops.csv'
+ENV_VAR = 'LAPTOPS_SNAPSHOT'
+
+COPY_BLOCK_SIZE = 1 << 20
+
+
+def current_snapshot():
+    """Path of the CSV analyses should read: the LAPTOPS_SNAPSHOT version if
+    set, else the current one, else the repository's laptops.csv."""
+    snapshot_id = os.environ.get(ENV_VAR) or _read_current()
+    if not snapshot_id:
+        return SEED_PATH
+    path = snapshot_path(snapshot_id)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Snapshot {snapshot_id} not found in {SNAPSHOT_DIR}")
+    return path
+
+
+def snapshot_path(snapshot_id):
+    return os.path.join(SNAPSHOT_DIR, snapshot_id, SNAPSHOT_FILE)
+
+
+def list_snapshots():
+    """Manifest entries, oldest first."""
+    return _read_manifest()['snapshots']
+
+
+def register(src, source=None, make_current=True):
+    """Copy `src` into the store as a new read-only version and return its id.
+    Registering content that is already stored reuses that version."""
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    tmp = os.path.join(SNAPSHOT_DIR, f'.incoming.{os.getpid()}')
+    sha, size, lines = hashlib.sha256(), 0, 0
+    try:
+        with open(src, 'rb') as f_in, open(tmp, 'wb') as f_out:
+            for block in iter(lambda: f_in.read(COPY_BLOCK_SIZE), b''):
+                sha.update(block)
+                size += len(block)
+                lines += block.count(b'\n')
+                f_out.write(block)
+        digest = sha.hexdigest()
+
+        manifest = _read_manifest()
+        existing = [s for s in manifest['snapshots'] if s['sha256'] == digest]
+        if existing:
+            snapshot_id = existing[0]['id']
+        else:
+            created = datetime.now(timezone.utc)
+            snapshot_id = f"{created:%Y%m%dT%H%M%SZ}-{digest[:8]}"
+            os.makedirs(os.path.dirname(snapshot_path(snapshot_id)))
+            os.chmod(tmp, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+            os.replace(tmp, snapshot_path(snapshot_id))
+            manifest['snapshots'].append({
+                'id': snapshot_id,
+                'sha256': digest,
+                'bytes': size,
+                'rows': max(lines - 1, 0),
+                'source': source or os.path.abspath(src),
+                'created': created.isoformat(timespec='seconds'),
+            })
+            _write_atomic(os.path.join(SNAPSHOT_DIR, 'manifest.json'),
+                          json.dumps(manifest, indent=2).encode('utf-8'))
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+    if make_current:
+        use(snapshot_id)
+    return snapshot_id
+
+
+def use(snapshot_id):
+    """Make `snapshot_id` the current version."""
+    if snapshot_id not in {s['id'] for s in list_snapshots()}:
+        raise KeyError(f"Unknown snapshot: {snapshot_id}")
+    _write_atomic(os.path.join(SNAPSHOT_DIR, 'CURRENT'), (snapshot_id + '\n').encode('utf-8'))
+
+
+def verify(snapshot_id=None):
+    """Re-hash stored versions (all, or just `snapshot_id`) and return the ids
+    whose content no longer matches the manifest."""
+    bad = []
+    for entry in list_snapshots():
+        if snapshot_id and entry['id'] != snapshot_id:
+            continue
+        sha = hashlib.sha256()
+        try:
+            with open(snapshot_path(entry['id']), 'rb') as f:
+                for block in iter(lambda: f.read(COPY_BLOCK_SIZE), b''):
+                    sha.update(block)
+        except FileNotFoundError:
+            bad.append(entry['id'])
+            continue
+        if sha.hexdigest() != entry['sha256']:
+            bad.append(entry['id'])
+    return bad
+
+
+def _read_current():
+    try:
+        with open(os.path.join(SNAPSHOT_DIR, 'CURRENT'), encoding='utf-8') as f:
+            return f.read().strip()
+    except FileNotFoundError:
+        return None
+
+
+def _read_manifest():
+    try:
+        with open(os.path.join(SNAPSHOT_DIR, 'manifest.json'), encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {'snapshots': []}
+
+
+def _write_atomic(path, data):
+    tmp = f'{path}.{os.getpid()}.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('list', help='show stored versions')
+    reg = commands.add_parser('register', help='store a CSV as a new version and make it current')
+    reg.add_argument('csv')
+    reg.add_argument('--source', help='where the file came from (default: its path)')
+    reg.add_argument('--keep-current', action='store_true', help='store without switching to it')
+    use_cmd = commands.add_parser('use', help='switch the current version')
+    use_cmd.add_argument('id')
+    check = commands.add_parser('verify', help='re-hash stored versions')
+    check.add_argument('id', nargs='?')
+    args = parser.parse_args()
+
+    if args.command == 'list':
+        current = _read_current()
+        snapshots = list_snapshots()
+        if not snapshots:
+            print(f"No snapshots yet - analyses read {SEED_PATH}")
+        for entry in snapshots:
+            marker = '*' if entry['id'] == current else ' '
+            print(f"{marker} {entry['id']}  {entry['rows']:>10,} rows  {entry['bytes'] / 1e6:>8,.1f} MB  {entry['source']}")
+    elif args.command == 'register':
+        snapshot_id = register(args.csv, source=args.source, make_current=not args.keep_current)
+        print(f"✅ Registered {snapshot_id}")
+    elif args.command == 'use':
+        use(args.id)
+        print(f"✅ Current snapshot: {args.id}")
+    elif args.command == 'verify':
+        bad = verify(args.id)
+        if bad:
+            print(f"❌ Checksum mismatch or missing file: {', '.join(bad)}")
+            sys.exit(1)
+        print("✅ All snapshots match their checksums")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,325 @@
+"""
+SQL Backend
+Loads the cleaned laptops table into a local SQLite database, indexed on its
+categorical columns, so scripts can push their group-bys down as queries and
+receive only the small result frames.
+
+Select it per run with LAPTOPS_MODE=sql (or --sql). The database lives in
+.cache/ next to the columnar cache, is built once per CSV version (in
+bounded chunks) and is opened read-only afterwards.
+
+Table `laptops`, one row per CSV row (row_id = CSV row order):
+    brand, brand_clean, model, label, os, cpu, graphics  text
+    price, ram_gb, storage_gb, screen, rating,
+    units_sold, revenue, stock                           cleaned numbers
+    processor_tier, cpu_tier, gpu_type                   rule-based tiers
+    invalid                                              validation bitmask
+"""
+import pandas as pd
+import numpy as np
+from contextlib import closing
+from functools import cached_property
+import os
+import sqlite3
+
+import parse_cache
+from aggregates import PRICE_HIGH, PRICE_LOW, TOP_N, TOP_SELLER_COLUMNS, with_labels
+from cleaning import FILTER_PROFILES, derive
+from rules import PROCESSOR_TIERS
+from data_loader import CACHE_DIR, DATA_PATH, _path_tag, cache_key, iter_chunks
+
+# Bump when the table layout or tier rules change so old databases are rebuilt
+DB_VERSION = 3
+
+INDEXED_COLUMNS = ['brand', 'brand_clean', 'os', 'cpu', 'graphics', 'ram_gb',
+                   'processor_tier', 'cpu_tier', 'gpu_type']
+
+IN_PRICE_WINDOW = f'price >= {PRICE_LOW} AND price <= {PRICE_HIGH}'
+IS_SELLER = 'revenue > 0 AND price > 0'
+
+
+def database_path(path=DATA_PATH):
+    # Not '<tag>-...': the columnar cache prunes every '<tag>-*' file but its own
+    return os.path.join(CACHE_DIR, f'{_path_tag(path)}.{cache_key(path)}-v{DB_VERSION}.sqlite')
+
+
+def connect(path=DATA_PATH):
+    """Read-only connection to the database for `path`, building it first if needed."""
+    target = database_path(path)
+    if not os.path.exists(target):
+        build_database(path, target)
+    return sqlite3.connect(f'file:{target}?mode=ro', uri=True)
+
+
+def query(sql, path=DATA_PATH, params=()):
+    """Run `sql` against the laptops table and return the result as a DataFrame."""
+    with closing(connect(path)) as conn:
+        return pd.read_sql_query(sql, conn, params=params)
+
+
+def profile_where(profile):
+    """SQL condition equivalent to a cleaning.FILTER_PROFILES entry."""
+    return where(FILTER_PROFILES[profile])
+
+
+def where(conditions):
+    """SQL for (column, comparison, value) conditions that must all hold."""
+    return ' AND '.join(_condition(*c) for c in conditions) or '1'
+
+
+def segment_case(rules, default):
+    """SQL CASE expression for an ordered segments.py rule list."""
+    whens = ' '.join(f'WHEN {where(conditions)} THEN {_literal(label)}' for label, conditions in rules)
+    return f'CASE {whens} ELSE {_literal(default)} END'
+
+
+def build_database(path=DATA_PATH, target=None):
+    """Load the cleaned CSV into a fresh database (chunk by chunk) and index it."""
+    target = target or database_path(path)
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp = f'{target}.{os.getpid()}.tmp'
+    if os.path.exists(tmp):
+        os.remove(tmp)
+    conn = sqlite3.connect(tmp)
+    try:
+        conn.execute('PRAGMA journal_mode = OFF')
+        conn.execute('PRAGMA synchronous = OFF')
+        for chunk in iter_chunks(path):
+            _clean(chunk).to_sql('laptops', conn, if_exists='append', index_label='row_id')
+        parse_cache.flush()
+        conn.execute(f"""
+            UPDATE laptops SET
+                processor_tier = {_case('cpu', PROCESSOR_TIERS)}
+        """)
+        for col in INDEXED_COLUMNS:
+            conn.execute(f'CREATE INDEX idx_{col} ON laptops ({col})')
+        # Quantiles and box plots read prices in order, per brand or overall
+        conn.execute('CREATE INDEX idx_price ON laptops (price)')
+        conn.execute('CREATE INDEX idx_brand_clean_price ON laptops (brand_clean, price)')
+        conn.execute('ANALYZE')
+        conn.commit()
+    finally:
+        conn.close()
+    os.replace(tmp, target)
+
+    # Drop databases of older versions of the same CSV
+    prefix = _path_tag(path) + '.'
+    for name in os.listdir(CACHE_DIR):
+        if name.startswith(prefix) and name.endswith('.sqlite') and name != os.path.basename(target):
+            try:
+                os.remove(os.path.join(CACHE_DIR, name))
+            except OSError:
+                pass
+
+
+class SqlAggregates:
+    """The aggregates interface of aggregates.py answered by queries; each
+    aggregate is computed on first use. Results match ExactAggregates."""
+
+    def __init__(self, path=DATA_PATH, top_n=TOP_N):
+        self.path = path
+        self.top_n = top_n
+
+    def _row(self, sql, params=()):
+        with closing(connect(self.path)) as conn:
+            return conn.execute(sql, params).fetchone()
+
+    def _scalar(self, sql, params=()):
+        return self._row(sql, params)[0]
+
+    def _series(self, sql, params=()):
+        """Two-column result (key, value) as a Series indexed by the key."""
+        df = query(sql, self.path, params)
+        return df.set_index(df.columns[0])[df.columns[1]]
+
+    def _counts(self, column, where='1', ties='MIN(row_id)'):
+        """value_counts of `column`; ties in first-seen order by default (pass
+        ties=column for categoricals, whose ties follow category order)."""
+        counts = self._series(f"""
+            SELECT {column}, COUNT(*) AS count FROM laptops
+            WHERE {column} IS NOT NULL AND {where}
+            GROUP BY {column} ORDER BY count DESC, {ties}
+        """)
+        return counts.astype('int64')
+
+    @cached_property
+    def rows(self):
+        return self._scalar('SELECT COUNT(*) FROM laptops')
+
+    @cached_property
+    def brand_nunique(self):
+        return self._scalar('SELECT COUNT(DISTINCT brand) FROM laptops')
+
+    @cached_property
+    def brand_counts(self):
+        return self._counts('brand_clean', ties='brand_clean')
+
+    @cached_property
+    def brand_revenue(self):
+        return self._series("""
+            SELECT brand_clean, TOTAL(revenue) FROM laptops
+            WHERE brand_clean IS NOT NULL GROUP BY brand_clean ORDER BY brand_clean
+        """)
+
+    @cached_property
+    def revenue_total(self):
+        return self._scalar('SELECT TOTAL(revenue) FROM laptops')
+
+    @cached_property
+    def ram_counts(self):
+        return self._counts('ram_gb')
+
+    @cached_property
+    def screen_counts(self):
+        return self._counts('screen')
+
+    @cached_property
+    def seller_revenue(self):
+        return self._series(f"""
+            SELECT brand, TOTAL(revenue) FROM laptops
+            WHERE brand IS NOT NULL AND {IS_SELLER} GROUP BY brand ORDER BY brand
+        """)
+
+    @cached_property
+    def top_sellers(self):
+        df = query(f"""
+            SELECT row_id, label, brand, revenue AS total_sales_clean, price AS price_clean,
+                   units_sold AS "Sale Product Count"
+            FROM laptops WHERE {IS_SELLER}
+            ORDER BY revenue DESC, row_id LIMIT ?
+        """, self.path, (self.top_n,))
+        return df.set_index('row_id')[TOP_SELLER_COLUMNS]
+
+    @cached_property
+    def window_brand_counts(self):
+        return self._counts('brand_clean', IN_PRICE_WINDOW, ties='brand_clean')
+
+    @cached_property
+    def _price_summary(self):
+        return self._row(f'SELECT COUNT(*), AVG(price), MIN(price), MAX(price) FROM laptops WHERE {IN_PRICE_WINDOW}')
+
+    @property
+    def price_count(self):
+        return self._price_summary[0]
+
+    @property
+    def price_mean(self):
+        return self._price_summary[1]
+
+    @property
+    def price_min(self):
+        return self._price_summary[2]
+
+    @property
+    def price_max(self):
+        return self._price_summary[3]
+
+    @cached_property
+    def window_ram_counts(self):
+        return self._counts('ram_gb', IN_PRICE_WINDOW)
+
+    @cached_property
+    def ram_price_mean(self):
+        return self._series(f"""
+            SELECT ram_gb, AVG(price) FROM laptops
+            WHERE ram_gb IS NOT NULL AND {IN_PRICE_WINDOW} GROUP BY ram_gb ORDER BY ram_gb
+        """)
+
+    def price_quantile(self, q, brand=None):
+        prices, counts = self._price_counts(brand)
+        return _quantile(prices, counts, q)
+
+    def price_median(self, brand=None):
+        return self.price_quantile(0.5, brand)
+
+    def price_histogram(self, bins):
+        prices, counts = self._price_counts()
+        hist, edges = np.histogram(prices, bins=bins, weights=counts)
+        return hist.astype('int64'), edges
+
+    def brand_box_stats(self, brands):
+        # Imported here: text reports use these aggregates without matplotlib
+        from matplotlib import cbook
+
+        # Fliers are drawn one by one, so fetch the prices in row order
+        sql = f'SELECT price FROM laptops WHERE brand_clean = ? AND {IN_PRICE_WINDOW} ORDER BY row_id'
+        data = [query(sql, self.path, (brand,))['price'].to_numpy() for brand in brands]
+        return cbook.boxplot_stats(data, labels=brands)
+
+    def _price_counts(self, brand=None):
+        """Distinct in-window prices (ascending) and how often each occurs."""
+        where, params = IN_PRICE_WINDOW, ()
+        if brand is not None:
+            where, params = f'brand_clean = ? AND {where}', (brand,)
+        df = query(f'SELECT price, COUNT(*) AS n FROM laptops WHERE {where} GROUP BY price ORDER BY price',
+                   self.path, params)
+        return df['price'].to_numpy(), df['n'].to_numpy()
+
+
+def _clean(chunk):
+    """One raw CSV chunk as rows of the laptops table."""
+    chunk = derive(chunk)
+    return pd.DataFrame({
+        'brand': chunk['brand'],
+        'brand_clean': chunk['brand_clean'],
+        'model': chunk['model'],
+        'label': with_labels(chunk[['brand', 'model']])['label'],
+        'os': chunk['OS'],
+        'cpu': chunk['cpu'],
+        'graphics': chunk['graphics'],
+        'price': chunk['price'],
+        'ram_gb': chunk['ram_gb'],
+        'storage_gb': chunk['storage_gb'],
+        'screen': chunk['screen'],
+        'rating': chunk['rating'],
+        'units_sold': chunk['units_sold'],
+        'revenue': chunk['revenue'],
+        'stock': chunk['stock'],
+        'processor_tier': None,
+        'cpu_tier': chunk['cpu_tier'],
+        'gpu_type': chunk['gpu_type'],
+        'invalid': chunk['invalid'],
+    }, index=chunk.index)
+
+
+def _case(column, table):
+    """SQL CASE expression applying a rules.RuleTable to the lower-cased column."""
+    whens = [f'WHEN {column} IS NULL THEN {_literal(table.null)}']
+    for label, needles in table.rules:
+        test = ' OR '.join(f'instr(lower({column}), {_literal(n)}) > 0' for n in needles)
+        whens.append(f'WHEN {test} THEN {_literal(label)}')
+    return f"CASE {' '.join(whens)} ELSE {_literal(table.default)} END"
+
+
+def _condition(column, op, value):
+    if op == 'notna':
+        return f'{column} IS NOT NULL'
+    if op == 'isna':
+        return f'{column} IS NULL'
+    if op == 'outside':
+        return f'({column} < {_value(value[0])} OR {column} > {_value(value[1])})'
+    if op == 'in':
+        return f"{column} IN ({', '.join(_value(v) for v in value)})"
+    return f'{column} {"=" if op == "==" else op} {_value(value)}'
+
+
+def _value(value):
+    return _literal(value) if isinstance(value, str) else repr(value)
+
+
+def _literal(text):
+    return "'" + text.replace("'", "''") + "'"
+
+
+def _quantile(values, counts, q):
+    """np.quantile (linear) of `values` repeated `counts` times, without expanding them."""
+    if len(values) == 0:
+        return np.nan
+    cum = np.cumsum(counts)
+    pos = q * (cum[-1] - 1)
+    lo = int(np.floor(pos))
+    a = values[np.searchsorted(cum, lo, side='right')]
+    b = values[np.searchsorted(cum, min(lo + 1, cum[-1] - 1), side='right')]
+    t = pos - lo
+    # Same interpolation as numpy's _lerp, so results are bit-identical
+    return b - (b - a) * (1 - t) if t >= 0.5 else a + (b - a) * t
@@ -0,0 +1,114 @@
+"""
+Synthetic Dataset Generator
+Writes a laptops.csv-shaped file of any size, seeded and reproducible, to
+see how the analyses behave at production scale.
+
+Every synthetic row starts from a real row drawn at random, so the joint
+distribution of the text columns (brand mix, RAM / screen / disk strings,
+CPU and GPU combinations, which values are missing together) is the real
+one. The numbers then vary around the drawn row:
+
+    Price              scaled by a log-normal factor (PRICE_SIGMA), keeping
+                       the row's cents and the " $1,783.99 " formatting
+    Sale Product Count the real count (a discrete distribution of ~50 values)
+    Total Sales        Price x Sale Product Count, formatted like the real
+                       column; non-numbers such as "-" are kept
+    model              for MODEL_VARIANT_RATE of the rows the last number in
+                       the model name changes, so the number of distinct
+                       products grows with the row count as in a real export
+
+Usage:
+    python scripts/synthetic.py 1000000             # .cache/synthetic/laptops-1000000-seed42.csv
+    python scripts/synthetic.py 10000 --seed 7 --out /tmp/laptops.csv
+"""
+import pandas as pd
+import numpy as np
+import argparse
+import os
+import time
+
+from data_loader import CACHE_DIR
+from snapshots import current_snapshot
+
+SEED = 42
+# Rows generated and written at a time (bounds memory for 10M+ rows)
+CHUNK_ROWS = 500_000
+# Spread of the price factor around the drawn row's price
+PRICE_SIGMA = 0.1
+# Share of rows whose model number is changed to another product's
+MODEL_VARIANT_RATE = 0.5
+
+
+def synthetic_path(rows, seed=SEED):
+    return os.path.join(CACHE_DIR, 'synthetic', f'laptops-{rows}-seed{seed}.csv')
+
+
+def synthetic_csv(rows, seed=SEED):
+    """Path of the `rows`-row dataset for `seed`, generated on first use."""
+    path = synthetic_path(rows, seed)
+    if not os.path.exists(path):
+        generate(rows, path, seed)
+    return path
+
+
+def generate(rows, dest, seed=SEED, source=None):
+    """Write `rows` synthetic rows modelled on `source` (the current
+    snapshot by default) to `dest`."""
+    # Text exactly as in the file: missing stays missing, " $1,783.99 " stays a string
+    real = pd.read_csv(source or current_snapshot(), dtype=str, keep_default_na=False, na_values=[''])
+    rng = np.random.default_rng(seed)
+    os.makedirs(os.path.dirname(os.path.abspath(dest)), exist_ok=True)
+    tmp = f'{dest}.{os.getpid()}.tmp'
+    written = 0
+    while written < rows:
+        chunk = synthesize(real, min(CHUNK_ROWS, rows - written), rng)
+        chunk.to_csv(tmp, mode='a' if written else 'w', header=not written, index=False)
+        written += len(chunk)
+    os.replace(tmp, dest)
+    return dest
+
+
+def synthesize(real, rows, rng):
+    """`rows` rows drawn from `real` (all text columns) with varied numbers."""
+    df = real.iloc[rng.integers(0, len(real), rows)].reset_index(drop=True)
+
+    dollars = pd.to_numeric(df['Price'].str.replace(r'[\s$,]', '', regex=True), errors='coerce')
+    cents = (dollars * 100).round() % 100
+    scaled = np.floor(dollars * rng.lognormal(0.0, PRICE_SIGMA, rows)).clip(lower=1) + cents / 100
+    priced = scaled.notna()
+    df.loc[priced, 'Price'] = scaled[priced].map(' ${:,.2f} '.format)
+
+    count = pd.to_numeric(df['Sale Product Count'], errors='coerce')
+    total = (scaled * count).round(2)
+    numeric = total.notna() & pd.to_numeric(df['Total Sales'], errors='coerce').notna()
+    # Like the real column: '26940', '205439.4', '24975.86'
+    df.loc[numeric, 'Total Sales'] = total[numeric].map('{:.2f}'.format).str.rstrip('0').str.rstrip('.')
+
+    parts = df['model'].str.extract(r'^(.*?)(\d{1,9})(\D*)$')
+    vary = parts[1].notna() & (rng.random(rows) < MODEL_VARIANT_RATE)
+    digits = parts.loc[vary, 1]
+    width = digits.str.len()
+    # Another number of the same width: 'Latitude 5530' -> 'Latitude 0817'
+    number = ((digits.astype('int64') + rng.integers(1, 10**9, len(digits))) % 10**width).astype(str)
+    for w in width.unique():
+        number[width == w] = number[width == w].str.zfill(w)
+    df.loc[vary, 'model'] = parts.loc[vary, 0] + number + parts.loc[vary, 2]
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('rows', type=int, help='rows to generate')
+    parser.add_argument('--seed', type=int, default=SEED, help='random seed (same seed, same file)')
+    parser.add_argument('--out', help='output CSV (default: .cache/synthetic/)')
+    args = parser.parse_args()
+
+    dest = args.out or synthetic_path(args.rows, args.seed)
+    start = time.perf_counter()
+    generate(args.rows, dest, args.seed)
+    print(f"✅ {args.rows:,} rows (seed {args.seed}) in {time.perf_counter() - start:.1f}s: "
+          f"{dest} ({os.path.getsize(dest) / 1e6:,.1f} MB)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,159 @@
+"""
+Chart Theme
+The two dark themes the charts are drawn in, and figure templates: a themed
+layout built once - figure, axes, titles, labels, ticks, spines - that is
+then rendered any number of times, each render only updating its data
+artists instead of tearing the figure down and building it again:
+
+    chart = FigureTemplate(figsize=(12, 6))
+    for step in range(n_steps):
+        chart.bars(chart.axes, 'revenue', values * step / n_steps, horizontal=True, color=colors)
+        chart.text(chart.axes, 'total', 0.5, 0.9, f'${total * step / n_steps:,.0f}')
+        frames.append(chart.frame())
+    chart.close()
+
+Data artists are kept under a key: the first render creates them (with the
+given style), later renders move, resize or re-text them. Bars rescale
+their axes like a new bar chart would; a scatter keeps the axes limits,
+which animated charts fix anyway.
+"""
+from collections import namedtuple
+import numpy as np
+import io
+
+
+def use_file_backend():
+    """Draw with Agg. The charts only ever go to files, so matplotlib must
+    not probe for a GUI backend: that costs start-up time and fails without
+    a display. Call before importing pyplot."""
+    import matplotlib
+    matplotlib.use('Agg')
+
+
+Theme = namedtuple('Theme', ['background', 'panel', 'spine', 'text', 'muted'])
+
+# GitHub dark: advanced analyses (09, 11-13) and the GIFs
+DARK = Theme(background='#0d1117', panel='#161b22', spine='#30363d', text='white', muted='#8b949e')
+# Navy: basic analyses (01-08) and the summary dashboard
+NAVY = Theme(background='#1a1a2e', panel='#2a2a4e', spine='#444', text='white', muted='#888')
+
+
+def style_axes(ax, theme=DARK, facecolor=None):
+    """Theme background, white ticks and spine colors on `ax`."""
+    ax.set_facecolor(facecolor or theme.background)
+    ax.tick_params(colors=theme.text)
+    for spine in ax.spines.values():
+        spine.set_color(theme.spine)
+    return ax
+
+
+class FigureTemplate:
+    """A themed figure built once and rendered many times.
+
+    `axes` is the grid of plt.subplots(nrows, ncols), each one themed;
+    with nrows=0 the figure starts empty and add_axes() places axes on a
+    gridspec."""
+
+    def __init__(self, nrows=1, ncols=1, figsize=(12, 8), title=None, theme=DARK, title_size=22):
+        # Imported here: the theme constants are used without pyplot
+        import matplotlib.pyplot as plt
+
+        self.theme = theme
+        if nrows:
+            self.fig, self.axes = plt.subplots(nrows, ncols, figsize=figsize)
+            for ax in np.atleast_1d(self.axes).flat:
+                style_axes(ax, theme)
+        else:
+            self.fig, self.axes = plt.figure(figsize=figsize), None
+        self.fig.patch.set_facecolor(theme.background)
+        if title:
+            self.fig.suptitle(title, fontsize=title_size, fontweight='bold', color=theme.text, y=0.98)
+        self._artists = {}
+
+    def add_axes(self, spec, facecolor=None):
+        """A themed axes at gridspec cell `spec` (from self.fig.add_gridspec)."""
+        return style_axes(self.fig.add_subplot(spec), self.theme, facecolor)
+
+    def bars(self, ax, key, values, horizontal=False, **style):
+        """Bars of `values` at 0, 1, ... on `ax`: created on the first render
+        (with `style`), resized on later ones."""
+        bars = self._artists.get(key)
+        if bars is not None and len(bars) == len(values):
+            for bar, value in zip(bars, values):
+                if horizontal:
+                    bar.set_width(value)
+                else:
+                    bar.set_height(value)
+            ax.relim()
+            ax.autoscale_view()
+            return bars
+        if bars is not None:
+            bars.remove()
+        draw = ax.barh if horizontal else ax.bar
+        bars = self._artists[key] = draw(range(len(values)), values, **style)
+        return bars
+
+    def text(self, ax, key, x, y, s, **style):
+        """Text `s` at (x, y) on `ax`: created on the first render (with
+        `style`), moved and re-texted on later ones."""
+        text = self._artists.get(key)
+        if text is None:
+            text = self._artists[key] = ax.text(x, y, s, **style)
+        else:
+            text.set_position((x, y))
+            text.set_text(s)
+            text.set_visible(True)
+        return text
+
+    def scatter(self, ax, key, x, y, c=None, **style):
+        """Points (x, y), colored by `c` through the style's colormap:
+        created on the first render, moved and recolored on later ones."""
+        points = self._artists.get(key)
+        if points is None:
+            points = self._artists[key] = ax.scatter(x, y, c=c, **style)
+            return points
+        points.set_offsets(np.column_stack([x, y]))
+        if c is not None:
+            c = np.asarray(c)
+            points.set_array(c)
+            # A new scatter scales its colors to the data shown
+            points.set_clim(np.nanmin(c), np.nanmax(c))
+        return points
+
+    def pie(self, ax, key, values, **style):
+        """Wedges of `values` on `ax` (see Axes.pie); wedge angles follow
+        from all values together, so they are redrawn on each render."""
+        previous = self._artists.pop(key, None)
+        if previous is not None:
+            for artist in [*previous[0], *previous[1]]:
+                artist.remove()
+        wedges = self._artists[key] = ax.pie(values, **style)
+        return wedges
+
+    def hide(self, *keys):
+        """Leave the text or artists under `keys` out of the next renders
+        (text() shows a text again)."""
+        for key in keys:
+            artist = self._artists.get(key)
+            if artist is not None:
+                artist.set_visible(False)
+
+    def frame(self, dpi=100):
+        """The figure as it stands, as a PIL image (one animation frame)."""
+        # Imported here: only the GIF scripts need Pillow
+        from PIL import Image
+
+        buf = io.BytesIO()
+        self.fig.savefig(buf, format='png', facecolor=self.theme.background, bbox_inches='tight', dpi=dpi)
+        buf.seek(0)
+        image = Image.open(buf).copy()
+        buf.close()
+        return image
+
+    def save(self, path, dpi=150, **kwargs):
+        self.fig.savefig(path, dpi=dpi, facecolor=self.theme.background, bbox_inches='tight', **kwargs)
+
+    def close(self):
+        import matplotlib.pyplot as plt
+
+        plt.close(self.fig)
@@ -0,0 +1,134 @@
+"""
+Validation Stage
+Checks the cleaned laptops table against declared rules in one vectorized
+pass and records the result per row in the `invalid` bitmask column (bit i
+set = VALIDATION_RULES[i] violated, 0 = clean row). The cleaning stage adds
+the column when it builds the derived table, so scripts filter on it
+instead of re-testing conditions:
+
+    df = load_clean(data_path, profile='validated')        # no violations
+    df = df[valid_mask(df, ['price_unparseable'])]         # selected rules only
+
+Each build also writes a compact reject file (one line per flagged row with
+the names of the rules it breaks) to .cache/. Print the per-rule counts with:
+
+    python scripts/validation.py [laptops.csv]
+"""
+import pandas as pd
+import numpy as np
+import json
+import os
+import sys
+
+import data_loader
+from cleaning import condition_mask, load_clean
+from data_loader import DATA_PATH, _path_tag, cache_key
+
+# (rule, conditions): a row violates the rule when all its conditions hold.
+# Append new rules at the end - bit positions are stored in the derived table
+VALIDATION_RULES = [
+    ('price_unparseable', [('Price', 'notna', None), ('price', 'isna', None)]),
+    ('price_not_positive', [('price', '<=', 0)]),
+    ('rating_out_of_range', [('rating', 'outside', (1, 5))]),
+    ('stock_negative', [('stock', '<', 0)]),
+    ('units_negative', [('units_sold', '<', 0)]),
+    ('sales_unparseable', [('Total Sales', 'notna', None), ('revenue', 'isna', None)]),
+    ('brand_missing', [('brand', 'isna', None)]),
+]
+
+RULE_NAMES = [name for name, _ in VALIDATION_RULES]
+
+# Raw columns copied into the reject file next to the violations
+REJECT_COLUMNS = ['brand', 'model', 'Price', 'rating', 'Sale Product Count', 'Total Sales', 'Available Stock']
+
+
+def flag(df):
+    """Validity bitmask of every row of `df` (uint16, 0 = valid)."""
+    invalid = np.zeros(len(df), dtype=np.uint16)
+    for bit, (_, conditions) in enumerate(VALIDATION_RULES):
+        invalid |= condition_mask(df, conditions).to_numpy(dtype=bool).astype(np.uint16) << bit
+    return pd.Series(invalid, index=df.index)
+
+
+def bits(rules=None):
+    """Bitmask of the named rules (all rules by default)."""
+    return sum(1 << RULE_NAMES.index(name) for name in (RULE_NAMES if rules is None else rules))
+
+
+def valid_mask(df, rules=None):
+    """Rows violating none of `rules` (all rules by default)."""
+    return (df['invalid'] & bits(rules)) == 0
+
+
+def violation_counts(df):
+    """Rows violating each rule, in rule order."""
+    invalid = df['invalid'].to_numpy()
+    return pd.Series([int(((invalid >> bit) & 1).sum()) for bit in range(len(RULE_NAMES))],
+                     index=RULE_NAMES, dtype='int64')
+
+
+def violations(invalid):
+    """'rule;rule' names for each bitmask value."""
+    return ';'.join(name for bit, name in enumerate(RULE_NAMES) if invalid >> bit & 1)
+
+
+def reject_path(path=DATA_PATH):
+    return os.path.join(data_loader.CACHE_DIR, f'{_path_tag(path)}.rejects-{cache_key(path)}.csv')
+
+
+def write_rejects(df, path=DATA_PATH):
+    """Reject file for the table of `path`: flagged rows with their rule
+    names, plus a .json summary of the per-rule counts."""
+    target = reject_path(path)
+    # Only the reported columns of the flagged rows: copying whole rows cost
+    # more than writing the file
+    invalid = df['invalid'].to_numpy()
+    rows = np.flatnonzero(invalid)
+    flagged = invalid[rows]
+    names = {value: violations(value) for value in np.unique(flagged).tolist()}
+    report = df[[col for col in REJECT_COLUMNS if col in df]].iloc[rows]
+    report.insert(0, 'row', report.index)
+    report.insert(1, 'invalid', flagged)
+    report.insert(2, 'violations', [names[value] for value in flagged.tolist()])
+
+    os.makedirs(data_loader.CACHE_DIR, exist_ok=True)
+    tmp = f'{target}.{os.getpid()}.tmp'
+    report.to_csv(tmp, index=False)
+    os.replace(tmp, target)
+    summary = {'rows': len(df), 'rejected': len(rows), 'violations': violation_counts(df).to_dict()}
+    with open(target[:-len('.csv')] + '.json', 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2)
+
+    # Drop reports of older versions of the same CSV
+    prefix = _path_tag(path) + '.rejects-'
+    keep = os.path.basename(target)[:-len('.csv')]
+    for name in os.listdir(data_loader.CACHE_DIR):
+        if name.startswith(prefix) and not name.startswith(keep):
+            try:
+                os.remove(os.path.join(data_loader.CACHE_DIR, name))
+            except OSError:
+                pass
+    return target
+
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else DATA_PATH
+    df = load_clean(path)
+    counts = violation_counts(df)
+    rejected = int((df['invalid'] != 0).sum())
+
+    print(f"\n🔎 Validation of {os.path.basename(path)}: {len(df):,} rows, "
+          f"{rejected:,} with violations ({rejected / max(len(df), 1):.1%})")
+    print("=" * 60)
+    for name, count in counts.items():
+        print(f"  {'❌' if count else '✅'} {name:<22} {count:>10,}")
+    print("-" * 60)
+    if not os.path.isdir(path):
+        target = reject_path(path)
+        if not os.path.exists(target):
+            target = write_rejects(df, path)
+        print(f"  Reject file: {target}")
+
+
+if __name__ == '__main__':
+    main()